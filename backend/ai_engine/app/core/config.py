@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional, List
+from typing import Dict, Literal, Optional, List
 
 class Settings(BaseSettings):
     """AI Engine Configuration"""
@@ -11,6 +11,57 @@ class Settings(BaseSettings):
     
     # MCP Server Connection
     MCP_SERVER_URL: str = "http://localhost:8000/api/v1"
+    # How tools are reached: "inprocess" (direct calls), "stdio" (pooled server
+    # subprocesses) or "http" (remote servers at MCP_SERVER_URL)
+    MCP_TRANSPORT: str = "inprocess"
+    
+    # Tool call timeouts for out-of-process transports (seconds, "server.tool" overrides)
+    MCP_TOOL_TIMEOUT: float = 10.0
+    MCP_TOOL_TIMEOUTS: Dict[str, float] = {
+        "zomato.place_order": 30.0,
+        "amazon.place_order": 30.0,
+        "banking.process_payment": 30.0,
+    }
+    
+    # Per-server deadline budget for a whole tool call, including any hedged attempt (seconds).
+    # A call's deadline is never shorter than its tool timeout: the larger of the two applies,
+    # so a write keeps its 30s timeout and a read has room to be hedged after a slow attempt.
+    MCP_DEADLINE: float = 15.0
+    MCP_SERVER_DEADLINES: Dict[str, float] = {
+        "zomato": 15.0,
+        "amazon": 15.0,
+        "banking": 15.0,
+    }
+    
+    # Per-server circuit breaker (opens after consecutive failures, probes again after the reset time)
+    MCP_BREAKER_FAILURE_THRESHOLD: int = 5
+    MCP_BREAKER_RESET_SECONDS: float = 30.0
+    
+    # Hedged reads: resend a read-only call still unanswered after this latency quantile
+    MCP_HEDGE_READS: bool = False
+    MCP_HEDGE_QUANTILE: float = 0.95
+    MCP_HEDGE_MIN_DELAY: float = 0.01
+    
+    # Stdio transport (one long-lived subprocess and session per server, seconds)
+    MCP_STDIO_STARTUP_TIMEOUT: float = 10.0
+    MCP_STDIO_PING_INTERVAL: float = 15.0
+    MCP_STDIO_RESTART_BACKOFF: float = 0.5
+    
+    # HTTP transport (one pooled keep-alive client shared by all servers)
+    MCP_HTTP_MAX_CONNECTIONS: int = 100
+    MCP_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    MCP_HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    MCP_HTTP2: bool = False  # Requires the h2 package (pip install "httpx[http2]")
+    
+    # MCP Tool Result Cache (read-only tools only, TTLs in seconds)
+    TOOL_CACHE_ENABLED: bool = True
+    TOOL_CACHE_MAX_ENTRIES: int = 1024
+    TOOL_CACHE_TTLS: Dict[str, float] = {
+        "zomato.search_food": 60.0,
+        "zomato.get_restaurant_info": 300.0,
+        "amazon.search_product": 60.0,
+        "amazon.get_product_details": 300.0,
+    }
     
     # AI Model Configuration
     OPENAI_API_KEY: Optional[str] = None
@@ -22,6 +73,35 @@ class Settings(BaseSettings):
     ANTHROPIC_API_KEY: Optional[str] = None
     GOOGLE_API_KEY: Optional[str] = None
     
+    # NLU Spelling Correction (fuzzy match of unknown words to catalog/keyword terms)
+    NLU_SPELLING_ENABLED: bool = True
+    NLU_SPELLING_MIN_SCORE: float = 0.5
+    
+    # NLU Classifier (optional NumPy fallback for utterances the keyword rules miss)
+    NLU_CLASSIFIER_ENABLED: bool = False
+    NLU_CLASSIFIER_MIN_SCORE: float = 0.3
+    
+    # NLU Result Memo (LRU keyed by normalised utterance; 0 disables)
+    NLU_MEMO_MAX_ENTRIES: int = 4096
+    
+    # Speculative prefetch from partial transcripts
+    PREFETCH_MIN_CONFIDENCE: float = 0.8
+    PREFETCH_TTL_SECONDS: float = 15.0
+    PREFETCH_MAX_ENTRIES: int = 1024
+    
+    # Streaming Settings
+    # "char" is paced by the server; "word" and "chunk" are faster to send but
+    # leave the typing effect to clients that honour pace_ms
+    STREAM_MODE: Literal["char", "word", "chunk"] = "char"
+    STREAM_CHUNK_SIZE: int = 48  # Approximate characters per frame in chunk mode
+    STREAM_PACE_MS: int = 20  # Client-side pacing hint; char mode sleeps this long per frame
+    STREAM_DISCONNECT_POLL_MS: int = 100  # How often to check for a gone client while tools run
+    WS_MAX_ACTIVE_TURNS: int = 8  # Turns one WebSocket connection may have in progress at once
+    
+    # Batch Settings
+    BATCH_MAX_MESSAGES: int = 5000
+    BATCH_CONCURRENCY: int = 32  # Chat turns processed at once per batch request
+    
     # CORS Settings
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:3001"
     
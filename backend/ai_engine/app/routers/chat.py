@@ -1,149 +1,116 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, WebSocket, WebSocketDisconnect
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
-from backend.ai_engine.app.services.nlu_service import nlu_service
-from backend.ai_engine.app.services import mcp_client
+from pydantic import BaseModel, Field, ValidationError
+from typing import Any, Dict, List, Literal, Optional, Set
+from backend.ai_engine.app.core.config import settings
+from backend.ai_engine.app.services.pipeline import NLUResult, TurnResult, chat_pipeline, combined_intent
+from backend.ai_engine.app.services.metrics import STREAM_DURATION_SECONDS, STREAM_FIRST_BYTE_SECONDS
+from backend.ai_engine.app.services.session import session_store
+from backend.ai_engine.app.services.sse import DONE_FRAME, build_events, build_frames, comment_frame
 import asyncio
+import functools
 import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 class ChatRequest(BaseModel):
     message: str
+    stream_mode: Optional[Literal["char", "word", "chunk"]] = None  # Overrides settings.STREAM_MODE
+
+class PrefetchRequest(BaseModel):
+    text: str  # Partial transcript
+
+class BatchChatRequest(BaseModel):
+    messages: List[str] = Field(..., max_length=settings.BATCH_MAX_MESSAGES)
+    concurrency: Optional[int] = Field(None, ge=1)  # Capped at settings.BATCH_CONCURRENCY
 
 @router.post("/message")
 async def chat(request: ChatRequest):
     """Non-streaming endpoint (legacy support)"""
-    intent_data = nlu_service.process_text(request.message)
-    
-    if intent_data["intent"] == "order_food":
-        # Search for food first
-        search_result = await mcp_client.search_food(intent_data.get("item", "pizza"))
-        
-        if search_result.get("success") and search_result.get("results"):
-            # Place order for first result
-            first_item = search_result["results"][0]
-            order_result = await mcp_client.place_food_order(
-                first_item["id"],
-                intent_data.get("quantity", 1)
-            )
-            
-            if order_result.get("success"):
-                return {
-                    "response": f"I have placed an order for {order_result['item']} from {order_result['restaurant']}. "
-                               f"Order ID: {order_result['order_id']}. Estimated delivery: {order_result['estimated_delivery']}."
-                }
-            else:
-                return {"response": f"Sorry, I couldn't place the order. {order_result.get('error', 'Unknown error')}"}
-        else:
-            return {"response": f"Sorry, I couldn't find {intent_data.get('item', 'that item')}."}
-    
-    elif intent_data["intent"] == "order_product":
-        # Search for product
-        search_result = await mcp_client.search_product(intent_data.get("item", "kindle"))
-        
-        if search_result.get("success") and search_result.get("results"):
-            first_product = search_result["results"][0]
-            order_result = await mcp_client.place_product_order(
-                first_product["id"],
-                intent_data.get("quantity", 1)
-            )
-            
-            if order_result.get("success"):
-                return {
-                    "response": f"I have placed an order for {order_result['product']}. "
-                               f"Order ID: {order_result['order_id']}. Estimated delivery: {order_result['estimated_delivery']}."
-                }
-            else:
-                return {"response": f"Sorry, I couldn't place the order. {order_result.get('error', 'Unknown error')}"}
-        else:
-            return {"response": f"Sorry, I couldn't find {intent_data.get('item', 'that product')}."}
-    
-    elif intent_data["intent"] == "check_balance":
-        # Get account balance
-        account_id = intent_data.get("account_id", "123456")  # Default account
-        balance_result = await mcp_client.get_balance(account_id)
-        
-        if balance_result.get("success"):
-            account = balance_result["account"]
-            return {
-                "response": f"Your {account['account_type']} account balance is ${account['balance']:.2f} {account['currency']}."
-            }
-        else:
-            return {"response": f"Sorry, I couldn't retrieve your balance. {balance_result.get('error', 'Unknown error')}"}
+    turn = await chat_pipeline.run(request.message)
+    return {"response": turn.response}
+
+@router.post("/prefetch")
+async def chat_prefetch(request: PrefetchRequest):
+    """Warm tool caches from a partial transcript while the user is still speaking"""
+    nlus, prefetched = await chat_pipeline.prefetch(request.text, settings.PREFETCH_MIN_CONFIDENCE)
+    return {
+        "intent": combined_intent(nlus),
+        "confidence": min(nlu.data.get("confidence", 0.0) for nlu in nlus),
+        "prefetched": prefetched
+    }
+
+@router.post("/batch")
+async def chat_batch(request: BatchChatRequest):
+    """Process a list of messages concurrently (offline replay and evaluation)"""
+    concurrency = min(request.concurrency or settings.BATCH_CONCURRENCY, settings.BATCH_CONCURRENCY)
+    turns = await chat_pipeline.run_batch(request.messages, concurrency)
+    return {
+        "results": [{"intent": turn.intent, "response": turn.response} for turn in turns],
+        "count": len(turns)
+    }
+
+async def _complete_unless_disconnected(http_request: Request, nlus: List[NLUResult]) -> Optional[TurnResult]:
+    """
+    Run the tool-calling stages, cancelling them if the client disconnects first
     
-    return {"response": "I didn't understand that. Try saying 'Order pizza', 'Buy a Kindle', or 'Check my balance'."}
+    Returns None when the client went away. Pending reads are cancelled; a write
+    that was already sent is shielded in mcp_client and still completes.
+    """
+    task = asyncio.ensure_future(chat_pipeline.complete(nlus))
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=settings.STREAM_DISCONNECT_POLL_MS / 1000)
+            if done:
+                return task.result()
+            if await http_request.is_disconnected():
+                return None
+    finally:
+        if not task.done():
+            task.cancel()
 
 @router.post("/stream")
-async def chat_stream(request: ChatRequest):
+async def chat_stream(request: ChatRequest, http_request: Request):
     """Streaming endpoint for smooth, Gemini-like responses"""
+    started = time.perf_counter()
+    mode = request.stream_mode or settings.STREAM_MODE
     
     async def generate_response():
-        # Process the message
-        intent_data = nlu_service.process_text(request.message)
-        response_text = ""
-        
-        # Handle different intents using MCP
-        if intent_data["intent"] == "order_food":
-            search_result = await mcp_client.search_food(intent_data.get("item", "pizza"))
-            
-            if search_result.get("success") and search_result.get("results"):
-                first_item = search_result["results"][0]
-                order_result = await mcp_client.place_food_order(
-                    first_item["id"],
-                    intent_data.get("quantity", 1)
-                )
-                
-                if order_result.get("success"):
-                    response_text = (
-                        f"I have placed an order for {order_result['item']} from {order_result['restaurant']}. "
-                        f"Order ID: {order_result['order_id']}. Estimated delivery: {order_result['estimated_delivery']}."
-                    )
-                else:
-                    response_text = f"Sorry, I couldn't place the order. {order_result.get('error', 'Unknown error')}"
-            else:
-                response_text = f"Sorry, I couldn't find {intent_data.get('item', 'that item')}."
+        # Process the message and acknowledge as soon as the intent is known
+        nlus = chat_pipeline.understand(request.message)
+        yield comment_frame(f"intent {combined_intent(nlus)}")
+        STREAM_FIRST_BYTE_SECONDS.observe(time.perf_counter() - started, endpoint="stream")
         
-        elif intent_data["intent"] == "order_product":
-            search_result = await mcp_client.search_product(intent_data.get("item", "kindle"))
-            
-            if search_result.get("success") and search_result.get("results"):
-                first_product = search_result["results"][0]
-                order_result = await mcp_client.place_product_order(
-                    first_product["id"],
-                    intent_data.get("quantity", 1)
-                )
-                
-                if order_result.get("success"):
-                    response_text = (
-                        f"I have placed an order for {order_result['product']}. "
-                        f"Order ID: {order_result['order_id']}. Estimated delivery: {order_result['estimated_delivery']}."
-                    )
-                else:
-                    response_text = f"Sorry, I couldn't place the order. {order_result.get('error', 'Unknown error')}"
-            else:
-                response_text = f"Sorry, I couldn't find {intent_data.get('item', 'that product')}."
+        # Handle the intent using MCP
+        turn = await _complete_unless_disconnected(http_request, nlus)
+        if turn is None:
+            return
+        response_text = turn.response
         
-        elif intent_data["intent"] == "check_balance":
-            account_id = intent_data.get("account_id", "123456")
-            balance_result = await mcp_client.get_balance(account_id)
+        if mode == "char":
+            # Stream the response character-by-character (Gemini-style)
+            for frame in build_frames(response_text, "char")[:-1]:
+                if await http_request.is_disconnected():
+                    return
+                yield frame
+                await asyncio.sleep(settings.STREAM_PACE_MS / 1000)  # Smooth typing effect
             
-            if balance_result.get("success"):
-                account = balance_result["account"]
-                response_text = f"Your {account['account_type']} account balance is ${account['balance']:.2f} {account['currency']}."
-            else:
-                response_text = f"Sorry, I couldn't retrieve your balance. {balance_result.get('error', 'Unknown error')}"
-        
+            # Send completion signal
+            yield DONE_FRAME
         else:
-            response_text = "I didn't understand that. Try saying 'Order pizza', 'Buy a Kindle', or 'Check my balance'."
-        
-        # Stream the response character-by-character (Gemini-style)
-        for char in response_text:
-            yield f"data: {json.dumps({'type': 'token', 'content': char})}\n\n"
-            await asyncio.sleep(0.02)  # 20ms delay for smooth typing effect
+            # Word/chunk frames go out in a single write; pacing is left to the client
+            yield b"".join(build_frames(
+                response_text,
+                mode,
+                chunk_size=settings.STREAM_CHUNK_SIZE,
+                pace_ms=settings.STREAM_PACE_MS
+            ))
         
-        # Send completion signal
-        yield f"data: {json.dumps({'type': 'done'})}\n\n"
+        STREAM_DURATION_SECONDS.observe(time.perf_counter() - started, mode=mode)
     
     return StreamingResponse(
         generate_response(),
@@ -154,3 +121,100 @@ async def chat_stream(request: ChatRequest):
             "X-Accel-Buffering": "no"
         }
     )
+
+
+@router.websocket("/ws")
+async def chat_websocket(websocket: WebSocket):
+    """
+    Persistent chat session - many turns over one connection
+    
+    Each incoming {"message": ..., "stream_mode": ..., "turn_id": ...} text frame
+    starts a turn. Turns run concurrently and every event they emit carries the
+    turn_id; a turn that fails ends with an error event instead of "done".
+    Binary frames, and messages sent while WS_MAX_ACTIVE_TURNS turns are in
+    progress, are answered with an error event.
+    """
+    await websocket.accept()
+    session = session_store.create()
+    send_lock = asyncio.Lock()
+    active_turns: Set[asyncio.Task] = set()
+    
+    async def send(payload: Dict[str, Any]):
+        async with send_lock:
+            await websocket.send_text(json.dumps(payload))
+    
+    async def run_turn(request: ChatRequest, turn_id: Any):
+        started = time.perf_counter()
+        nlus = chat_pipeline.understand(request.message)
+        intent = combined_intent(nlus)
+        session.record_intent(intent)
+        await send({"type": "intent", "intent": intent, "turn_id": turn_id})
+        STREAM_FIRST_BYTE_SECONDS.observe(time.perf_counter() - started, endpoint="ws")
+        
+        turn = await chat_pipeline.complete(nlus)
+        mode = request.stream_mode or settings.STREAM_MODE
+        
+        if mode == "char":
+            for event in build_events(turn.response, "char"):
+                await send({**event, "turn_id": turn_id})
+                await asyncio.sleep(settings.STREAM_PACE_MS / 1000)  # Smooth typing effect
+        else:
+            for event in build_events(
+                turn.response,
+                mode,
+                chunk_size=settings.STREAM_CHUNK_SIZE,
+                pace_ms=settings.STREAM_PACE_MS
+            ):
+                await send({**event, "turn_id": turn_id})
+        
+        await send({"type": "done", "turn_id": turn_id})
+    
+    async def report_failure(turn_id: Any):
+        try:
+            await send({"type": "error", "error": "Sorry, something went wrong with that request.", "turn_id": turn_id})
+        except Exception:
+            pass  # Connection already gone
+    
+    def turn_finished(task: asyncio.Task, turn_id: Any):
+        active_turns.discard(task)
+        if task.cancelled() or task.exception() is None:
+            return
+        logger.error("Chat turn %s of session %s failed", turn_id, session.session_id, exc_info=task.exception())
+        report = asyncio.ensure_future(report_failure(turn_id))
+        active_turns.add(report)
+        report.add_done_callback(active_turns.discard)
+    
+    try:
+        await send({"type": "session", "session_id": session.session_id})
+        
+        while True:
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                break
+            raw = frame.get("text")
+            if raw is None:
+                await send({"type": "error", "error": "Invalid message: expected a JSON text frame"})
+                continue
+            try:
+                data = json.loads(raw)
+                request = ChatRequest(**data)
+            except (ValueError, TypeError, ValidationError) as e:
+                await send({"type": "error", "error": f"Invalid message: {e}"})
+                continue
+            
+            turn_number = session.next_turn()
+            turn_id = data.get("turn_id", turn_number)
+            if len(active_turns) >= settings.WS_MAX_ACTIVE_TURNS:
+                await send({"type": "error", "error": "Too many turns in progress, try again shortly", "turn_id": turn_id})
+                continue
+            task = asyncio.create_task(run_turn(request, turn_id))
+            active_turns.add(task)
+            task.add_done_callback(functools.partial(turn_finished, turn_id=turn_id))
+    
+    except WebSocketDisconnect:
+        pass
+    
+    finally:
+        for task in active_turns:
+            task.cancel()
+        session_store.close(session.session_id)
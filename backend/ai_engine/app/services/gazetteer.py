@@ -0,0 +1,130 @@
+"""
+Entity Gazetteer
+Token trie over catalog names with leftmost-longest matching
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from backend.mcp_servers.core.fuzzy_index import FuzzyIndex
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Trie node key holding the entry that ends at that node
+_END = "\0"
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with simple plural folding ("pizzas" -> "pizza")"""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+@dataclass(frozen=True)
+class EntityMatch:
+    """A catalog entity found in text"""
+    kind: str
+    entity_id: str
+    name: str
+    start: int  # Token offsets
+    end: int
+
+
+class Gazetteer:
+    """Multi-word entity names stored in a token trie"""
+
+    def __init__(self):
+        self._root: Dict[str, Any] = {}
+        self.size = 0
+        # Bumped on every change so callers can drop results derived from older contents
+        self.version = 0
+        self.vocabulary: Set[str] = set()
+        self._names: Dict[str, List[Tuple[str, Tuple[str, str, str]]]] = {}
+        # One fuzzy index per kind, built on first use
+        self._fuzzy: Dict[str, FuzzyIndex] = {}
+
+    def add(self, kind: str, name: str, entity_id: str) -> None:
+        tokens = tokenize(name)
+        if not tokens:
+            return
+        self.vocabulary.update(tokens)
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        if _END not in node:
+            self.size += 1
+        node[_END] = (kind, entity_id, name)
+        self._names.setdefault(kind, []).append((name, node[_END]))
+        self._fuzzy.pop(kind, None)
+        self.version += 1
+
+    def find_all(self, text: str) -> List[EntityMatch]:
+        """
+        Leftmost-longest matches over the text
+
+        Each position walks the trie only as deep as the longest name, so the
+        cost is linear in the text length for a given catalog.
+        """
+        tokens = tokenize(text)
+        matches = []
+        i = 0
+        while i < len(tokens):
+            node = self._root
+            longest: Optional[Tuple[int, Tuple[str, str, str]]] = None
+            j = i
+            while j < len(tokens) and tokens[j] in node:
+                node = node[tokens[j]]
+                j += 1
+                if _END in node:
+                    longest = (j, node[_END])
+            if longest is None:
+                i += 1
+                continue
+            end, (kind, entity_id, name) = longest
+            matches.append(EntityMatch(kind, entity_id, name, i, end))
+            i = end
+        return matches
+
+    def best_by_kind(self, text: str) -> Dict[str, EntityMatch]:
+        """Longest match per entity kind (first one on ties)"""
+        best: Dict[str, EntityMatch] = {}
+        for match in self.find_all(text):
+            current = best.get(match.kind)
+            if current is None or (match.end - match.start) > (current.end - current.start):
+                best[match.kind] = match
+        return best
+
+    def fuzzy_match(self, text: str, kind: str, min_score: float = 0.4) -> Optional[EntityMatch]:
+        """Closest catalog name of a kind by trigram similarity, for misspelt names"""
+        index = self._fuzzy.get(kind)
+        if index is None:
+            index = self._fuzzy[kind] = FuzzyIndex(self._names.get(kind, ()))
+        entry = index.best(text, min_score=min_score)
+        if entry is None:
+            return None
+        _, entity_id, name = entry
+        return EntityMatch(kind, entity_id, name, 0, 0)
+
+
+def build_gazetteer(catalogs: Iterable[Tuple[str, Iterable[Dict[str, Any]]]]) -> Gazetteer:
+    """Build a gazetteer from (kind, items) pairs of catalog dicts with an id and name"""
+    gazetteer = Gazetteer()
+    for kind, items in catalogs:
+        for item in items:
+            gazetteer.add(kind, item["name"], item["id"])
+    return gazetteer
+
+
+def load_catalog_gazetteer() -> Gazetteer:
+    """Build the gazetteer from the Zomato and Amazon server catalogs"""
+    from backend.mcp_servers.servers.zomato_server import MOCK_FOOD_ITEMS
+    from backend.mcp_servers.servers.amazon_server import MOCK_PRODUCTS
+
+    return build_gazetteer([
+        ("food", MOCK_FOOD_ITEMS.iter_rows(("id", "name"))),
+        ("product", MOCK_PRODUCTS.iter_rows(("id", "name"))),
+    ])
@@ -0,0 +1,99 @@
+"""
+MCP HTTP Transport
+Tool calls to remote MCP servers over streamable HTTP with a pooled httpx client
+"""
+
+import itertools
+import json
+from typing import Any, Dict, Iterable, Optional
+import httpx
+from mcp import McpError
+from mcp.types import LATEST_PROTOCOL_VERSION, CallToolResult, ErrorData
+from backend.ai_engine.app.services.tool_registry import MCP_SERVER_MODULES
+
+
+def _parse_sse_message(text: str) -> Dict[str, Any]:
+    """First JSON-RPC message of an event-stream body (servers may answer with SSE)"""
+    data = [line[5:].strip() for line in text.splitlines() if line.startswith("data:")]
+    message: Dict[str, Any] = json.loads("\n".join(data))
+    return message
+
+
+class HttpTransport:
+    """
+    JSON-RPC tools/call requests to {base_url}/{server}/mcp
+
+    One httpx.AsyncClient is shared by every server and call, so connections
+    (and TLS sessions) are kept alive and reused from a bounded pool. The
+    servers run stateless, so no MCP session handshake is needed either.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        servers: Optional[Iterable[str]] = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.servers = set(MCP_SERVER_MODULES if servers is None else servers)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.http2 = http2
+        self.transport = transport  # e.g. httpx.ASGITransport to call an in-process app
+        self._client: Optional[httpx.AsyncClient] = None
+        self._ids = itertools.count(1)
+
+    def has_server(self, server_name: str) -> bool:
+        return server_name in self.servers
+
+    async def start(self) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=self.limits,
+                http2=self.http2,
+                transport=self.transport,
+                headers={
+                    "Accept": "application/json, text/event-stream",
+                    "MCP-Protocol-Version": LATEST_PROTOCOL_VERSION,
+                }
+            )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def call_tool(
+        self, server_name: str, tool_name: str, arguments: Dict[str, Any], timeout: float
+    ) -> CallToolResult:
+        await self.start()
+        client = self._client
+        if client is None:
+            raise ConnectionError("HTTP transport is closed")
+        payload = {
+            "jsonrpc": "2.0",
+            "id": next(self._ids),
+            "method": "tools/call",
+            "params": {"name": tool_name, "arguments": arguments},
+        }
+        try:
+            response = await client.post(f"/{server_name}/mcp", json=payload, timeout=timeout)
+        except httpx.TimeoutException as e:
+            raise TimeoutError(f"{server_name}.{tool_name} timed out after {timeout}s") from e
+        response.raise_for_status()
+
+        if response.headers.get("content-type", "").startswith("text/event-stream"):
+            message = _parse_sse_message(response.text)
+        else:
+            message = response.json()
+        if "error" in message:
+            raise McpError(ErrorData.model_validate(message["error"]))
+        return CallToolResult.model_validate(message["result"])
@@ -0,0 +1,184 @@
+"""
+Intent Classifier
+Hashed n-gram TF-IDF features scored against labelled example utterances with NumPy
+"""
+
+import re
+import zlib
+from typing import Dict, List, Mapping, Sequence, Tuple
+import numpy as np
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Bound on the feature -> bucket memo (replay traffic can contain many unique tokens)
+_MAX_CACHED_FEATURES = 200_000
+
+# Labelled example utterances per intent
+INTENT_EXAMPLES: Dict[str, List[str]] = {
+    "order_food": [
+        "order a pizza",
+        "order me some food",
+        "i want biryani for dinner",
+        "get me a burger from mcdonalds",
+        "can you order pasta",
+        "deliver a cheese pizza",
+        "i'm hungry order something to eat",
+        "order two chicken biryani",
+        "food delivery please",
+        "i would like a veg burger",
+    ],
+    "order_product": [
+        "buy a kindle",
+        "purchase an echo dot",
+        "i need a usb cable",
+        "order a fire tv stick from amazon",
+        "add a kindle paperwhite to my cart",
+        "get me a new charger",
+        "shop for electronics",
+        "buy two usb cables",
+        "i want to purchase a smart speaker",
+        "amazon order for headphones",
+    ],
+    "check_balance": [
+        "check my balance",
+        "what is my account balance",
+        "how much money do i have",
+        "show my bank balance",
+        "how much is in my savings account",
+        "what's left in my checking account",
+        "tell me my balance",
+        "do i have enough money",
+    ],
+    "process_payment": [
+        "pay 50 dollars to the electric company",
+        "make a payment",
+        "transfer 100 to john",
+        "send money to my landlord",
+        "pay my phone bill",
+        "wire 200 dollars",
+        "pay the restaurant",
+        "transfer funds to savings",
+    ],
+}
+
+
+def extract_features(text: str) -> List[str]:
+    """Word unigrams and bigrams plus character trigrams of each word"""
+    words = _WORD_RE.findall(text.lower())
+    features = [f"w:{word}" for word in words]
+    features.extend(f"b:{a}_{b}" for a, b in zip(words, words[1:]))
+    for word in words:
+        padded = f"<{word}>"
+        features.extend(f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2))
+    return features
+
+
+class IntentClassifier:
+    """
+    Nearest-example intent classifier
+
+    Every text becomes an L2-normalised TF-IDF vector over hashed features. An
+    intent's score is the highest cosine similarity between the text and any of
+    its examples, so a whole batch is scored with one sparse-dense product per chunk.
+    """
+
+    def __init__(
+        self,
+        examples: Mapping[str, Sequence[str]] = INTENT_EXAMPLES,
+        n_features: int = 4096,
+        min_score: float = 0.3,
+        chunk_size: int = 2048
+    ):
+        self.n_features = n_features
+        self.min_score = min_score
+        self.chunk_size = chunk_size
+        self.intents = sorted(examples)
+        self._buckets: Dict[str, int] = {}
+
+        # Examples grouped by intent so per-intent maxima are a single reduceat
+        texts: List[str] = []
+        starts: List[int] = []
+        for intent in self.intents:
+            starts.append(len(texts))
+            texts.extend(examples[intent])
+        self._starts = np.array(starts)
+
+        counts = self._term_counts(texts)
+        document_frequency = np.count_nonzero(counts, axis=0)
+        self.idf = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1.0).astype(np.float32)
+        self.example_matrix = self._vectorize_counts(counts)
+        # (n_features, n_examples) so a query feature selects a contiguous row
+        self._example_columns = np.ascontiguousarray(self.example_matrix.T)
+
+    def _cells(self, texts: Sequence[str]) -> np.ndarray:
+        """Flat (row * n_features + bucket) index of every feature occurrence"""
+        cells: List[int] = []
+        for row, text in enumerate(texts):
+            offset = row * self.n_features
+            cells.extend(offset + self._bucket(feature) for feature in extract_features(text))
+        return np.asarray(cells, dtype=np.int64)
+
+    def _bucket(self, feature: str) -> int:
+        bucket = self._buckets.get(feature)
+        if bucket is None:
+            bucket = zlib.crc32(feature.encode("utf-8")) % self.n_features
+            if len(self._buckets) < _MAX_CACHED_FEATURES:
+                self._buckets[feature] = bucket
+        return bucket
+
+    def _term_counts(self, texts: Sequence[str]) -> np.ndarray:
+        """Dense (len(texts), n_features) term counts - used for the example set only"""
+        size = len(texts) * self.n_features
+        counts = np.bincount(self._cells(texts), minlength=size).astype(np.float32)
+        return counts.reshape(len(texts), self.n_features)
+
+    def _vectorize_counts(self, counts: np.ndarray) -> np.ndarray:
+        weighted = np.log1p(counts) * self.idf
+        norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors: np.ndarray = weighted / norms
+        return vectors
+
+    def score_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Return a (len(texts), len(intents)) matrix of intent scores
+
+        Query vectors stay sparse (row, bucket, weight) triples; their product
+        with the dense example matrix is a gather plus a segmented sum.
+        """
+        scores = np.zeros((len(texts), len(self.intents)), dtype=np.float32)
+        for start in range(0, len(texts), self.chunk_size):
+            chunk = texts[start:start + self.chunk_size]
+            cells, counts = np.unique(self._cells(chunk), return_counts=True)
+            if not len(cells):
+                continue
+            rows = cells // self.n_features
+            buckets = cells % self.n_features
+
+            weights = np.log1p(counts.astype(np.float32)) * self.idf[buckets]
+            norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=len(chunk)))
+            weights /= norms[rows]
+
+            # Sparse (chunk x features) @ dense (features x examples)
+            contributions = weights[:, None] * self._example_columns[buckets]
+            present, row_starts = np.unique(rows, return_index=True)
+            similarities = np.zeros((len(chunk), self._example_columns.shape[1]), dtype=np.float32)
+            similarities[present] = np.add.reduceat(contributions, row_starts, axis=0)
+
+            scores[start:start + len(chunk)] = np.maximum.reduceat(similarities, self._starts, axis=1)
+        return scores
+
+    def classify_batch(self, texts: Sequence[str]) -> List[Tuple[str, float]]:
+        """Best intent and score per text; "unknown" below min_score"""
+        if not texts:
+            return []
+        scores = self.score_batch(texts)
+        best = scores.argmax(axis=1)
+        results = []
+        for index, score in zip(best, scores[np.arange(len(texts)), best]):
+            score = float(score)
+            results.append((self.intents[index] if score >= self.min_score else "unknown", score))
+        return results
+
+    def classify(self, text: str) -> Tuple[str, float]:
+        return self.classify_batch([text])[0]
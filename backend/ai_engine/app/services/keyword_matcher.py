@@ -0,0 +1,111 @@
+"""
+Keyword Matcher
+Compiles keyword groups into one regex so a single scan finds every keyword and number
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Digits with an optional currency sign and decimal part, e.g. "2", "$45.50"
+_NUMBER_PATTERN = r"\$?\d+(?:\.\d+)?"
+
+
+@dataclass(frozen=True)
+class KeywordGroup:
+    """
+    Named list of keywords, highest priority first
+
+    Keywords match anywhere in the text, as plain substrings ("order" matches
+    "reorder", "pay" matches "repay"); whole-word groups require word boundaries
+    on both sides ("ten" does not match "often" or "tent").
+    """
+    name: str
+    keywords: Sequence[str]
+    whole_word: bool = False
+
+
+@dataclass
+class ScanResult:
+    """Everything a single pass over the text found"""
+    text: str = ""
+    # Best (highest priority) keyword hit per group, as (priority, keyword)
+    best: Dict[str, Tuple[int, str]] = field(default_factory=dict)
+    # Numeric tokens in text order, as written (e.g. "$45.50")
+    numbers: List[str] = field(default_factory=list)
+    # Catalog entities matched alongside the keywords, keyed like groups
+    entities: Dict[str, Any] = field(default_factory=dict)
+    # Text as typed, when spelling correction rewrote it before the scan
+    typed: str = ""
+
+    def has(self, group: str) -> bool:
+        return group in self.best or group in self.entities
+
+    def top(self, group: str) -> Optional[str]:
+        """Highest priority keyword of a group found in the text"""
+        hit = self.best.get(group)
+        return hit[1] if hit else None
+
+
+class KeywordMatcher:
+    """
+    Single-pass matcher over a set of keyword groups
+
+    The pattern is one lookahead tried at every position of the text, so
+    overlapping keywords are all found, as with substring tests. At each
+    position the longest keyword matches; shorter keywords that are its
+    prefixes are credited from a table built at startup.
+    """
+
+    def __init__(self, groups: Sequence[KeywordGroup]):
+        # keyword -> [(group, priority)]; a keyword may belong to several groups
+        self._index: Dict[str, List[Tuple[str, int]]] = {}
+        whole_words = set()
+        for group in groups:
+            for priority, keyword in enumerate(group.keywords):
+                self._index.setdefault(keyword, []).append((group.name, priority))
+                if group.whole_word:
+                    whole_words.add(keyword)
+        self._whole_words = whole_words
+
+        # Shorter keywords found wherever a longer one starts ("pay" in "payment")
+        self._prefixes: Dict[str, List[str]] = {
+            keyword: [other for other in self._index if other != keyword and keyword.startswith(other)]
+            for keyword in self._index
+        }
+
+        # Longest first so the longest keyword at a position is the one reported
+        alternatives = []
+        for keyword in sorted(self._index, key=len, reverse=True):
+            pattern = r"\s+".join(re.escape(part) for part in keyword.split())
+            if keyword in whole_words:
+                pattern = r"\b" + pattern + r"\b"
+            alternatives.append(pattern)
+        alternatives.append(_NUMBER_PATTERN)
+        self._pattern = re.compile("(?=(" + "|".join(alternatives) + "))")
+
+    def scan(self, text: str) -> ScanResult:
+        """Scan lowercased text once and collect keyword and number hits"""
+        result = ScanResult(text=text)
+        number_end = 0
+        for match in self._pattern.finditer(text):
+            token = match.group(1)
+            keyword = " ".join(token.split())
+            if keyword not in self._index:
+                # Numbers do not overlap: "$45" is one number, not also "45" and "5"
+                if match.start() >= number_end:
+                    result.numbers.append(token)
+                    number_end = match.start() + len(token)
+                continue
+            self._credit(result, keyword)
+            for prefix in self._prefixes[keyword]:
+                if prefix not in self._whole_words or not text[match.start() + len(prefix):][:1].isalnum():
+                    self._credit(result, prefix)
+        return result
+
+    def _credit(self, result: ScanResult, keyword: str) -> None:
+        best = result.best
+        for group, priority in self._index[keyword]:
+            current = best.get(group)
+            if current is None or priority < current[0]:
+                best[group] = (priority, keyword)
@@ -4,79 +4,340 @@ Official Model Context Protocol client for connecting to MCP servers
 """
 
 import asyncio
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Set
 import json
-import httpx
+import time
+from backend.ai_engine.app.core.config import settings
+from backend.ai_engine.app.services.metrics import (
+    JSON_DECODE_SECONDS, TOOL_CALL_SECONDS, TOOL_CALLS_TOTAL, TOOL_DEADLINE_EXCEEDED_TOTAL,
+    TOOL_HEDGED_CALLS_TOTAL, CallbackMetric, registry
+)
+from backend.ai_engine.app.services.resilience import (
+    CircuitBreaker, DeadlineExceeded, LatencyTracker, hedged, with_deadline
+)
+from backend.ai_engine.app.services.single_flight import SingleFlight
+from backend.ai_engine.app.services.tool_cache import (
+    PREFETCH_TOOLS, READ_ONLY_TOOLS, WRITE_TOOLS, ToolResultCache, tool_key
+)
+from backend.ai_engine.app.services.tool_registry import ToolRegistry
 
 
 class MCPClientService:
     """Simplified MCP Client using HTTP instead of stdio for easier integration"""
     
     def __init__(self):
-        self.base_url = "http://localhost:8000/api/v1"
+        self.base_url = settings.MCP_SERVER_URL
+        self.cache = ToolResultCache(
+            max_entries=settings.TOOL_CACHE_MAX_ENTRIES,
+            ttls=settings.TOOL_CACHE_TTLS if settings.TOOL_CACHE_ENABLED else {}
+        )
+        # Short-lived results fetched speculatively from partial transcripts
+        self.prefetched = ToolResultCache(
+            max_entries=settings.PREFETCH_MAX_ENTRIES,
+            ttls={f"{server}.{tool}": settings.PREFETCH_TTL_SECONDS for server, tool in PREFETCH_TOOLS}
+        )
+        self.single_flight = SingleFlight()
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.latency = LatencyTracker()
+        self._pending_writes: Set[asyncio.Task] = set()
+        # Bumped per server whenever a write finishes, so reads started before it are not cached
+        self._write_generation: Dict[str, int] = {}
+        self.tools = ToolRegistry()
+        # Out-of-process transport; None calls server functions in-process
+        self.transport = create_transport(settings.MCP_TRANSPORT)
     
     async def call_tool(self, server_name: str, tool_name: str, arguments: dict) -> Any:
         """
-        Call a tool via HTTP (simplified approach)
+        Call a tool, serving read-only tools from the result cache when possible
         
-        For now, we'll use direct function calls to the MCP server logic
-        This is a temporary solution until we properly implement stdio transport
+        Identical read-only calls already in flight are coalesced into one upstream
+        call. Only successful results are cached; write tools always reach the server.
+        
+        Cancelling the caller cancels pending reads, but a write that has already
+        been sent always runs to completion so it is never left half-applied.
         """
-        # Direct imports now work with proper backend package structure
+        start = time.perf_counter()
+        
+        cached = self.cache.get(server_name, tool_name, arguments)
+        if cached is None:
+            cached = self.prefetched.get(server_name, tool_name, arguments)
+        if cached is not None:
+            result = cached
+            outcome = "cache_hit"
+        else:
+            result = await self._call_uncached(server_name, tool_name, arguments)
+            outcome = "success" if isinstance(result, dict) and result.get("success") else "error"
+        
+        TOOL_CALL_SECONDS.observe(time.perf_counter() - start, server=server_name, tool=tool_name)
+        TOOL_CALLS_TOTAL.inc(server=server_name, tool=tool_name, outcome=outcome)
+        return result
+    
+    async def _call_uncached(self, server_name: str, tool_name: str, arguments: dict) -> Any:
+        """
+        Call a tool that missed the cache, within its server's breaker and deadline
+        
+        Reads are coalesced (and optionally hedged); writes are shielded, so a
+        write past the deadline keeps running while its caller gets an error.
+        """
+        breaker = self.breaker(server_name)
+        allowed, probe = breaker.allow()
+        if not allowed:
+            return {"success": False, "error": f"{server_name} is temporarily unavailable"}
+        
+        deadline = self.deadline_for(server_name, tool_name)
+        is_write = (server_name, tool_name) in WRITE_TOOLS
         try:
-            if server_name == 'zomato':
-                from backend.mcp_servers.servers.zomato_server import search_food as zomato_search, place_order as zomato_order
-                
-                if tool_name == 'search_food':
-                    result = await zomato_search(arguments.get('query', ''))
-                elif tool_name == 'place_order':
-                    result = await zomato_order(arguments.get('item_id', ''), arguments.get('quantity', 1))
-                else:
-                    return {"success": False, "error": f"Unknown tool: {tool_name}"}
-                
-                # Extract text from TextContent
-                if result and len(result) > 0:
-                    return json.loads(result[0].text)
-                    
-            elif server_name == 'amazon':
-                from backend.mcp_servers.servers.amazon_server import search_product as amazon_search, place_order as amazon_order
-                
-                if tool_name == 'search_product':
-                    result = await amazon_search(arguments.get('query', ''))
-                elif tool_name == 'place_order':
-                    result = await amazon_order(arguments.get('item_id', ''), arguments.get('quantity', 1))
-                else:
-                    return {"success": False, "error": f"Unknown tool: {tool_name}"}
-                
-                if result and len(result) > 0:
-                    return json.loads(result[0].text)
-                    
-            elif server_name == 'banking':
-                from backend.mcp_servers.servers.banking_server import get_balance as bank_balance, process_payment as bank_payment
-                
-                if tool_name == 'get_balance':
-                    result = await bank_balance(arguments.get('account_id', ''))
-                elif tool_name == 'process_payment':
-                    result = await bank_payment(
-                        arguments.get('account_id', ''),
-                        arguments.get('amount', 0),
-                        arguments.get('merchant', '')
-                    )
-                else:
-                    return {"success": False, "error": f"Unknown tool: {tool_name}"}
-                
-                if result and len(result) > 0:
-                    return json.loads(result[0].text)
-            
-            return {"success": False, "error": "Unknown server"}
-            
+            if (server_name, tool_name) in READ_ONLY_TOOLS:
+                call = self.single_flight.do(
+                    tool_key(server_name, tool_name, arguments),
+                    lambda: self._fetch(server_name, tool_name, arguments, hedge=True)
+                )
+            elif is_write:
+                write = asyncio.ensure_future(self._fetch(server_name, tool_name, arguments))
+                self._pending_writes.add(write)
+                write.add_done_callback(self._pending_writes.discard)
+                # Cached and speculative reads may be stale once the server has changed state
+                write.add_done_callback(lambda _: self._invalidate_reads(server_name))
+                call = asyncio.shield(write)
+            else:
+                call = self._fetch(server_name, tool_name, arguments)
+            return await with_deadline(call, deadline)
+        
+        except DeadlineExceeded:
+            TOOL_DEADLINE_EXCEEDED_TOTAL.inc(server=server_name, tool=tool_name)
+            if is_write:
+                # The write's own outcome is recorded when it finishes
+                return {"success": False, "error": f"{server_name}.{tool_name} was not confirmed within {deadline}s and may still complete"}
+            breaker.record_failure()
+            return {"success": False, "error": f"{server_name}.{tool_name} exceeded its {deadline}s deadline"}
         except Exception as e:
             return {"success": False, "error": str(e)}
+        finally:
+            breaker.release(probe)
+    
+    async def prefetch(self, server_name: str, tool_name: str, arguments: dict) -> bool:
+        """
+        Speculatively run a read-only tool and keep its result for PREFETCH_TTL_SECONDS
+        
+        Returns True if a result is now available to the next matching call_tool.
+        """
+        if (server_name, tool_name) not in PREFETCH_TOOLS:
+            return False
+        if self.prefetched.get(server_name, tool_name, arguments) is not None:
+            return True
+        
+        generation = self._write_generation.get(server_name, 0)
+        result = await self.call_tool(server_name, tool_name, arguments)
+        if isinstance(result, dict) and result.get("success"):
+            if generation == self._write_generation.get(server_name, 0):
+                self.prefetched.set(server_name, tool_name, arguments, result)
+            return True
+        return False
+    
+    def _invalidate_reads(self, server_name: str) -> None:
+        """Drop a server's cached and prefetched results after a write to it"""
+        self._write_generation[server_name] = self._write_generation.get(server_name, 0) + 1
+        self.cache.invalidate(server_name)
+        self.prefetched.invalidate(server_name)
+    
+    async def wait_for_pending_writes(self) -> None:
+        """Wait for writes whose callers were cancelled to finish"""
+        if self._pending_writes:
+            await asyncio.gather(*self._pending_writes, return_exceptions=True)
+    
+    async def _fetch(self, server_name: str, tool_name: str, arguments: dict, hedge: bool = False) -> Any:
+        """
+        Dispatch a tool call (hedged if requested and enabled) and cache a successful result
+        
+        A result is not cached if a write to the same server finished while it
+        was in flight, since it may predate that write.
+        """
+        generation = self._write_generation.get(server_name, 0)
+        delay = self._hedge_delay(server_name, tool_name) if hedge else None
+        result, winner = await hedged(lambda: self._attempt(server_name, tool_name, arguments), delay)
+        if winner is not None:
+            TOOL_HEDGED_CALLS_TOTAL.inc(server=server_name, tool=tool_name, winner=winner)
+        fresh = generation == self._write_generation.get(server_name, 0)
+        if fresh and isinstance(result, dict) and result.get("success"):
+            self.cache.set(server_name, tool_name, arguments, result)
+        return result
+    
+    async def _attempt(self, server_name: str, tool_name: str, arguments: dict) -> Any:
+        """One dispatch; its outcome feeds the server's circuit breaker and latency window"""
+        breaker = self.breaker(server_name)
+        start = time.perf_counter()
+        try:
+            result = await self._dispatch(server_name, tool_name, arguments)
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        self.latency.observe((server_name, tool_name), time.perf_counter() - start)
+        return result
+    
+    def _hedge_delay(self, server_name: str, tool_name: str) -> Optional[float]:
+        """When to send a hedged read, or None to send just one attempt"""
+        if not settings.MCP_HEDGE_READS or self.breaker(server_name).state != CircuitBreaker.CLOSED:
+            return None
+        delay = self.latency.quantile((server_name, tool_name), settings.MCP_HEDGE_QUANTILE)
+        return None if delay is None else max(delay, settings.MCP_HEDGE_MIN_DELAY)
+    
+    def breaker(self, server_name: str) -> CircuitBreaker:
+        breaker = self.breakers.get(server_name)
+        if breaker is None:
+            breaker = self.breakers[server_name] = CircuitBreaker(
+                failure_threshold=settings.MCP_BREAKER_FAILURE_THRESHOLD,
+                reset_timeout=settings.MCP_BREAKER_RESET_SECONDS
+            )
+        return breaker
+    
+    def deadline_for(self, server_name: str, tool_name: str) -> float:
+        """Deadline for a whole call: the server's budget, but never less than the tool's timeout"""
+        deadline = settings.MCP_SERVER_DEADLINES.get(server_name, settings.MCP_DEADLINE)
+        return max(deadline, self.timeout_for(server_name, tool_name))
+    
+    async def start(self) -> None:
+        """Build the tool dispatch table or connect the transport (called at application startup)"""
+        if self.transport is not None:
+            await self.transport.start()
+        else:
+            await self.tools.load()
+    
+    async def close(self) -> None:
+        """Let in-flight writes finish, then shut the transport down"""
+        await self.wait_for_pending_writes()
+        if self.transport is not None:
+            await self.transport.close()
+    
+    async def _dispatch(self, server_name: str, tool_name: str, arguments: dict) -> Any:
+        """
+        Call a tool's handler through the dispatch table
+        
+        Handlers are the MCP server functions themselves, called in-process;
+        structured handlers hand back their result dict without serialization.
+        """
+        if self.transport is not None:
+            return await self._dispatch_remote(server_name, tool_name, arguments)
+        
+        await self.tools.ensure_loaded()
+        binding = self.tools.get(server_name, tool_name)
+        if binding is None:
+            if not self.tools.has_server(server_name):
+                return {"success": False, "error": "Unknown server"}
+            return {"success": False, "error": f"Unknown tool: {tool_name}"}
+        
+        result = await binding.handler(**binding.bind_arguments(arguments))
+        if binding.structured:
+            # In-process fast path - no JSON round trip
+            return result
+        
+        # Extract text from TextContent
+        if result and len(result) > 0:
+            return self._decode(server_name, tool_name, result)
+        return {"success": False, "error": f"Empty response from {server_name}.{tool_name}"}
+    
+    def timeout_for(self, server_name: str, tool_name: str) -> float:
+        """Per-tool timeout for out-of-process calls"""
+        return settings.MCP_TOOL_TIMEOUTS.get(f"{server_name}.{tool_name}", settings.MCP_TOOL_TIMEOUT)
+    
+    async def _dispatch_remote(self, server_name: str, tool_name: str, arguments: dict) -> Any:
+        """Call a tool on an out-of-process server through the transport"""
+        if not self.transport.has_server(server_name):
+            return {"success": False, "error": "Unknown server"}
+        
+        timeout = self.timeout_for(server_name, tool_name)
+        result = await self.transport.call_tool(server_name, tool_name, arguments, timeout)
+        if result.isError:
+            text = result.content[0].text if result.content else f"{server_name}.{tool_name} failed"
+            return {"success": False, "error": text}
+        if not result.content:
+            return {"success": False, "error": f"Empty response from {server_name}.{tool_name}"}
+        try:
+            return self._decode(server_name, tool_name, result.content)
+        except ValueError:
+            # Plain-text replies, e.g. "Unknown tool: ..."
+            return {"success": False, "error": result.content[0].text}
+    
+    def _decode(self, server_name: str, tool_name: str, result: list) -> Any:
+        """Decode the JSON payload of a TextContent result"""
+        with JSON_DECODE_SECONDS.time(server=server_name, tool=tool_name):
+            return json.loads(result[0].text)
+
+
+def create_transport(name: str) -> Optional[Any]:
+    """Build the configured out-of-process transport ("inprocess" needs none)"""
+    if name == "inprocess":
+        return None
+    if name == "stdio":
+        from backend.ai_engine.app.services.stdio_transport import StdioTransport
+        return StdioTransport(
+            startup_timeout=settings.MCP_STDIO_STARTUP_TIMEOUT,
+            ping_interval=settings.MCP_STDIO_PING_INTERVAL,
+            restart_backoff=settings.MCP_STDIO_RESTART_BACKOFF
+        )
+    if name == "http":
+        from backend.ai_engine.app.services.http_transport import HttpTransport
+        return HttpTransport(
+            settings.MCP_SERVER_URL,
+            max_connections=settings.MCP_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.MCP_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.MCP_HTTP_KEEPALIVE_EXPIRY,
+            http2=settings.MCP_HTTP2
+        )
+    raise ValueError(f"Unknown MCP_TRANSPORT: {name}")
 
 
 # Global MCP client instance
 mcp_client = MCPClientService()
 
+registry.register(CallbackMetric(
+    "mcp_tool_cache_entries",
+    "Entries currently held in the tool result cache",
+    lambda: {(): len(mcp_client.cache)}
+))
+registry.register(CallbackMetric(
+    "mcp_tool_cache_lookups_total",
+    "Tool result cache lookups by result",
+    lambda: {("hit",): mcp_client.cache.hits, ("miss",): mcp_client.cache.misses},
+    labelnames=["result"],
+    type_name="counter"
+))
+registry.register(CallbackMetric(
+    "mcp_tool_cache_evictions_total",
+    "Entries evicted from the tool result cache to stay within its size bound",
+    lambda: {(): mcp_client.cache.evictions},
+    type_name="counter"
+))
+registry.register(CallbackMetric(
+    "mcp_circuit_state",
+    "Circuit breaker state per MCP server (0 closed, 1 half-open, 2 open)",
+    lambda: {
+        (server,): {CircuitBreaker.CLOSED: 0, CircuitBreaker.HALF_OPEN: 1, CircuitBreaker.OPEN: 2}[breaker.state]
+        for server, breaker in mcp_client.breakers.items()
+    },
+    labelnames=["server"]
+))
+registry.register(CallbackMetric(
+    "mcp_circuit_rejected_total",
+    "Tool calls rejected without reaching the server because its circuit was open",
+    lambda: {(server,): breaker.rejected for server, breaker in mcp_client.breakers.items()},
+    labelnames=["server"],
+    type_name="counter"
+))
+registry.register(CallbackMetric(
+    "mcp_circuit_opened_total",
+    "Times each MCP server's circuit has opened",
+    lambda: {(server,): breaker.opened for server, breaker in mcp_client.breakers.items()},
+    labelnames=["server"],
+    type_name="counter"
+))
+registry.register(CallbackMetric(
+    "mcp_single_flight_shared_total",
+    "Read-only tool calls that joined an identical call already in flight",
+    lambda: {(): mcp_client.single_flight.shared},
+    type_name="counter"
+))
+
 
 # Helper functions for specific integrations
 
@@ -142,3 +403,11 @@ async def process_payment(account_id: str, amount: float, merchant: str) -> dict
         return result
     except Exception as e:
         return {"success": False, "error": str(e)}
+
+
+async def prefetch(server_name: str, tool_name: str, arguments: dict) -> bool:
+    """Warm the prefetch cache for a read-only tool call"""
+    try:
+        return await mcp_client.prefetch(server_name, tool_name, arguments)
+    except Exception:
+        return False
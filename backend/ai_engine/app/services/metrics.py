@@ -0,0 +1,227 @@
+"""
+Metrics
+Minimal Prometheus text-format counters and histograms for the chat hot path
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple, TypeVar
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Metric:
+    """Base class for a named metric family"""
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _label_values(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+            *self.samples(),
+        ]
+
+
+class Counter(Metric):
+    """Monotonically increasing counter"""
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._label_values(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Histogram(Metric):
+    """Cumulative-bucket histogram of observed values (seconds)"""
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._label_values(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * len(self.buckets)
+            self._sums[key] = 0.0
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall-clock duration of a block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[str]:
+        lines = []
+        bucket_names = self.labelnames + ("le",)
+        for key, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(bucket_names, key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(self._sums[key])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class CallbackMetric(Metric):
+    """Metric whose labelled values are read from a callback at scrape time"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Dict[LabelValues, float]],
+        labelnames: Sequence[str] = (),
+        type_name: str = "gauge"
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+        self.type_name = type_name
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in self.callback().items()
+        ]
+
+
+M = TypeVar("M", bound=Metric)
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together on /metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: M) -> M:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# =============================================================================
+# CHAT TURN STAGES
+# =============================================================================
+
+NLU_SECONDS = registry.register(Histogram(
+    "chat_nlu_seconds",
+    "Time spent in NLUService.process_text"
+))
+RENDER_SECONDS = registry.register(Histogram(
+    "chat_render_seconds",
+    "Time spent rendering the response text",
+    ["intent"]
+))
+TURNS_TOTAL = registry.register(Counter(
+    "chat_turns_total",
+    "Chat turns processed",
+    ["intent"]
+))
+STREAM_FIRST_BYTE_SECONDS = registry.register(Histogram(
+    "chat_stream_first_byte_seconds",
+    "Time from request to the first SSE byte",
+    ["endpoint"]
+))
+STREAM_DURATION_SECONDS = registry.register(Histogram(
+    "chat_stream_duration_seconds",
+    "Time from request to the last SSE byte",
+    ["mode"]
+))
+
+# =============================================================================
+# MCP TOOL CALLS
+# =============================================================================
+
+TOOL_CALL_SECONDS = registry.register(Histogram(
+    "mcp_tool_call_seconds",
+    "MCPClientService.call_tool latency",
+    ["server", "tool"]
+))
+TOOL_CALLS_TOTAL = registry.register(Counter(
+    "mcp_tool_calls_total",
+    "MCP tool calls by outcome (success, error, cache_hit)",
+    ["server", "tool", "outcome"]
+))
+JSON_DECODE_SECONDS = registry.register(Histogram(
+    "mcp_json_decode_seconds",
+    "Time spent decoding tool results from JSON",
+    ["server", "tool"]
+))
+TOOL_DEADLINE_EXCEEDED_TOTAL = registry.register(Counter(
+    "mcp_tool_deadline_exceeded_total",
+    "Tool calls abandoned after their server's deadline budget",
+    ["server", "tool"]
+))
+TOOL_HEDGED_CALLS_TOTAL = registry.register(Counter(
+    "mcp_tool_hedged_calls_total",
+    "Read-only tool calls that sent a hedged second attempt, by the attempt that answered first",
+    ["server", "tool", "winner"]
+))
@@ -1,77 +1,395 @@
-from typing import Dict, Any
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Sequence, Tuple
 import re
+from backend.ai_engine.app.core.config import settings
+from backend.ai_engine.app.services.gazetteer import Gazetteer, load_catalog_gazetteer
+from backend.ai_engine.app.services.keyword_matcher import KeywordGroup, KeywordMatcher, ScanResult
+from backend.ai_engine.app.services.metrics import CallbackMetric, registry
+from backend.mcp_servers.core.fuzzy_index import FuzzyIndex, build_vocabulary_index
+
+if TYPE_CHECKING:
+    from backend.ai_engine.app.services.intent_classifier import IntentClassifier
+
+# Conjunctions that separate independent requests in one utterance
+_CLAUSE_SPLIT_RE = re.compile(r"\s*(?:[,;&]|\band then\b|\band also\b|\bthen\b|\balso\b|\band\b)\s*")
+
+MAX_INTENTS = 4
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Minimum trigram similarity for resolving a misspelt catalog name from the whole text
+FUZZY_ENTITY_MIN_SCORE = 0.4
+# Cap for results whose item is only a close catalog name, kept below the
+# prefetch threshold so a guessed item is never acted on speculatively
+FUZZY_ENTITY_CONFIDENCE = 0.7
+MAX_CACHED_CORRECTIONS = 10_000
+
+# Utterance normalisation for the result memo: numbers as written, words, and
+# the punctuation that separates clauses; everything else is folded away
+_NORMALIZE_RE = re.compile(r"\$?\d+(?:\.\d+)?|[a-z0-9]+|[,;&]")
+
+
+def normalize_utterance(text: str) -> str:
+    """Fold case, whitespace and punctuation ("Order a Pizza!!" -> "order a pizza")"""
+    return " ".join(_NORMALIZE_RE.findall(text.lower()))
+
+# =============================================================================
+# KEYWORD TABLE (highest priority first within each group)
+# =============================================================================
+
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10
+}
+
+KEYWORD_GROUPS = [
+    KeywordGroup("order", ["order"]),
+    KeywordGroup("food_trigger", ["pizza", "biryani", "burger", "pasta", "food"]),
+    KeywordGroup("food", ["pizza", "biryani", "burger", "pasta", "chicken", "veg"]),
+    KeywordGroup("buy", ["buy", "purchase", "get me"]),
+    KeywordGroup("product", ["kindle", "echo", "fire tv", "usb"]),
+    KeywordGroup("balance", ["balance", "account", "money"]),
+    KeywordGroup("balance_explicit", ["balance"]),
+    KeywordGroup("payment", ["pay", "payment", "transfer"]),
+    KeywordGroup("number_word", list(NUMBER_WORDS), whole_word=True),
+]
+
+
+@dataclass(frozen=True)
+class IntentRule:
+    """
+    Data-driven intent definition, checked in table order
+
+    Every clause in `requires` needs a hit from at least one of its keyword
+    groups (catalog matches count as the group "<kind>_catalog"). A catalog
+    match of `entity_kind` fills "item" and "item_id", a misspelt one only
+    "item"; otherwise `item_group` fills "item" with its best hit (or
+    `default_item`). Confidence is the first value when `strong_group` or a
+    catalog entity was hit, else the second, and at most
+    FUZZY_ENTITY_CONFIDENCE for a misspelt name.
+    """
+    intent: str
+    requires: Sequence[Sequence[str]]
+    entity_kind: Optional[str] = None
+    item_group: Optional[str] = None
+    default_item: Optional[str] = None
+    quantity: bool = False
+    amount: bool = False
+    fixed: Tuple[Tuple[str, Any], ...] = ()
+    strong_group: Optional[str] = None
+    confidence: Tuple[float, float] = (0.9, 0.6)
+
+
+INTENT_RULES = [
+    # Food ordering intents
+    IntentRule(
+        "order_food",
+        requires=[["order"], ["food_trigger", "food_catalog"]],
+        entity_kind="food", item_group="food", default_item="pizza", quantity=True,
+        strong_group="food", confidence=(0.9, 0.6)
+    ),
+    # Product ordering intents (Amazon)
+    IntentRule(
+        "order_product",
+        requires=[["buy", "product", "product_catalog"]],
+        entity_kind="product", item_group="product", default_item="kindle", quantity=True,
+        strong_group="product", confidence=(0.9, 0.5)
+    ),
+    # Banking intents
+    IntentRule(
+        "check_balance",
+        requires=[["balance"]],
+        fixed=(("account_id", "123456"),),  # Default account
+        strong_group="balance_explicit", confidence=(0.9, 0.6)
+    ),
+    IntentRule(
+        "process_payment",
+        requires=[["payment"]],
+        amount=True,
+        fixed=(("account_id", "123456"), ("merchant", "Unknown")),
+        confidence=(0.7, 0.7)
+    ),
+]
+
 
 class NLUService:
+    def __init__(
+        self,
+        groups: Sequence[KeywordGroup] = KEYWORD_GROUPS,
+        rules: Sequence[IntentRule] = INTENT_RULES,
+        gazetteer: Optional[Gazetteer] = None,
+        classifier: Optional["IntentClassifier"] = None,
+        spelling_min_score: Optional[float] = None,
+        memo_max_entries: int = 0
+    ):
+        # Optional fallback for utterances no rule recognises
+        self.classifier = classifier
+        self.spelling_min_score = spelling_min_score
+
+        # Results memoised per normalised utterance, dropped whenever the tables change
+        self.memo_max_entries = memo_max_entries
+        self._memo: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._memo_version: Tuple[int, int] = (0, 0)
+        self.memo_hits = 0
+        self.memo_misses = 0
+
+        self._tables_version = 0
+        self._build_tables(groups, rules, gazetteer or Gazetteer())
+
+    def _build_tables(self, groups: Sequence[KeywordGroup], rules: Sequence[IntentRule], gazetteer: Gazetteer) -> None:
+        # Compiled once at startup; cost per utterance is one scan of the text
+        self.groups = list(groups)
+        self.rules = list(rules)
+        self.rules_by_intent = {rule.intent: rule for rule in self.rules}
+        self.matcher = KeywordMatcher(self.groups)
+        self.gazetteer = gazetteer
+
+        # Optional spelling correction of unknown words ("kindel" -> "kindle")
+        self.vocabulary = {word for group in self.groups for keyword in group.keywords for word in keyword.split()}
+        self.vocabulary |= self.gazetteer.vocabulary
+        self.spelling: Optional[FuzzyIndex] = None
+        self._corrections: Dict[str, str] = {}
+        if self.spelling_min_score is not None:
+            self.spelling = build_vocabulary_index(sorted(self.vocabulary))
+        self._tables_version += 1
+        self._memo.clear()
+
+    def reload(
+        self,
+        groups: Optional[Sequence[KeywordGroup]] = None,
+        rules: Optional[Sequence[IntentRule]] = None,
+        gazetteer: Optional[Gazetteer] = None
+    ) -> None:
+        """Swap keyword groups, rules and/or the catalog gazetteer; memoised results are dropped"""
+        self._build_tables(
+            self.groups if groups is None else groups,
+            self.rules if rules is None else rules,
+            self.gazetteer if gazetteer is None else gazetteer
+        )
+
+    def reload_catalog(self) -> None:
+        """Rebuild the gazetteer from the current server catalogs"""
+        self.reload(gazetteer=load_catalog_gazetteer())
+
+    def understand(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Memoised process_multi for live traffic
+
+        Utterances that differ only in case, spacing or punctuation share one
+        entry, and the normalised text is what gets processed so an entry never
+        depends on which spelling arrived first. Callers get their own copies.
+        """
+        if self.memo_max_entries <= 0:
+            return self.process_multi(text)
+
+        version = (self._tables_version, self.gazetteer.version)
+        if version != self._memo_version:
+            self._memo.clear()
+            self._memo_version = version
+
+        key = normalize_utterance(text)
+        results = self._memo.get(key)
+        if results is None:
+            self.memo_misses += 1
+            results = self.process_multi(key)
+            self._memo[key] = results
+            if len(self._memo) > self.memo_max_entries:
+                self._memo.popitem(last=False)
+        else:
+            self.memo_hits += 1
+            self._memo.move_to_end(key)
+        return [dict(result) for result in results]
+
+    def memo_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size of the result memo"""
+        lookups = self.memo_hits + self.memo_misses
+        return {
+            "size": len(self._memo),
+            "max_entries": self.memo_max_entries,
+            "hits": self.memo_hits,
+            "misses": self.memo_misses,
+            "hit_rate": self.memo_hits / lookups if lookups else 0.0,
+        }
+
+    def process_multi(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Split an utterance into its separate requests
+
+        "order a pizza and check my balance" yields one result per clause. Clauses
+        without a recognised intent are dropped; if fewer than two clauses are
+        recognised the whole text is processed as a single request instead, so
+        "order pizza and make it two" keeps its quantity.
+        """
+        clauses = [clause for clause in _CLAUSE_SPLIT_RE.split(text) if clause]
+        if len(clauses) < 2:
+            return [self.process_text(text)]
+
+        results = []
+        seen = set()
+        for clause in clauses:
+            intent_data = self.process_text(clause)
+            if intent_data["intent"] == "unknown":
+                continue
+            key = (intent_data["intent"], intent_data.get("item"))
+            if key in seen:
+                continue
+            seen.add(key)
+            results.append(intent_data)
+
+        if len(results) < 2:
+            return [self.process_text(text)]
+        return results[:MAX_INTENTS]
+
     def process_text(self, text: str) -> Dict[str, Any]:
-        """Process user text and extract intent and parameters"""
-        text_lower = text.lower()
-        
-        # Food ordering intents
-        if "order" in text_lower and any(food in text_lower for food in ["pizza", "biryani", "burger", "pasta", "food"]):
-            # Extract food item
-            food_items = ["pizza", "biryani", "burger", "pasta", "chicken", "veg"]
-            item = next((food for food in food_items if food in text_lower), "pizza")
-            
-            return {
-                "intent": "order_food",
-                "item": item,
-                "quantity": self._extract_quantity(text_lower)
-            }
-        
-        # Product ordering intents (Amazon)
-        elif any(keyword in text_lower for keyword in ["buy", "purchase", "get me"]) or \
-             any(product in text_lower for product in ["kindle", "echo", "fire tv", "usb"]):
-            # Extract product
-            products = ["kindle", "echo", "fire tv", "usb"]
-            item = next((prod for prod in products if prod in text_lower), "kindle")
-            
-            return {
-                "intent": "order_product",
-                "item": item,
-                "quantity": self._extract_quantity(text_lower)
-            }
-        
-        # Banking intents
-        elif any(keyword in text_lower for keyword in ["balance", "account", "money"]):
-            return {
-                "intent": "check_balance",
-                "account_id": "123456"  # Default account
-            }
-        
-        elif "pay" in text_lower or "payment" in text_lower or "transfer" in text_lower:
-            return {
-                "intent": "process_payment",
-                "account_id": "123456",
-                "amount": self._extract_amount(text_lower),
-                "merchant": "Unknown"
-            }
-        
-        return {"intent": "unknown"}
-    
-    def _extract_quantity(self, text: str) -> int:
-        """Extract quantity from text"""
+        """
+        Process user text and extract intent and parameters
+
+        "confidence" is lower when an intent was recognised but its slots fell
+        back to defaults (e.g. "order food" without a dish).
+        """
+        scan = self._scan(text)
+        result = self._match_rules(scan)
+        if result is None and self.classifier is not None:
+            result = self._classified_result(*self.classifier.classify(text), scan)
+        return result or {"intent": "unknown", "confidence": 0.0}
+
+    def process_batch(self, texts: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Process many utterances at once (offline replay)
+
+        Rules run per text; every text they miss is scored by the classifier in
+        a single batch.
+        """
+        scans = [self._scan(text) for text in texts]
+        results = [self._match_rules(scan) for scan in scans]
+
+        if self.classifier is not None:
+            misses = [i for i, result in enumerate(results) if result is None]
+            classified = self.classifier.classify_batch([texts[i] for i in misses])
+            for i, (intent, score) in zip(misses, classified):
+                results[i] = self._classified_result(intent, score, scans[i])
+
+        return [result or {"intent": "unknown", "confidence": 0.0} for result in results]
+
+    def _scan(self, text: str) -> ScanResult:
+        text_lower = self._correct_spelling(text.lower())
+        scan = self.matcher.scan(text_lower)
+        if text_lower != text.lower():
+            scan.typed = text.lower()
+        for kind, match in self.gazetteer.best_by_kind(text_lower).items():
+            scan.entities[f"{kind}_catalog"] = match
+        return scan
+
+    def _correct_spelling(self, text_lower: str) -> str:
+        """Replace unknown words with the closest keyword or catalog term"""
+        spelling, min_score = self.spelling, self.spelling_min_score
+        if spelling is None or min_score is None:
+            return text_lower
+
+        def correct(match: "re.Match[str]") -> str:
+            word = match.group()
+            if len(word) < 4 or word in self.vocabulary:
+                return word
+            corrected = self._corrections.get(word)
+            if corrected is None:
+                corrected = spelling.best(word, min_score=min_score) or word
+                if len(self._corrections) < MAX_CACHED_CORRECTIONS:
+                    self._corrections[word] = corrected
+            return corrected
+
+        return _WORD_RE.sub(correct, text_lower)
+
+    def _match_rules(self, scan: ScanResult) -> Optional[Dict[str, Any]]:
+        for rule in self.rules:
+            if all(any(scan.has(group) for group in clause) for clause in rule.requires):
+                return self._build_result(rule, scan)
+        return None
+
+    def _classified_result(self, intent: str, score: float, scan: ScanResult) -> Optional[Dict[str, Any]]:
+        """Fill slots for an intent chosen by the classifier, scored by its similarity"""
+        rule = self.rules_by_intent.get(intent)
+        if rule is None:
+            return None
+        result = self._build_result(rule, scan)
+        result["confidence"] = round(min(score, result["confidence"]), 3)
+        return result
+
+    def _build_result(self, rule: IntentRule, scan: ScanResult) -> Dict[str, Any]:
+        """Fill an intent's slots from a scan"""
+        result: Dict[str, Any] = {"intent": rule.intent}
+        entity = scan.entities.get(f"{rule.entity_kind}_catalog") if rule.entity_kind else None
+        keyword = scan.top(rule.item_group) if rule.item_group else None
+        guess = None
+        if entity is None and rule.entity_kind and self.spelling is not None and (
+            keyword is None or (scan.typed and keyword not in scan.typed)
+        ):
+            # No exact name, and no item keyword as typed - try a misspelt catalog
+            # name ("fire stik", or "biriyani" that was corrected onto a keyword)
+            guess = self.gazetteer.fuzzy_match(scan.text, rule.entity_kind, FUZZY_ENTITY_MIN_SCORE)
+        if entity:
+            # Exact catalog hit - the engine can order by ID without searching
+            result["item"] = entity.name.lower()
+            result["item_id"] = entity.entity_id
+        elif guess:
+            # Only a close name - the engine still searches for it
+            result["item"] = guess.name.lower()
+        elif rule.item_group:
+            result["item"] = keyword or rule.default_item
+        if rule.quantity:
+            result["quantity"] = self._extract_quantity(scan)
+        result.update(rule.fixed)
+        if rule.amount:
+            result["amount"] = self._extract_amount(scan)
+
+        strong = entity is not None or rule.strong_group is None or scan.has(rule.strong_group)
+        result["confidence"] = rule.confidence[0] if strong else rule.confidence[1]
+        if guess:
+            result["confidence"] = min(result["confidence"], FUZZY_ENTITY_CONFIDENCE)
+        return result
+
+    def _extract_quantity(self, scan: ScanResult) -> int:
+        """Extract quantity from scanned numbers"""
         # Look for numbers
-        numbers = re.findall(r'\d+', text)
-        if numbers:
-            return int(numbers[0])
-        
+        if scan.numbers:
+            return int(scan.numbers[0].lstrip("$").split(".")[0])
+
         # Look for words
-        word_to_num = {
-            "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
-            "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10
-        }
-        for word, num in word_to_num.items():
-            if word in text:
-                return num
-        
+        word = scan.top("number_word")
+        if word:
+            return NUMBER_WORDS[word]
+
         return 1  # Default
-    
-    def _extract_amount(self, text: str) -> float:
-        """Extract monetary amount from text"""
-        # Look for dollar amounts
-        amounts = re.findall(r'\$?(\d+\.?\d*)', text)
-        if amounts:
-            return float(amounts[0])
+
+    def _extract_amount(self, scan: ScanResult) -> float:
+        """Extract monetary amount from scanned numbers"""
+        if scan.numbers:
+            return float(scan.numbers[0].lstrip("$"))
         return 0.0
 
-nlu_service = NLUService()
+def _load_classifier() -> Optional["IntentClassifier"]:
+    """Build the NumPy intent classifier if enabled in settings"""
+    if not settings.NLU_CLASSIFIER_ENABLED:
+        return None
+    from backend.ai_engine.app.services.intent_classifier import IntentClassifier
+    return IntentClassifier(min_score=settings.NLU_CLASSIFIER_MIN_SCORE)
+
+nlu_service = NLUService(
+    gazetteer=load_catalog_gazetteer(),
+    classifier=_load_classifier(),
+    spelling_min_score=settings.NLU_SPELLING_MIN_SCORE if settings.NLU_SPELLING_ENABLED else None,
+    memo_max_entries=settings.NLU_MEMO_MAX_ENTRIES
+)
+
+registry.register(CallbackMetric(
+    "nlu_memo_entries",
+    "Utterances currently held in the NLU result memo",
+    lambda: {(): len(nlu_service._memo)}
+))
+registry.register(CallbackMetric(
+    "nlu_memo_lookups_total",
+    "NLU result memo lookups by result",
+    lambda: {("hit",): nlu_service.memo_hits, ("miss",): nlu_service.memo_misses},
+    labelnames=["result"],
+    type_name="counter"
+))
@@ -0,0 +1,272 @@
+"""
+Chat Pipeline
+Single execution path for a chat turn: NLU -> intent handler -> tool calls -> response rendering
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from backend.ai_engine.app.services.nlu_service import nlu_service
+from backend.ai_engine.app.services import mcp_client
+from backend.ai_engine.app.services.metrics import NLU_SECONDS, RENDER_SECONDS, TURNS_TOTAL
+
+FALLBACK_RESPONSE = "I didn't understand that. Try saying 'Order pizza', 'Buy a Kindle', or 'Check my balance'."
+
+
+@dataclass
+class NLUResult:
+    """Output of the NLU stage"""
+    intent: str
+    data: Dict[str, Any]
+
+
+@dataclass
+class ToolResult:
+    """Output of a single MCP tool call"""
+    server: str
+    tool: str
+    result: Dict[str, Any]
+
+    @property
+    def success(self) -> bool:
+        return bool(self.result.get("success"))
+
+
+@dataclass
+class TurnResult:
+    """Rendered outcome of a chat turn"""
+    intent: str
+    response: str
+    tool_results: List[ToolResult] = field(default_factory=list)
+
+
+@dataclass
+class IntentHandler:
+    """Tool-calling and rendering steps for one intent"""
+    intent: str
+    execute: Callable[[NLUResult], Awaitable[List[ToolResult]]]
+    render: Callable[[NLUResult, List[ToolResult]], str]
+    # Speculatively runs the intent's read-only step; returns True if a result was cached
+    prefetch: Optional[Callable[[NLUResult], Awaitable[bool]]] = None
+
+
+INTENT_HANDLERS: Dict[str, IntentHandler] = {}
+
+
+def register_intent(handler: IntentHandler) -> IntentHandler:
+    """Register the handler used for an intent"""
+    INTENT_HANDLERS[handler.intent] = handler
+    return handler
+
+
+def _find(tool_results: List[ToolResult], tool: str) -> Optional[ToolResult]:
+    """Return the last result for a tool, if it was called"""
+    return next((r for r in reversed(tool_results) if r.tool == tool), None)
+
+
+# =============================================================================
+# ORDER FOOD (Zomato)
+# =============================================================================
+
+async def execute_order_food(nlu: NLUResult) -> List[ToolResult]:
+    """Search for the food item and order the first match"""
+    if nlu.data.get("item_id"):
+        # Exact catalog hit from NLU - no search needed
+        return [ToolResult("zomato", "place_order", await mcp_client.place_food_order(
+            nlu.data["item_id"],
+            nlu.data.get("quantity", 1)
+        ))]
+
+    search = ToolResult("zomato", "search_food", await mcp_client.search_food(nlu.data.get("item", "pizza")))
+    if not (search.success and search.result.get("results")):
+        return [search]
+
+    first_item = search.result["results"][0]
+    order = ToolResult("zomato", "place_order", await mcp_client.place_food_order(
+        first_item["id"],
+        nlu.data.get("quantity", 1)
+    ))
+    return [search, order]
+
+
+async def prefetch_order_food(nlu: NLUResult) -> bool:
+    if nlu.data.get("item_id"):
+        return True  # Nothing to search for
+    return await mcp_client.prefetch("zomato", "search_food", {"query": nlu.data.get("item", "pizza")})
+
+
+def render_order_food(nlu: NLUResult, tool_results: List[ToolResult]) -> str:
+    order = _find(tool_results, "place_order")
+    if order is None:
+        return f"Sorry, I couldn't find {nlu.data.get('item', 'that item')}."
+
+    order_result = order.result
+    if order.success:
+        return (
+            f"I have placed an order for {order_result['item']} from {order_result['restaurant']}. "
+            f"Order ID: {order_result['order_id']}. Estimated delivery: {order_result['estimated_delivery']}."
+        )
+    return f"Sorry, I couldn't place the order. {order_result.get('error', 'Unknown error')}"
+
+
+# =============================================================================
+# ORDER PRODUCT (Amazon)
+# =============================================================================
+
+async def execute_order_product(nlu: NLUResult) -> List[ToolResult]:
+    """Search for the product and order the first match"""
+    if nlu.data.get("item_id"):
+        # Exact catalog hit from NLU - no search needed
+        return [ToolResult("amazon", "place_order", await mcp_client.place_product_order(
+            nlu.data["item_id"],
+            nlu.data.get("quantity", 1)
+        ))]
+
+    search = ToolResult("amazon", "search_product", await mcp_client.search_product(nlu.data.get("item", "kindle")))
+    if not (search.success and search.result.get("results")):
+        return [search]
+
+    first_product = search.result["results"][0]
+    order = ToolResult("amazon", "place_order", await mcp_client.place_product_order(
+        first_product["id"],
+        nlu.data.get("quantity", 1)
+    ))
+    return [search, order]
+
+
+async def prefetch_order_product(nlu: NLUResult) -> bool:
+    if nlu.data.get("item_id"):
+        return True  # Nothing to search for
+    return await mcp_client.prefetch("amazon", "search_product", {"query": nlu.data.get("item", "kindle")})
+
+
+def render_order_product(nlu: NLUResult, tool_results: List[ToolResult]) -> str:
+    order = _find(tool_results, "place_order")
+    if order is None:
+        return f"Sorry, I couldn't find {nlu.data.get('item', 'that product')}."
+
+    order_result = order.result
+    if order.success:
+        return (
+            f"I have placed an order for {order_result['product']}. "
+            f"Order ID: {order_result['order_id']}. Estimated delivery: {order_result['estimated_delivery']}."
+        )
+    return f"Sorry, I couldn't place the order. {order_result.get('error', 'Unknown error')}"
+
+
+# =============================================================================
+# CHECK BALANCE (Banking)
+# =============================================================================
+
+async def execute_check_balance(nlu: NLUResult) -> List[ToolResult]:
+    """Fetch the account balance"""
+    account_id = nlu.data.get("account_id", "123456")  # Default account
+    return [ToolResult("banking", "get_balance", await mcp_client.get_balance(account_id))]
+
+
+async def prefetch_check_balance(nlu: NLUResult) -> bool:
+    return await mcp_client.prefetch("banking", "get_balance", {"account_id": nlu.data.get("account_id", "123456")})
+
+
+def render_check_balance(nlu: NLUResult, tool_results: List[ToolResult]) -> str:
+    balance = tool_results[0]
+    if balance.success:
+        account = balance.result["account"]
+        return f"Your {account['account_type']} account balance is ${account['balance']:.2f} {account['currency']}."
+    return f"Sorry, I couldn't retrieve your balance. {balance.result.get('error', 'Unknown error')}"
+
+
+register_intent(IntentHandler("order_food", execute_order_food, render_order_food, prefetch_order_food))
+register_intent(IntentHandler("order_product", execute_order_product, render_order_product, prefetch_order_product))
+register_intent(IntentHandler("check_balance", execute_check_balance, render_check_balance, prefetch_check_balance))
+
+
+def combined_intent(nlus: List[NLUResult]) -> str:
+    """Label for a turn that may carry several intents, e.g. order_food+check_balance"""
+    return "+".join(nlu.intent for nlu in nlus)
+
+
+class ChatPipeline:
+    """Runs chat turns through the registered intent handlers"""
+
+    def understand(self, message: str) -> List[NLUResult]:
+        """NLU stage - one result per request in the utterance"""
+        with NLU_SECONDS.time():
+            intents = nlu_service.understand(message)
+        return [NLUResult(intent=intent_data["intent"], data=intent_data) for intent_data in intents]
+
+    async def execute(self, nlu: NLUResult) -> List[ToolResult]:
+        """Tool-calling stage"""
+        handler = INTENT_HANDLERS.get(nlu.intent)
+        if handler is None:
+            return []
+        return await handler.execute(nlu)
+
+    def render(self, nlu: NLUResult, tool_results: List[ToolResult]) -> str:
+        """Response rendering stage"""
+        handler = INTENT_HANDLERS.get(nlu.intent)
+        if handler is None:
+            return FALLBACK_RESPONSE
+        with RENDER_SECONDS.time(intent=nlu.intent):
+            return handler.render(nlu, tool_results)
+
+    async def complete_intent(self, nlu: NLUResult) -> TurnResult:
+        """Run every stage after NLU for a single intent"""
+        tool_results = await self.execute(nlu)
+        TURNS_TOTAL.inc(intent=nlu.intent)
+        return TurnResult(
+            intent=nlu.intent,
+            response=self.render(nlu, tool_results),
+            tool_results=tool_results
+        )
+
+    async def complete(self, nlus: List[NLUResult]) -> TurnResult:
+        """
+        Run every stage after NLU
+
+        The intents of a multi-intent utterance are independent, so they are
+        dispatched concurrently and their responses merged in utterance order.
+        """
+        if len(nlus) == 1:
+            return await self.complete_intent(nlus[0])
+
+        parts = await asyncio.gather(*(self.complete_intent(nlu) for nlu in nlus))
+        return TurnResult(
+            intent=combined_intent(nlus),
+            response=" ".join(part.response for part in parts),
+            tool_results=[result for part in parts for result in part.tool_results]
+        )
+
+    async def run(self, message: str) -> TurnResult:
+        """Run a full chat turn"""
+        return await self.complete(self.understand(message))
+
+    async def prefetch(self, message: str, min_confidence: float) -> Tuple[List[NLUResult], bool]:
+        """
+        Run NLU on a partial message and, for each intent confident enough, warm
+        its read-only step so the final turn can skip it
+        """
+        nlus = self.understand(message)
+        prefetches: List[Awaitable[bool]] = []
+        for nlu in nlus:
+            handler = INTENT_HANDLERS.get(nlu.intent)
+            if handler is None or handler.prefetch is None:
+                continue
+            if nlu.data.get("confidence", 0.0) >= min_confidence:
+                prefetches.append(handler.prefetch(nlu))
+        if not prefetches:
+            return nlus, False
+        return nlus, any(await asyncio.gather(*prefetches))
+
+    async def run_batch(self, messages: List[str], concurrency: int) -> List[TurnResult]:
+        """Run many chat turns concurrently, returning results in input order"""
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run_one(message: str) -> TurnResult:
+            async with semaphore:
+                return await self.run(message)
+
+        return await asyncio.gather(*(run_one(message) for message in messages))
+
+
+chat_pipeline = ChatPipeline()
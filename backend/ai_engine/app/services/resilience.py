@@ -0,0 +1,160 @@
+"""
+Resilience
+Circuit breaker, rolling latency quantiles and hedged calls for MCP servers
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Optional, Tuple
+
+
+class DeadlineExceeded(Exception):
+    """A call ran past its deadline budget and was abandoned"""
+
+
+async def with_deadline(awaitable: Awaitable[Any], seconds: float) -> Any:
+    """Await `awaitable`, cancelling it and raising DeadlineExceeded after `seconds`"""
+    task = asyncio.ensure_future(awaitable)
+    try:
+        done, _ = await asyncio.wait({task}, timeout=seconds)
+    finally:
+        # Also covers the caller being cancelled while waiting
+        if not task.done():
+            task.cancel()
+    if not done:
+        raise DeadlineExceeded(f"Deadline of {seconds}s exceeded")
+    return task.result()
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker with half-open probing
+
+    After `failure_threshold` failures in a row the circuit opens and calls are
+    rejected without reaching the server. Once `reset_timeout` has passed it is
+    half-open: a single probe call is let through, and its outcome closes the
+    circuit again or re-opens it for another `reset_timeout`.
+    """
+
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.rejected = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def allow(self) -> Tuple[bool, bool]:
+        """
+        Whether a call may go through now, and whether it took the probe slot
+
+        Only the call holding the probe slot may release() it.
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return True, False
+        if state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True, True
+        self.rejected += 1
+        return False, False
+
+    def record_success(self) -> None:
+        self._state = self.CLOSED
+        self._failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._probing = False
+        self._failures += 1
+        if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            self._open()
+
+    def release(self, probe: bool) -> None:
+        """Free the probe slot if this call held it and ended without an outcome (e.g. cancelled)"""
+        if probe:
+            self._probing = False
+
+    def _open(self) -> None:
+        if self._state != self.OPEN:
+            self.opened += 1
+        self._state = self.OPEN
+        self._opened_at = self.clock()
+
+
+class LatencyTracker:
+    """Rolling window of recent latencies per key, for quantile estimates"""
+
+    def __init__(self, window: int = 256, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[Hashable, Deque[float]] = {}
+
+    def observe(self, key: Hashable, seconds: float) -> None:
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def quantile(self, key: Hashable, q: float) -> Optional[float]:
+        """The q-quantile of the window, or None until min_samples have been seen"""
+        samples = self._samples.get(key)
+        if samples is None or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def hedged(fn: Callable[[], Awaitable[Any]], delay: Optional[float]) -> Tuple[Any, Optional[str]]:
+    """
+    Run fn(), starting a second attempt if the first has not answered after `delay`
+
+    Returns the first successful result and which attempt produced it
+    ("primary" or "hedge"; None if no hedge was sent). A failed attempt only
+    wins if the other one fails too. The loser is cancelled.
+    """
+    if delay is None:
+        return await fn(), None
+
+    primary = asyncio.ensure_future(fn())
+    attempts = {primary: "primary"}
+    try:
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result(), None
+        attempts[asyncio.ensure_future(fn())] = "hedge"
+
+        pending = set(attempts)
+        while True:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # Prefer an attempt that succeeded; fall back to a failure once nothing is left
+            for task in done:
+                if task.exception() is None:
+                    return task.result(), attempts[task]
+            if not pending:
+                task = done.pop()
+                return task.result(), attempts[task]
+    finally:
+        for task in attempts:
+            if not task.done():
+                task.cancel()
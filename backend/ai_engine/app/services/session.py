@@ -0,0 +1,54 @@
+"""
+Chat Sessions
+Per-connection state for persistent (WebSocket) chat clients
+"""
+
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class ChatSession:
+    """State held for one connected client"""
+    session_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    created_at: float = field(default_factory=time.time)
+    last_active: float = field(default_factory=time.time)
+    turns: int = 0
+    last_intent: Optional[str] = None
+    state: Dict[str, Any] = field(default_factory=dict)
+
+    def next_turn(self) -> int:
+        """Start a new turn and return its sequence number"""
+        self.turns += 1
+        self.last_active = time.time()
+        return self.turns
+
+    def record_intent(self, intent: str) -> None:
+        self.last_intent = intent
+        self.last_active = time.time()
+
+
+class SessionStore:
+    """In-memory registry of open chat sessions"""
+
+    def __init__(self):
+        self._sessions: Dict[str, ChatSession] = {}
+
+    def create(self) -> ChatSession:
+        session = ChatSession()
+        self._sessions[session.session_id] = session
+        return session
+
+    def get(self, session_id: str) -> Optional[ChatSession]:
+        return self._sessions.get(session_id)
+
+    def close(self, session_id: str) -> None:
+        self._sessions.pop(session_id, None)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+session_store = SessionStore()
@@ -0,0 +1,72 @@
+"""
+SSE Frame Builder
+Pre-encodes Server-Sent Event frames for the chat streaming endpoints
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+STREAM_MODES = ("char", "word", "chunk")
+
+# Words keep their trailing whitespace so that joining the pieces reproduces the text
+_WORD_RE = re.compile(r"\S+\s*|\s+")
+
+DONE_FRAME = b'data: {"type": "done"}\n\n'
+
+
+def encode_event(payload: Dict[str, Any]) -> bytes:
+    """Encode a single SSE data frame"""
+    return f"data: {json.dumps(payload)}\n\n".encode("utf-8")
+
+
+def comment_frame(text: str) -> bytes:
+    """Encode an SSE comment line, which clients ignore but which flushes a first byte"""
+    return f": {text}\n\n".encode("utf-8")
+
+
+def split_text(text: str, mode: str, chunk_size: int = 48) -> List[str]:
+    """Split response text into the pieces emitted as token frames"""
+    if mode not in STREAM_MODES:
+        raise ValueError(f"Unknown stream mode: {mode!r}")
+    if mode == "char":
+        return list(text)
+
+    words = _WORD_RE.findall(text)
+    if mode == "word":
+        return words
+
+    # Chunk mode - pack whole words into pieces of roughly chunk_size characters
+    chunks: List[str] = []
+    current = ""
+    for word in words:
+        if current and len(current) + len(word) > chunk_size:
+            chunks.append(current)
+            current = ""
+        current += word
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def build_events(text: str, mode: str, chunk_size: int = 48, pace_ms: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Build the token events for a response.
+
+    When pace_ms is set it is attached to every token event as a hint so the
+    client can replay the pieces at that interval instead of the server sleeping.
+    """
+    events = []
+    for piece in split_text(text, mode, chunk_size):
+        payload: Dict[str, Any] = {"type": "token", "content": piece}
+        if pace_ms:
+            payload["pace_ms"] = pace_ms
+        events.append(payload)
+    return events
+
+
+def build_frames(text: str, mode: str, chunk_size: int = 48, pace_ms: Optional[int] = None) -> List[bytes]:
+    """Build the SSE token frames for a response, followed by the done frame"""
+    frames = [encode_event(event) for event in build_events(text, mode, chunk_size, pace_ms)]
+    frames.append(DONE_FRAME)
+    return frames
@@ -0,0 +1,186 @@
+"""
+MCP Stdio Transport
+Long-lived MCP server subprocesses with one initialized ClientSession each
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+import anyio
+from mcp import ClientSession, McpError, StdioServerParameters, stdio_client
+from mcp.types import CONNECTION_CLOSED, CallToolResult
+from backend.ai_engine.app.services.tool_registry import MCP_SERVER_MODULES
+
+# Repository root, so server modules run as `python -m backend.mcp_servers...`
+_PROJECT_ROOT = Path(__file__).resolve().parents[4]
+
+MAX_RESTART_BACKOFF = 30.0
+
+# Errors meaning the session's pipes are gone and the server must be restarted
+_CONNECTION_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream, BrokenPipeError)
+
+
+def server_parameters(module_path: str) -> StdioServerParameters:
+    """Run a server module with the engine's interpreter and environment"""
+    return StdioServerParameters(
+        command=sys.executable,
+        args=["-m", module_path],
+        env=dict(os.environ),
+        cwd=str(_PROJECT_ROOT)
+    )
+
+
+class StdioServerSession:
+    """
+    One MCP server subprocess and its ClientSession
+
+    A supervisor task owns the subprocess (the stdio and session contexts must
+    be entered and exited in the same task). It pings the server while idle
+    and restarts it with exponential backoff if it exits or stops answering.
+    Concurrent calls share the session, which matches responses by request ID.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        params: StdioServerParameters,
+        startup_timeout: float = 10.0,
+        ping_interval: float = 15.0,
+        restart_backoff: float = 0.5
+    ):
+        self.name = name
+        self.params = params
+        self.startup_timeout = startup_timeout
+        self.ping_interval = ping_interval
+        self.restart_backoff = restart_backoff
+        self.restarts = 0
+        self._session: Optional[ClientSession] = None
+        self._ready = asyncio.Event()
+        self._restart = asyncio.Event()
+        self._closing = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._session is not None
+
+    def start(self) -> None:
+        """Start the supervisor if it is not already running"""
+        if self._task is None or self._task.done():
+            self._closing = False
+            self._task = asyncio.create_task(self._supervise(), name=f"mcp-stdio-{self.name}")
+
+    async def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout or self.startup_timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def close(self) -> None:
+        """Stop the server and its supervisor"""
+        self._closing = True
+        self._restart.set()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any], timeout: float) -> CallToolResult:
+        self.start()
+        if not await self.wait_ready():
+            raise ConnectionError(f"MCP server '{self.name}' is not available")
+
+        session = self._session
+        if session is None:
+            # The server went down again between the handshake and this call
+            raise ConnectionError(f"MCP server '{self.name}' is not available")
+        try:
+            return await asyncio.wait_for(session.call_tool(tool_name, arguments), timeout)
+        except asyncio.TimeoutError as e:
+            raise TimeoutError(f"{self.name}.{tool_name} timed out after {timeout}s") from e
+        except McpError as e:
+            if e.error.code == CONNECTION_CLOSED:
+                self._request_restart(session)
+            raise
+        except _CONNECTION_ERRORS as e:
+            self._request_restart(session)
+            raise ConnectionError(f"Lost connection to MCP server '{self.name}'") from e
+
+    def _request_restart(self, session: Optional[ClientSession]) -> None:
+        # Only the first failure on a session triggers a restart; later calls
+        # wait for the new session instead of reusing the dead one
+        if session is not None and session is self._session:
+            self._ready.clear()
+            self._restart.set()
+
+    async def _supervise(self) -> None:
+        backoff = self.restart_backoff
+        while not self._closing:
+            self._restart.clear()
+            try:
+                async with stdio_client(self.params) as (read_stream, write_stream):
+                    async with ClientSession(read_stream, write_stream) as session:
+                        await asyncio.wait_for(session.initialize(), self.startup_timeout)
+                        self._session = session
+                        self._ready.set()
+                        backoff = self.restart_backoff
+                        await self._watch(session)
+            except Exception:
+                pass  # Server failed to start or died - restarted below
+            finally:
+                self._ready.clear()
+                self._session = None
+
+            if self._closing:
+                break
+            self.restarts += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, MAX_RESTART_BACKOFF)
+
+    async def _watch(self, session: ClientSession) -> None:
+        """Return when a restart or shutdown is requested; raise if the server stops answering pings"""
+        while not self._restart.is_set():
+            try:
+                await asyncio.wait_for(self._restart.wait(), self.ping_interval)
+            except asyncio.TimeoutError:
+                await asyncio.wait_for(session.send_ping(), self.startup_timeout)
+
+
+class StdioTransport:
+    """Pool of persistent stdio sessions, one per MCP server"""
+
+    def __init__(
+        self,
+        modules: Optional[Dict[str, str]] = None,
+        startup_timeout: float = 10.0,
+        ping_interval: float = 15.0,
+        restart_backoff: float = 0.5
+    ):
+        self.sessions = {
+            name: StdioServerSession(
+                name, server_parameters(module_path),
+                startup_timeout=startup_timeout,
+                ping_interval=ping_interval,
+                restart_backoff=restart_backoff
+            )
+            for name, module_path in (MCP_SERVER_MODULES if modules is None else modules).items()
+        }
+
+    def has_server(self, server_name: str) -> bool:
+        return server_name in self.sessions
+
+    async def start(self) -> None:
+        """Spawn every server and wait (bounded) for their handshakes"""
+        for session in self.sessions.values():
+            session.start()
+        await asyncio.gather(*(session.wait_ready() for session in self.sessions.values()))
+
+    async def close(self) -> None:
+        await asyncio.gather(*(session.close() for session in self.sessions.values()))
+
+    async def call_tool(
+        self, server_name: str, tool_name: str, arguments: Dict[str, Any], timeout: float
+    ) -> CallToolResult:
+        return await self.sessions[server_name].call_tool(tool_name, arguments, timeout)
@@ -0,0 +1,132 @@
+"""
+MCP Tool Result Cache
+Size-bounded LRU cache with per-tool TTLs for read-only MCP tool results
+"""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Tools with side effects - never cached, whatever the TTL configuration says
+WRITE_TOOLS = {
+    ("zomato", "place_order"),
+    ("amazon", "place_order"),
+    ("banking", "process_payment"),
+}
+
+
+# Tools without side effects - safe to coalesce while in flight
+READ_ONLY_TOOLS = {
+    ("zomato", "search_food"),
+    ("zomato", "get_restaurant_info"),
+    ("amazon", "search_product"),
+    ("amazon", "get_product_details"),
+    ("banking", "get_balance"),
+    ("banking", "get_transaction_history"),
+}
+
+# Read-only tools the prefetch endpoint may run speculatively
+PREFETCH_TOOLS = {
+    ("zomato", "search_food"),
+    ("amazon", "search_product"),
+    ("banking", "get_balance"),
+}
+
+
+def tool_key(server_name: str, tool_name: str, arguments: dict) -> Tuple[str, str, str]:
+    """Build a hashable key from a tool call, independent of argument order"""
+    return (server_name, tool_name, json.dumps(arguments, sort_keys=True, separators=(",", ":")))
+
+
+class ToolResultCache:
+    """
+    LRU cache for tool results.
+
+    TTLs are configured per tool as {"server.tool": seconds}; tools without a
+    TTL are not cached. Cached results are shared between callers and must be
+    treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttls: Optional[Dict[str, float]] = None):
+        self.max_entries = max_entries
+        self.ttls = dict(ttls or {})
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ttl_for(self, server_name: str, tool_name: str) -> Optional[float]:
+        """Return the TTL for a tool, or None if it must not be cached"""
+        if (server_name, tool_name) in WRITE_TOOLS:
+            return None
+        ttl = self.ttls.get(f"{server_name}.{tool_name}")
+        return ttl if ttl and ttl > 0 else None
+
+    def is_cacheable(self, server_name: str, tool_name: str) -> bool:
+        return self.ttl_for(server_name, tool_name) is not None
+
+    def get(self, server_name: str, tool_name: str, arguments: dict) -> Optional[Any]:
+        """Return a cached result, or None on a miss"""
+        if not self.is_cacheable(server_name, tool_name):
+            return None
+
+        key = tool_key(server_name, tool_name, arguments)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, result = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def set(self, server_name: str, tool_name: str, arguments: dict, result: Any) -> None:
+        """Store a result if the tool is cacheable"""
+        ttl = self.ttl_for(server_name, tool_name)
+        if ttl is None or self.max_entries <= 0:
+            return
+
+        key = tool_key(server_name, tool_name, arguments)
+        self._entries[key] = (time.monotonic() + ttl, result)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, server_name: Optional[str] = None, tool_name: Optional[str] = None) -> int:
+        """Drop cached entries for a server and/or tool (everything if neither is given)"""
+        if server_name is None and tool_name is None:
+            count = len(self._entries)
+            self._entries.clear()
+            return count
+
+        stale = [
+            key for key in self._entries
+            if (server_name is None or key[0] == server_name) and (tool_name is None or key[1] == tool_name)
+        ]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,107 @@
+"""
+MCP Tool Registry
+Dispatch table of MCP server tools, built once from each server's list_tools()
+"""
+
+import importlib
+import inspect
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# MCP server name -> module exposing list_tools() and one coroutine per tool
+MCP_SERVER_MODULES = {
+    "zomato": "backend.mcp_servers.servers.zomato_server",
+    "amazon": "backend.mcp_servers.servers.amazon_server",
+    "banking": "backend.mcp_servers.servers.banking_server",
+}
+
+# Fallback for arguments with neither a schema nor a Python default
+_TYPE_DEFAULTS = {"string": "", "integer": 0, "number": 0, "boolean": False}
+
+
+@dataclass(frozen=True)
+class ToolBinding:
+    """A server tool bound to its handler coroutine"""
+    server: str
+    name: str
+    handler: Callable[..., Awaitable[Any]]
+    # Handler parameters in call order, with the value used when an argument is missing
+    parameters: Tuple[str, ...]
+    defaults: Dict[str, Any]
+    input_schema: Dict[str, Any]
+    # True if the handler returns a dict rather than MCP TextContent
+    structured: bool = False
+
+    def bind_arguments(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Keyword arguments for the handler; unknown arguments are ignored"""
+        return {name: arguments.get(name, self.defaults.get(name)) for name in self.parameters}
+
+
+def bind_tool(server_name: str, tool: Any, handler: Callable[..., Awaitable[Any]]) -> ToolBinding:
+    """
+    Bind an MCP Tool definition to its handler
+
+    Missing arguments take the inputSchema default, then the handler's own
+    default, then an empty value for the schema type. Handlers declared with
+    @structured_tool are bound to their dict-returning function.
+    """
+    structured = getattr(handler, "structured", None)
+    if structured is not None:
+        handler = structured
+    properties = tool.inputSchema.get("properties", {})
+    parameters = []
+    defaults = {}
+    for name, parameter in inspect.signature(handler).parameters.items():
+        parameters.append(name)
+        spec = properties.get(name, {})
+        if "default" in spec:
+            defaults[name] = spec["default"]
+        elif parameter.default is not inspect.Parameter.empty:
+            defaults[name] = parameter.default
+        else:
+            defaults[name] = _TYPE_DEFAULTS.get(spec.get("type"))
+    return ToolBinding(
+        server_name, tool.name, handler, tuple(parameters), defaults, tool.inputSchema,
+        structured=structured is not None
+    )
+
+
+class ToolRegistry:
+    """(server, tool) -> ToolBinding, loaded once so dispatch is a dict lookup"""
+
+    def __init__(self, modules: Optional[Dict[str, str]] = None):
+        self.modules = dict(MCP_SERVER_MODULES if modules is None else modules)
+        self._tools: Dict[Tuple[str, str], ToolBinding] = {}
+        self.loaded = False
+
+    async def load(self) -> None:
+        """Import each server module and bind every tool its list_tools() advertises"""
+        tools: Dict[Tuple[str, str], ToolBinding] = {}
+        for server_name, module_path in self.modules.items():
+            module = importlib.import_module(module_path)
+            for tool in await module.list_tools():
+                handler = getattr(module, tool.name, None)
+                if handler is not None:
+                    tools[(server_name, tool.name)] = bind_tool(server_name, tool, handler)
+        self._tools = tools
+        self.loaded = True
+
+    async def ensure_loaded(self) -> None:
+        if not self.loaded:
+            await self.load()
+
+    def get(self, server_name: str, tool_name: str) -> Optional[ToolBinding]:
+        return self._tools.get((server_name, tool_name))
+
+    def has_server(self, server_name: str) -> bool:
+        return server_name in self.modules
+
+    def tools(self, server_name: Optional[str] = None) -> List[ToolBinding]:
+        """Registered tools, optionally for one server"""
+        return [
+            binding for (server, _), binding in self._tools.items()
+            if server_name is None or server == server_name
+        ]
+
+    def __len__(self) -> int:
+        return len(self._tools)
@@ -0,0 +1,37 @@
+"""
+Catalog Files
+Locating and loading the item catalogs served by the MCP servers
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from backend.mcp_servers.core.mapped_catalog import MappedCatalog, encode_catalog, open_mapped_catalog
+
+# Catalogs bundled with the package
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+def catalog_path(configured: Optional[str], default_name: str) -> Path:
+    """The configured catalog file, or the bundled default"""
+    return Path(configured) if configured else DATA_DIR / default_name
+
+
+def load_catalog(path: Path) -> List[Dict[str, Any]]:
+    """Read a JSON catalog: a list of item objects (or {"items": [...]})"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    items: List[Dict[str, Any]] = data["items"] if isinstance(data, dict) else data
+    return items
+
+
+def open_catalog(path: Path) -> MappedCatalog:
+    """
+    Open a catalog for serving
+
+    Mapped catalog files are memory-mapped; a JSON catalog (handy for local
+    edits) is encoded into the same format in memory first.
+    """
+    if path.suffix == ".json":
+        return MappedCatalog(encode_catalog(load_catalog(path)), source=str(path))
+    return open_mapped_catalog(path)
@@ -16,6 +16,7 @@ class Settings(BaseSettings):
     ZOMATO_API_KEY: str = "mock-zomato-key"
     ZOMATO_API_URL: str = "https://developers.zomato.com/api/v2.1"
     ZOMATO_MOCK_MODE: bool = True
+    ZOMATO_CATALOG_PATH: Optional[str] = None  # .mcat (or .json) food catalog, defaults to the bundled one
     
     # =============================================================================
     # AMAZON INTEGRATION
@@ -24,6 +25,7 @@ class Settings(BaseSettings):
     AMAZON_SECRET_KEY: Optional[str] = None
     AMAZON_API_URL: str = "https://webservices.amazon.com/paapi5"
     AMAZON_MOCK_MODE: bool = True
+    AMAZON_CATALOG_PATH: Optional[str] = None  # .mcat (or .json) product catalog, defaults to the bundled one
     
     # =============================================================================
     # BANKING INTEGRATION
@@ -32,6 +34,7 @@ class Settings(BaseSettings):
     BANK_API_URL: str = "https://api.yourbank.com/v1"
     BANK_ACCOUNT_ID: str = "default-account"
     BANK_MOCK_MODE: bool = True
+    BANK_TRANSACTION_LOG_PATH: str = ":memory:"  # SQLite file for the transaction log (":memory:" is per process)
     
     # =============================================================================
     # ADDITIONAL INTEGRATIONS (Optional)
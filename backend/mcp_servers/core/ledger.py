@@ -0,0 +1,152 @@
+"""
+Ledger
+Account balances with per-account locking and atomic debit/credit
+"""
+
+import asyncio
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+
+class LedgerError(Exception):
+    """A posting was rejected"""
+
+
+class AccountNotFound(LedgerError):
+    def __init__(self, account_id: str):
+        super().__init__(f"Account {account_id} not found")
+        self.account_id = account_id
+
+
+class InsufficientFunds(LedgerError):
+    def __init__(self, account_id: str):
+        super().__init__("Insufficient funds")
+        self.account_id = account_id
+
+
+def to_cents(amount: float) -> int:
+    return int(round(amount * 100))
+
+
+def from_cents(cents: int) -> float:
+    return cents / 100
+
+
+def utc_timestamp() -> str:
+    """Current UTC time as a fixed-width ISO-8601 string (sorts chronologically)"""
+    return datetime.now(timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+
+@dataclass
+class Posting:
+    """One debit or credit; amounts in cents, `balance` is the balance after it"""
+    account_id: str
+    delta: int
+    balance: int
+    description: str = ""
+    transaction_id: str = field(default_factory=lambda: f"TXN-{uuid.uuid4().hex[:12].upper()}")
+    timestamp: str = field(default_factory=utc_timestamp)
+
+    @property
+    def amount(self) -> float:
+        return from_cents(self.delta)
+
+    @property
+    def new_balance(self) -> float:
+        return from_cents(self.balance)
+
+
+# Awaited inside the account lock before the new balance is written (e.g. to persist the posting)
+PostHook = Callable[[Posting], Awaitable[None]]
+
+
+class Ledger:
+    """
+    Account balances kept in integer cents, each account behind its own asyncio lock
+
+    A debit checks the balance, awaits the post hook and writes the new balance
+    while holding the account's lock, so any I/O between the check and the
+    write cannot let two payments spend the same funds. Postings to the same
+    account are serialised in arrival order; postings to different accounts
+    never wait for each other. Once the hook has started, a cancelled caller
+    no longer abandons the posting: it settles (hook plus balance) before the
+    lock is released.
+    """
+
+    def __init__(self, accounts: Mapping[str, Mapping[str, Any]], on_post: Optional[PostHook] = None):
+        self.on_post = on_post
+        self._accounts = {account_id: dict(account) for account_id, account in accounts.items()}
+        self._balances = {account_id: to_cents(account["balance"]) for account_id, account in accounts.items()}
+        # Created on first use so they bind to the running event loop
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def __contains__(self, account_id: str) -> bool:
+        return account_id in self._balances
+
+    def balance(self, account_id: str) -> float:
+        if account_id not in self._balances:
+            raise AccountNotFound(account_id)
+        return from_cents(self._balances[account_id])
+
+    def snapshot(self, account_id: str) -> Optional[Dict[str, Any]]:
+        """Copy of the account record with its current balance, or None"""
+        account = self._accounts.get(account_id)
+        if account is None:
+            return None
+        snapshot = dict(account)
+        snapshot["balance"] = from_cents(self._balances[account_id])
+        return snapshot
+
+    async def debit(self, account_id: str, amount: float, description: str = "") -> Posting:
+        """Take `amount` from the account"""
+        return await self._post(account_id, -self._positive_cents(amount), description)
+
+    async def credit(self, account_id: str, amount: float, description: str = "") -> Posting:
+        """Add `amount` to the account"""
+        return await self._post(account_id, self._positive_cents(amount), description)
+
+    def _lock(self, account_id: str) -> asyncio.Lock:
+        lock = self._locks.get(account_id)
+        if lock is None:
+            lock = self._locks[account_id] = asyncio.Lock()
+        return lock
+
+    @staticmethod
+    def _positive_cents(amount: float) -> int:
+        cents = to_cents(amount) if amount == amount else 0  # NaN -> 0
+        if cents <= 0:
+            raise LedgerError("Amount must be at least 0.01")
+        return cents
+
+    async def _post(self, account_id: str, delta: int, description: str) -> Posting:
+        if account_id not in self._balances:
+            raise AccountNotFound(account_id)
+        async with self._lock(account_id):
+            balance = self._balances[account_id] + delta
+            if balance < 0:
+                raise InsufficientFunds(account_id)
+            settle = asyncio.ensure_future(self._settle(Posting(account_id, delta, balance, description)))
+            try:
+                return await asyncio.shield(settle)
+            except asyncio.CancelledError:
+                # The hook's write may already be durable: keep the lock until the
+                # posting settles so the balance matches it, then let the cancel through
+                while not settle.done():
+                    try:
+                        await asyncio.wait({settle})
+                    except asyncio.CancelledError:
+                        pass
+                if not settle.cancelled():
+                    settle.exception()  # Nobody is left to see it
+                raise
+
+    async def _settle(self, posting: Posting) -> Posting:
+        """Run the post hook, then apply the balance it recorded"""
+        if self.on_post is not None:
+            await self.on_post(posting)
+        self._balances[posting.account_id] = posting.balance
+        return posting
@@ -0,0 +1,256 @@
+"""
+Mapped Catalog
+Compact on-disk catalog format read through mmap, decoding rows on demand
+
+Layout (little-endian):
+    magic (8 bytes) | header length (uint64) | JSON header | sections
+
+Every section starts on an 8-byte boundary, and the header gives its offset
+from the end of the header. Numbers and booleans are fixed-width columns
+(float64 / int64 / bool). String columns hold uint32 ids into a shared string
+table of uint64 offsets plus one UTF-8 blob, so repeated values such as
+restaurant or category names are stored once. A uint32 permutation of the
+rows sorted by key is also stored; lookups by key use a dict built from the
+key column on first use.
+
+Build a catalog from its JSON source with:
+    python -m backend.mcp_servers.core.mapped_catalog food_catalog.json food_catalog.mcat
+"""
+
+import json
+import mmap
+import struct
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
+import numpy as np
+
+MAGIC = b"MCATLG\x00\x01"
+_PREAMBLE = struct.Struct("<8sQ")
+_ALIGNMENT = 8
+
+STRING = "str"
+COLUMN_DTYPES = {"f8": "<f8", "i8": "<i8", "b1": "?", STRING: "<u4"}
+
+# String id of a missing value
+NO_STRING = 0xFFFFFFFF
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _column_type(name: str, values: Sequence[Any]) -> str:
+    """Narrowest column type holding every present value"""
+    present = [value for value in values if value is not None]
+    if not present:
+        return "f8"
+    if all(isinstance(value, bool) for value in present):
+        return "b1"
+    if all(isinstance(value, int) and not isinstance(value, bool) for value in present):
+        return "i8"
+    if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in present):
+        return "f8"
+    if all(isinstance(value, str) for value in present):
+        return STRING
+    raise ValueError(f"Column {name!r} mixes value types or holds nested values")
+
+
+def encode_catalog(rows: Iterable[Mapping[str, Any]], key: str = "id") -> bytes:
+    """
+    Encode catalog rows into the mapped catalog format
+
+    Columns are the union of the row keys, in first-seen order. Missing values
+    decode as an absent key (strings and floats) or 0 / False.
+    """
+    rows = list(rows)
+    names = list(dict.fromkeys(name for row in rows for name in row))
+    if rows and key not in names:
+        raise ValueError(f"Catalog rows have no {key!r} field")
+
+    body = bytearray()
+
+    def add_section(array: np.ndarray) -> int:
+        body.extend(b"\x00" * (_aligned(len(body)) - len(body)))
+        offset = len(body)
+        body.extend(array.tobytes())
+        return offset
+
+    strings: Dict[str, int] = {}
+    columns = []
+    for name in names:
+        values = [row.get(name) for row in rows]
+        kind = _column_type(name, values)
+        if kind == STRING:
+            data = np.fromiter(
+                (NO_STRING if value is None else strings.setdefault(value, len(strings)) for value in values),
+                dtype=COLUMN_DTYPES[STRING], count=len(values)
+            )
+        elif kind == "f8":
+            data = np.array([np.nan if value is None else value for value in values], dtype=COLUMN_DTYPES[kind])
+        else:
+            data = np.array([value or 0 for value in values], dtype=COLUMN_DTYPES[kind])
+        columns.append({"name": name, "type": kind, "offset": add_section(data)})
+
+    encoded = [text.encode("utf-8") for text in strings]
+    string_offsets = np.zeros(len(encoded) + 1, dtype="<u8")
+    np.cumsum([len(text) for text in encoded], out=string_offsets[1:])
+    key_order = sorted(range(len(rows)), key=lambda row: str(rows[row][key]))
+
+    header = {
+        "rows": len(rows),
+        "key": key,
+        "columns": columns,
+        "strings": {
+            "count": len(encoded),
+            "offsets": add_section(string_offsets),
+            "data": add_section(np.frombuffer(b"".join(encoded), dtype=np.uint8)),
+        },
+        "key_order": add_section(np.asarray(key_order, dtype="<u4")),
+    }
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    preamble = _PREAMBLE.pack(MAGIC, len(header_bytes)) + header_bytes
+    return preamble + b"\x00" * (_aligned(len(preamble)) - len(preamble)) + bytes(body)
+
+
+def write_catalog(rows: Iterable[Mapping[str, Any]], path: Union[str, Path], key: str = "id") -> None:
+    """Encode catalog rows and write them to `path`"""
+    Path(path).write_bytes(encode_catalog(rows, key=key))
+
+
+class MappedCatalog:
+    """
+    Read-only catalog over a buffer in the mapped catalog format
+
+    Opening only parses the header and creates NumPy views over the buffer,
+    so it costs the same for any number of rows. Rows are decoded into dicts
+    when they are read; numeric columns can be used directly as arrays. A
+    file-backed catalog is mapped read-only, so every process serving it
+    shares the same pages through the OS page cache.
+    """
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap], source: str = "<memory>"):
+        view = memoryview(buffer)
+        if len(view) < _PREAMBLE.size:
+            raise ValueError(f"{source} is not a catalog file")
+        magic, header_length = _PREAMBLE.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{source} is not a catalog file")
+        header = json.loads(bytes(view[_PREAMBLE.size:_PREAMBLE.size + header_length]))
+        base = _aligned(_PREAMBLE.size + header_length)
+
+        self.source = source
+        self.size: int = header["rows"]
+        self.key: str = header["key"]
+        self._buffer = buffer
+        self._types: Dict[str, str] = {}
+        self._columns: Dict[str, np.ndarray] = {}
+        for column in header["columns"]:
+            self._types[column["name"]] = column["type"]
+            self._columns[column["name"]] = np.frombuffer(
+                buffer, dtype=COLUMN_DTYPES[column["type"]], count=self.size, offset=base + column["offset"]
+            )
+
+        strings = header["strings"]
+        self._string_offsets = np.frombuffer(
+            buffer, dtype="<u8", count=strings["count"] + 1, offset=base + strings["offsets"]
+        )
+        self._string_data = view[base + strings["data"]:]
+        self._key_order = np.frombuffer(buffer, dtype="<u4", count=self.size, offset=base + header["key_order"])
+        self._row_by_key: Optional[Dict[str, int]] = None
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self._columns)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, row: int) -> Dict[str, Any]:
+        return self.row(row)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iter_rows()
+
+    def column(self, name: str) -> np.ndarray:
+        """Zero-copy view of a column (string ids for string columns)"""
+        return self._columns[name]
+
+    def string(self, string_id: int) -> Optional[str]:
+        """Decode one entry of the string table"""
+        if string_id == NO_STRING:
+            return None
+        start, end = int(self._string_offsets[string_id]), int(self._string_offsets[string_id + 1])
+        return str(self._string_data[start:end], "utf-8")
+
+    def value(self, name: str, row: int) -> Any:
+        """One field of one row, as a Python value (None when missing)"""
+        raw = self._columns[name][row]
+        kind = self._types[name]
+        if kind == STRING:
+            return self.string(int(raw))
+        if kind == "f8":
+            return None if np.isnan(raw) else float(raw)
+        if kind == "b1":
+            return bool(raw)
+        return int(raw)
+
+    def row(self, row: int, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Decode a row into a dict (only `fields`, if given)"""
+        if row < 0:
+            row += self.size
+        if not 0 <= row < self.size:
+            raise IndexError(f"Catalog row {row} out of range")
+        decoded = {}
+        for name in fields or self._columns:
+            value = self.value(name, row)
+            if value is not None:
+                decoded[name] = value
+        return decoded
+
+    def iter_rows(self, fields: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Decode every row in order (only `fields`, if given)"""
+        for row in range(self.size):
+            yield self.row(row, fields)
+
+    def find_row(self, key: str) -> Optional[int]:
+        """Row number of the row with this key (the key index is built on the first call)"""
+        if self._row_by_key is None:
+            if self._types.get(self.key) == STRING:
+                keys = [self.string(code) for code in self._columns[self.key].tolist()]
+            else:
+                keys = [self.value(self.key, row) for row in range(self.size)]
+            index: Dict[str, int] = {}
+            for row, value in enumerate(keys):
+                # First row wins if a key repeats
+                index.setdefault(str(value), row)
+            self._row_by_key = index
+        return self._row_by_key.get(key)
+
+    def find(self, key: str) -> Optional[Dict[str, Any]]:
+        """Decoded row with this key, or None"""
+        row = self.find_row(key)
+        return None if row is None else self.row(row)
+
+
+def open_mapped_catalog(path: Union[str, Path]) -> MappedCatalog:
+    """Memory-map a catalog file read-only"""
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return MappedCatalog(mapped, source=str(path))
+
+
+def main(argv: Sequence[str]) -> int:
+    if len(argv) != 2:
+        print("usage: python -m backend.mcp_servers.core.mapped_catalog SOURCE.json TARGET.mcat")
+        return 2
+    from backend.mcp_servers.core.catalog import load_catalog
+
+    rows = load_catalog(Path(argv[0]))
+    write_catalog(rows, argv[1])
+    print(f"Wrote {len(rows)} rows to {argv[1]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,106 @@
+"""
+Product Store
+Vectorised product filters and sort orders over a mapped catalog
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from backend.mcp_servers.core.mapped_catalog import MappedCatalog
+from backend.mcp_servers.core.text_index import rank_page
+
+SORT_ORDERS = ("relevance", "price_asc", "price_desc", "rating")
+
+
+class ProductStore:
+    """
+    Product filters and sorts over the price, rating, in_stock and category columns
+
+    The columns are zero-copy views into the mapped catalog, so filtering and
+    sorting a million products is a handful of vectorised comparisons plus a
+    partial sort of the requested page, and only the rows on that page are
+    decoded.
+    """
+
+    def __init__(self, catalog: MappedCatalog):
+        self.rows = catalog
+        self.price = catalog.column("price")
+        self.rating = catalog.column("rating")
+        self.in_stock = catalog.column("in_stock")
+        # Categories are string-table ids, i.e. already small integer codes
+        self.category = catalog.column("category")
+        self._category_codes: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def get(self, product_id: str) -> Optional[Dict[str, Any]]:
+        return self.rows.find(product_id)
+
+    def category_code(self, category: str) -> Optional[int]:
+        """Code of a category name (case-insensitive), or None if no product has it"""
+        if self._category_codes is None:
+            names = {int(code): self.rows.string(int(code)) for code in np.unique(self.category)}
+            self._category_codes = {name.lower(): code for code, name in names.items() if name is not None}
+        return self._category_codes.get(category.lower())
+
+    def filter_mask(
+        self,
+        ids: np.ndarray,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        min_rating: Optional[float] = None,
+        category: Optional[str] = None,
+        in_stock_only: bool = False,
+        whole: bool = False
+    ) -> np.ndarray:
+        """
+        Boolean mask over `ids` of rows passing every given filter
+
+        `whole=True` says `ids` is every row in catalog order (an empty query),
+        so the columns are read without a gather.
+        """
+        def column(values: np.ndarray) -> np.ndarray:
+            return values if whole else values[ids]
+
+        mask = np.ones(len(ids), dtype=bool)
+        if min_price is not None:
+            mask &= column(self.price) >= min_price
+        if max_price is not None:
+            mask &= column(self.price) <= max_price
+        if min_rating is not None:
+            mask &= column(self.rating) >= min_rating
+        if category:
+            code = self.category_code(category)
+            if code is None:
+                return np.zeros(len(ids), dtype=bool)
+            mask &= column(self.category) == code
+        if in_stock_only:
+            mask &= column(self.in_stock)
+        return mask
+
+    def query(
+        self,
+        ids: np.ndarray,
+        relevance: np.ndarray,
+        sort: str = "relevance",
+        limit: int = 10,
+        offset: int = 0,
+        **filters: Any
+    ) -> Tuple[List[int], int]:
+        """
+        Filter candidate rows and return one sorted page of row ids plus the match count
+
+        `relevance` holds a score per candidate and orders "relevance" sorts;
+        the other orders break ties by relevance.
+        """
+        mask = self.filter_mask(ids, **filters)
+        ids, relevance = ids[mask], relevance[mask]
+        if sort == "price_asc":
+            scores = -self.price[ids] + relevance * 1e-6
+        elif sort == "price_desc":
+            scores = self.price[ids] + relevance * 1e-6
+        elif sort == "rating":
+            scores = self.rating[ids].astype(np.float64) + relevance * 1e-6
+        else:
+            scores = relevance
+        return rank_page(ids, scores, limit, offset), len(ids)
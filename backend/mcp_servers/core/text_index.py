@@ -0,0 +1,144 @@
+"""
+Text Index
+Tokenized inverted index with field-weighted BM25 relevance blended with a numeric rank signal
+"""
+
+import bisect
+import re
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Prefix completion of the last query word ("chick" -> "chicken") is capped at this many terms
+MAX_PREFIX_TERMS = 64
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with simple plural folding ("pizzas" -> "pizza")"""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class TextIndex:
+    """
+    Inverted index over the text fields of catalog rows
+
+    Each term maps to NumPy arrays of (row, weight), where the weight is the
+    BM25 term-frequency part summed over fields with per-field boosts. A query
+    only touches the posting lists of its own terms, so its cost depends on how
+    many rows match rather than on the catalog size. The final score is the
+    relevance normalised to the best match plus `rank_weight` times the rank
+    signal (e.g. rating) normalised to its maximum.
+    """
+
+    def __init__(
+        self,
+        rows: Iterable[Mapping[str, Any]],
+        fields: Mapping[str, float],
+        rank_field: Optional[str] = None,
+        rank_weight: float = 0.25,
+        k1: float = 1.2,
+        b: float = 0.75
+    ):
+        self.fields = dict(fields)
+        self.rank_weight = rank_weight
+        postings: Dict[str, Dict[int, float]] = {}
+        lengths: List[int] = []
+        ranks: List[float] = []
+
+        # First pass: raw field-weighted term frequencies per row
+        for row_id, row in enumerate(rows):
+            length = 0
+            for field, boost in self.fields.items():
+                tokens = tokenize(str(row.get(field) or ""))
+                length += len(tokens)
+                for token in tokens:
+                    row_weights = postings.setdefault(token, {})
+                    row_weights[row_id] = row_weights.get(row_id, 0.0) + boost
+            lengths.append(length)
+            ranks.append(float(row.get(rank_field) or 0.0) if rank_field else 0.0)
+
+        self.size = len(lengths)
+        length_array = np.asarray(lengths, dtype=np.float32)
+        average_length = float(length_array.mean()) if self.size else 0.0
+        norm = k1 * (1 - b + b * length_array / average_length) if average_length else np.full(self.size, k1)
+
+        # Second pass: saturate term frequencies and fold in the term's IDF
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for term, row_weights in postings.items():
+            ids = np.fromiter(row_weights.keys(), dtype=np.int32, count=len(row_weights))
+            tf = np.fromiter(row_weights.values(), dtype=np.float32, count=len(row_weights))
+            idf = np.log(1 + (self.size - len(ids) + 0.5) / (len(ids) + 0.5))
+            self._postings[term] = (ids, (idf * tf * (k1 + 1) / (tf + norm[ids])).astype(np.float32))
+        self._terms = sorted(self._postings)
+
+        rank_array = np.asarray(ranks, dtype=np.float32)
+        top_rank = float(rank_array.max()) if self.size else 0.0
+        self._ranks = rank_array / top_rank if top_rank > 0 else np.zeros(self.size, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _expand(self, tokens: Sequence[str]) -> List[str]:
+        """Query terms present in the index; the last word also matches as a prefix"""
+        terms = [token for token in tokens if token in self._postings]
+        if tokens:
+            last = tokens[-1]
+            start = bisect.bisect_left(self._terms, last)
+            for term in self._terms[start:start + MAX_PREFIX_TERMS]:
+                if not term.startswith(last):
+                    break
+                if term != last:
+                    terms.append(term)
+        return terms
+
+    def match(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Row ids of every match and their final scores, in row order"""
+        tokens = tokenize(query)
+        terms = self._expand(tokens)
+        if not tokens:
+            # An empty query matches every row, ranked by the rank signal alone
+            ids, scores = np.arange(self.size, dtype=np.int32), np.ones(self.size, dtype=np.float32)
+        elif not terms:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        elif len(terms) == 1:
+            ids, scores = self._postings[terms[0]]
+        else:
+            ids = np.concatenate([self._postings[term][0] for term in terms])
+            weights = np.concatenate([self._postings[term][1] for term in terms])
+            ids, inverse = np.unique(ids, return_inverse=True)
+            scores = np.bincount(inverse, weights=weights).astype(np.float32)
+
+        if len(ids):
+            scores = scores / scores.max() + self.rank_weight * self._ranks[ids]
+        return ids, scores
+
+    def search(self, query: str, limit: int = 10, offset: int = 0) -> Tuple[List[int], int]:
+        """Row ids of one page of ranked matches, and the total number of matches"""
+        ids, scores = self.match(query)
+        return rank_page(ids, scores, limit, offset), len(ids)
+
+
+def rank_page(ids: np.ndarray, scores: np.ndarray, limit: int, offset: int = 0) -> List[int]:
+    """
+    Ids of one page of rows ordered by descending score (ties by id)
+
+    Only the rows scoring at least the last score on the page are sorted; rows
+    tied with it all compete for the page so the id tie-break holds there too.
+    """
+    end = min(offset + limit, len(ids))
+    if offset >= end:
+        return []
+    if end < len(ids):
+        cutoff = -np.partition(-scores, end - 1)[end - 1]
+        top = np.flatnonzero(scores >= cutoff)
+    else:
+        top = np.arange(len(ids))
+    top = top[np.lexsort((ids[top], -scores[top]))]
+    page: List[int] = ids[top[offset:end]].tolist()
+    return page
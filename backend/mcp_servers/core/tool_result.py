@@ -0,0 +1,32 @@
+"""
+Structured Tool Results
+Tool handlers return plain dicts; JSON text is produced only for the MCP transport
+"""
+
+import functools
+import json
+from typing import Any, Awaitable, Callable, Dict
+from mcp.types import TextContent
+
+StructuredHandler = Callable[..., Awaitable[Dict[str, Any]]]
+
+
+def text_content(response: Dict[str, Any]) -> list[TextContent]:
+    """Encode a structured result as the MCP TextContent payload"""
+    return [TextContent(type="text", text=json.dumps(response, indent=2))]
+
+
+def structured_tool(func: StructuredHandler) -> Callable[..., Awaitable[list[TextContent]]]:
+    """
+    Wrap a handler returning a dict so MCP callers still receive TextContent
+
+    The undecorated handler stays available as `.structured` for in-process
+    callers, which skip the encode/decode round trip entirely. Results may
+    share objects with server state and must be treated as read-only.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> list[TextContent]:
+        return text_content(await func(*args, **kwargs))
+
+    wrapper.structured = func  # type: ignore[attr-defined]
+    return wrapper
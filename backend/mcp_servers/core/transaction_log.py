@@ -0,0 +1,195 @@
+"""
+Transaction Log
+Append-only SQLite log of ledger postings with cursor-paginated account history
+"""
+
+import asyncio
+import base64
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, TypeVar
+from backend.mcp_servers.core.ledger import TIMESTAMP_FORMAT, Posting, from_cents
+
+T = TypeVar("T")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    account_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    description TEXT NOT NULL,
+    amount_cents INTEGER NOT NULL,
+    balance_cents INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transactions_by_account_time ON transactions (account_id, timestamp);
+CREATE TRIGGER IF NOT EXISTS transactions_no_update BEFORE UPDATE ON transactions
+BEGIN SELECT RAISE(ABORT, 'transaction log is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS transactions_no_delete BEFORE DELETE ON transactions
+BEGIN SELECT RAISE(ABORT, 'transaction log is append-only'); END;
+"""
+
+
+def encode_cursor(timestamp: str, seq: int) -> str:
+    return base64.urlsafe_b64encode(f"{timestamp}|{seq}".encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        timestamp, seq = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+        return timestamp, int(seq)
+    except (ValueError, UnicodeError):
+        raise ValueError(f"Invalid cursor: {cursor!r}") from None
+
+
+def parse_time_bound(value: str, end: bool = False) -> str:
+    """
+    Log timestamp for a date ("2025-12-06") or ISO-8601 datetime filter bound
+
+    Bounds are half-open: an end date includes that whole day, and an end
+    datetime includes that instant.
+    """
+    text = value.strip()
+    try:
+        moment = datetime.fromisoformat(text[:-1] + "+00:00" if text.endswith("Z") else text)
+    except ValueError:
+        raise ValueError(f"Invalid date: {value!r}") from None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    if end:
+        moment += timedelta(days=1) if len(text) == 10 else timedelta(microseconds=1)
+    return moment.astimezone(timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+
+class TransactionLog:
+    """
+    Append-only per-account transaction log in SQLite
+
+    Rows are only ever inserted (triggers reject updates and deletes) and are
+    indexed by (account_id, timestamp), with the rowid as tie-breaker.
+    History pages walk that index backwards from a keyset cursor, so a page
+    costs O(page size) however many rows the account has. Timestamps never
+    go backwards across appends, which keeps the latest row of an account
+    its current balance.
+
+    The connection lives on one dedicated thread; coroutines hand it work
+    through run_in_executor so the event loop never blocks on disk I/O.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="transaction-log")
+        self._db: Optional[sqlite3.Connection] = None
+        self._last_timestamp = ""
+
+    def _connection(self) -> sqlite3.Connection:
+        # Opened on the log thread on first use
+        if self._db is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(_SCHEMA)
+            last = db.execute("SELECT timestamp FROM transactions ORDER BY seq DESC LIMIT 1").fetchone()
+            self._last_timestamp = last[0] if last else ""
+            self._db = db
+        return self._db
+
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def append(self, posting: Posting) -> None:
+        """Record a posting (usable as the ledger's post hook)"""
+        await self._run(self._append, posting)
+
+    def _append(self, posting: Posting) -> None:
+        db = self._connection()
+        posting.timestamp = max(posting.timestamp, self._last_timestamp)
+        db.execute(
+            "INSERT INTO transactions (id, account_id, timestamp, description, amount_cents, balance_cents)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (posting.transaction_id, posting.account_id, posting.timestamp, posting.description,
+             posting.delta, posting.balance)
+        )
+        self._last_timestamp = posting.timestamp
+
+    async def history(
+        self,
+        account_id: str,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        One page of an account's transactions, newest first, and the cursor of the next page
+
+        Raises ValueError for a malformed cursor or date.
+        """
+        conditions = ["account_id = ?"]
+        params: List[Any] = [account_id]
+        if start_date:
+            conditions.append("timestamp >= ?")
+            params.append(parse_time_bound(start_date))
+        if end_date:
+            conditions.append("timestamp < ?")
+            params.append(parse_time_bound(end_date, end=True))
+        if cursor:
+            conditions.append("(timestamp, seq) < (?, ?)")
+            params.extend(decode_cursor(cursor))
+        query = (
+            "SELECT seq, id, timestamp, description, amount_cents, balance_cents FROM transactions"
+            f" WHERE {' AND '.join(conditions)} ORDER BY timestamp DESC, seq DESC LIMIT ?"
+        )
+        # One extra row tells whether another page follows
+        rows = await self._run(self._fetch, query, params + [limit + 1])
+
+        next_cursor = encode_cursor(rows[limit - 1][2], rows[limit - 1][0]) if len(rows) > limit else None
+        transactions = [
+            {
+                "id": transaction_id,
+                "timestamp": timestamp,
+                "description": description,
+                "amount": from_cents(amount),
+                "balance": from_cents(balance),
+            }
+            for _, transaction_id, timestamp, description, amount, balance in rows[:limit]
+        ]
+        return transactions, next_cursor
+
+    def _fetch(self, query: str, params: List[Any]) -> List[Tuple[Any, ...]]:
+        return self._connection().execute(query, params).fetchall()
+
+    def restore_balances(self, accounts: Mapping[str, Mapping[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Copy of `accounts` with each balance replaced by its last logged balance
+
+        Blocking; meant for startup, before the event loop serves payments.
+        """
+        return self._executor.submit(self._restore_balances, accounts).result()
+
+    def _restore_balances(self, accounts: Mapping[str, Mapping[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        db = self._connection()
+        restored = {}
+        for account_id, account in accounts.items():
+            restored[account_id] = dict(account)
+            last = db.execute(
+                "SELECT balance_cents FROM transactions WHERE account_id = ?"
+                " ORDER BY timestamp DESC, seq DESC LIMIT 1",
+                (account_id,)
+            ).fetchone()
+            if last:
+                restored[account_id]["balance"] = from_cents(last[0])
+        return restored
+
+    def close(self) -> None:
+        def close_connection() -> None:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+        self._executor.submit(close_connection).result()
+        self._executor.shutdown()
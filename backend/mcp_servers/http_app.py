@@ -0,0 +1,57 @@
+"""
+MCP HTTP Server
+Serves every MCP server over streamable HTTP at {API_V1_STR}/{name}/mcp
+"""
+
+import contextlib
+from starlette.applications import Starlette
+from starlette.routing import Route
+from starlette.types import Receive, Scope, Send
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from backend.mcp_servers.core.config import settings
+from backend.mcp_servers.servers import amazon_server, banking_server, zomato_server
+
+SERVERS = {
+    "zomato": zomato_server.server,
+    "amazon": amazon_server.server,
+    "banking": banking_server.server,
+}
+
+# Stateless with plain JSON replies: a tool call is a single POST, with no
+# session handshake and no SSE stream to hold open
+session_managers = {
+    name: StreamableHTTPSessionManager(app=server, json_response=True, stateless=True)
+    for name, server in SERVERS.items()
+}
+
+
+class _SessionManagerApp:
+    """ASGI endpoint forwarding requests to a session manager"""
+
+    def __init__(self, manager: StreamableHTTPSessionManager):
+        self.manager = manager
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.manager.handle_request(scope, receive, send)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: Starlette):
+    async with contextlib.AsyncExitStack() as stack:
+        for manager in session_managers.values():
+            await stack.enter_async_context(manager.run())
+        yield
+
+
+app = Starlette(
+    routes=[
+        Route(f"{settings.API_V1_STR}/{name}/mcp", endpoint=_SessionManagerApp(manager), methods=["GET", "POST", "DELETE"])
+        for name, manager in session_managers.items()
+    ],
+    lifespan=lifespan
+)
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=settings.PORT)
@@ -4,8 +4,8 @@ Official Model Context Protocol implementation for Amazon e-commerce service
 """
 
 import asyncio
-import json
-from typing import Any
+from functools import lru_cache
+from typing import Any, Dict, Optional
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
@@ -14,16 +14,37 @@ import sys
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from backend.mcp_servers.core.config import settings
+from backend.mcp_servers.core.tool_result import structured_tool
+from backend.mcp_servers.core.catalog import catalog_path, open_catalog
+from backend.mcp_servers.core.fuzzy_index import FuzzyIndex
+from backend.mcp_servers.core.product_store import SORT_ORDERS, ProductStore
+from backend.mcp_servers.core.text_index import TextIndex
+import numpy as np
 
 server = Server("amazon-server")
 
-# Mock product data
-MOCK_PRODUCTS = [
-    {"id": "B001", "name": "Kindle Paperwhite", "category": "Electronics", "price": 129.99, "rating": 4.6, "in_stock": True},
-    {"id": "B002", "name": "Echo Dot", "category": "Smart Home", "price": 49.99, "rating": 4.7, "in_stock": True},
-    {"id": "B003", "name": "Fire TV Stick", "category": "Electronics", "price": 39.99, "rating": 4.5, "in_stock": True},
-    {"id": "B004", "name": "AmazonBasics USB Cable", "category": "Accessories", "price": 7.99, "rating": 4.4, "in_stock": True},
-]
+# Mock product data, memory-mapped from the product catalog file
+MOCK_PRODUCTS = open_catalog(catalog_path(settings.AMAZON_CATALOG_PATH, "product_catalog.mcat"))
+
+# Filters and sort orders run on the catalog's columns
+PRODUCT_STORE = ProductStore(MOCK_PRODUCTS)
+MAX_SEARCH_LIMIT = 50
+
+
+@lru_cache(maxsize=None)
+def product_search_index() -> TextIndex:
+    """Ranked search over product name and category, boosted by rating (built on first search)"""
+    return TextIndex(
+        MOCK_PRODUCTS.iter_rows(("name", "category", "rating")),
+        fields={"name": 3.0, "category": 1.5},
+        rank_field="rating"
+    )
+
+
+@lru_cache(maxsize=None)
+def product_name_index() -> FuzzyIndex:
+    """Typo-tolerant lookup over product names ("kindel" -> Kindle Paperwhite)"""
+    return FuzzyIndex((product["name"], i) for i, product in enumerate(MOCK_PRODUCTS.iter_rows(("name",))))
 
 
 @server.list_tools()
@@ -39,6 +60,48 @@ async def list_tools() -> list[Tool]:
                     "query": {
                         "type": "string",
                         "description": "Product name or category to search for"
+                    },
+                    "min_price": {
+                        "type": "number",
+                        "description": "Lowest price to include"
+                    },
+                    "max_price": {
+                        "type": "number",
+                        "description": "Highest price to include"
+                    },
+                    "min_rating": {
+                        "type": "number",
+                        "description": "Lowest rating to include",
+                        "minimum": 0,
+                        "maximum": 5
+                    },
+                    "category": {
+                        "type": "string",
+                        "description": "Only products in this category (e.g. 'Electronics')"
+                    },
+                    "in_stock_only": {
+                        "type": "boolean",
+                        "description": "Skip products that are out of stock",
+                        "default": False
+                    },
+                    "sort": {
+                        "type": "string",
+                        "enum": list(SORT_ORDERS),
+                        "description": "Result order",
+                        "default": "relevance"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of results",
+                        "minimum": 1,
+                        "maximum": MAX_SEARCH_LIMIT,
+                        "default": 10
+                    },
+                    "offset": {
+                        "type": "integer",
+                        "description": "Number of sorted results to skip (pagination)",
+                        "minimum": 0,
+                        "default": 0
                     }
                 },
                 "required": ["query"]
@@ -86,7 +149,17 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """Handle tool calls"""
     
     if name == "search_product":
-        return await search_product(arguments.get("query", ""))
+        return await search_product(
+            arguments.get("query", ""),
+            min_price=arguments.get("min_price"),
+            max_price=arguments.get("max_price"),
+            min_rating=arguments.get("min_rating"),
+            category=arguments.get("category"),
+            in_stock_only=arguments.get("in_stock_only", False),
+            sort=arguments.get("sort", "relevance"),
+            limit=arguments.get("limit", 10),
+            offset=arguments.get("offset", 0)
+        )
     elif name == "place_order":
         return await place_order(
             arguments.get("item_id", ""),
@@ -98,23 +171,48 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         return [TextContent(type="text", text=f"Unknown tool: {name}")]
 
 
-async def search_product(query: str) -> list[TextContent]:
-    """Search for products"""
-    query_lower = query.lower()
+@structured_tool
+async def search_product(
+    query: str,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    min_rating: Optional[float] = None,
+    category: Optional[str] = None,
+    in_stock_only: bool = False,
+    sort: str = "relevance",
+    limit: int = 10,
+    offset: int = 0
+) -> Dict[str, Any]:
+    """Search for products, with optional filters, sort order and pagination"""
+    if sort not in SORT_ORDERS:
+        return {"success": False, "error": f"Unknown sort order: {sort}"}
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+    offset = max(0, offset)
     
     if settings.AMAZON_MOCK_MODE:
-        results = [
-            product for product in MOCK_PRODUCTS
-            if query_lower in product["name"].lower() or query_lower in product["category"].lower()
-        ]
+        ids, relevance = product_search_index().match(query)
+        # Index matches come back in row order, so a full-length match is every row in order
+        whole = len(ids) == len(PRODUCT_STORE)
+        if not len(ids):
+            # Misspelt queries - closest names, scored by similarity
+            matches = product_name_index().search(query, limit=MAX_SEARCH_LIMIT)
+            ids = np.array([i for _, _, i in matches], dtype=np.int32)
+            relevance = np.array([score for score, _, _ in matches], dtype=np.float32)
         
-        if not results:
-            results = MOCK_PRODUCTS
+        row_ids, total = PRODUCT_STORE.query(
+            ids, relevance, sort=sort, limit=limit, offset=offset,
+            min_price=min_price, max_price=max_price, min_rating=min_rating,
+            category=category, in_stock_only=in_stock_only, whole=whole
+        )
+        results = [MOCK_PRODUCTS[i] for i in row_ids]
         
         response = {
             "success": True,
             "results": results,
             "count": len(results),
+            "total": total,
+            "offset": offset,
+            "limit": limit,
             "mode": "mock"
         }
     else:
@@ -124,14 +222,15 @@ async def search_product(query: str) -> list[TextContent]:
             "mode": "real"
         }
     
-    return [TextContent(type="text", text=json.dumps(response, indent=2))]
+    return response
 
 
-async def place_order(item_id: str, quantity: int = 1) -> list[TextContent]:
+@structured_tool
+async def place_order(item_id: str, quantity: int = 1) -> Dict[str, Any]:
     """Place an order"""
     
     if settings.AMAZON_MOCK_MODE:
-        product = next((p for p in MOCK_PRODUCTS if p["id"] == item_id), None)
+        product = PRODUCT_STORE.get(item_id)
         
         if not product:
             response = {"success": False, "error": f"Product {item_id} not found"}
@@ -155,14 +254,15 @@ async def place_order(item_id: str, quantity: int = 1) -> list[TextContent]:
     else:
         response = {"success": False, "error": "Real Amazon API not yet implemented", "mode": "real"}
     
-    return [TextContent(type="text", text=json.dumps(response, indent=2))]
+    return response
 
 
-async def get_product_details(product_id: str) -> list[TextContent]:
+@structured_tool
+async def get_product_details(product_id: str) -> Dict[str, Any]:
     """Get product details"""
     
     if settings.AMAZON_MOCK_MODE:
-        product = next((p for p in MOCK_PRODUCTS if p["id"] == product_id), None)
+        product = PRODUCT_STORE.get(product_id)
         
         if product:
             response = {
@@ -175,7 +275,7 @@ async def get_product_details(product_id: str) -> list[TextContent]:
     else:
         response = {"success": False, "error": "Real Amazon API not yet implemented", "mode": "real"}
     
-    return [TextContent(type="text", text=json.dumps(response, indent=2))]
+    return response
 
 
 async def main():
@@ -4,8 +4,7 @@ Official Model Context Protocol implementation for Banking services
 """
 
 import asyncio
-import json
-from typing import Any
+from typing import Any, Dict, Optional
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
@@ -14,6 +13,9 @@ import sys
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from backend.mcp_servers.core.config import settings
+from backend.mcp_servers.core.tool_result import structured_tool
+from backend.mcp_servers.core.ledger import Ledger, LedgerError
+from backend.mcp_servers.core.transaction_log import TransactionLog
 
 server = Server("banking-server")
 
@@ -35,6 +37,14 @@ MOCK_ACCOUNTS = {
     }
 }
 
+# Every payment is appended to the transaction log while its account is locked
+TRANSACTION_LOG = TransactionLog(settings.BANK_TRANSACTION_LOG_PATH)
+
+# Balances live in the ledger; MOCK_ACCOUNTS is only its opening state (unless a
+# persisted transaction log has a later balance)
+LEDGER = Ledger(TRANSACTION_LOG.restore_balances(MOCK_ACCOUNTS), on_post=TRANSACTION_LOG.append)
+MAX_HISTORY_LIMIT = 50
+
 
 @server.list_tools()
 async def list_tools() -> list[Tool]:
@@ -79,7 +89,7 @@ async def list_tools() -> list[Tool]:
         ),
         Tool(
             name="get_transaction_history",
-            description="Get recent transaction history for an account",
+            description="Get recent transaction history for an account, newest first",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -91,8 +101,20 @@ async def list_tools() -> list[Tool]:
                         "type": "integer",
                         "description": "Number of transactions to retrieve",
                         "minimum": 1,
-                        "maximum": 50,
+                        "maximum": MAX_HISTORY_LIMIT,
                         "default": 10
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "next_cursor of the previous page, to continue from it"
+                    },
+                    "start_date": {
+                        "type": "string",
+                        "description": "Earliest date or ISO-8601 time to include (e.g. '2025-12-01')"
+                    },
+                    "end_date": {
+                        "type": "string",
+                        "description": "Latest date or ISO-8601 time to include (a date includes the whole day)"
                     }
                 },
                 "required": ["account_id"]
@@ -116,17 +138,21 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     elif name == "get_transaction_history":
         return await get_transaction_history(
             arguments.get("account_id", ""),
-            arguments.get("limit", 10)
+            arguments.get("limit", 10),
+            cursor=arguments.get("cursor"),
+            start_date=arguments.get("start_date"),
+            end_date=arguments.get("end_date")
         )
     else:
         return [TextContent(type="text", text=f"Unknown tool: {name}")]
 
 
-async def get_balance(account_id: str) -> list[TextContent]:
+@structured_tool
+async def get_balance(account_id: str) -> Dict[str, Any]:
     """Get account balance"""
     
     if settings.BANK_MOCK_MODE:
-        account = MOCK_ACCOUNTS.get(account_id)
+        account = LEDGER.snapshot(account_id)
         
         if account:
             response = {
@@ -147,71 +173,69 @@ async def get_balance(account_id: str) -> list[TextContent]:
             "mode": "real"
         }
     
-    return [TextContent(type="text", text=json.dumps(response, indent=2))]
+    return response
 
 
-async def process_payment(account_id: str, amount: float, merchant: str) -> list[TextContent]:
+@structured_tool
+async def process_payment(account_id: str, amount: float, merchant: str) -> Dict[str, Any]:
     """Process a payment"""
     
     if settings.BANK_MOCK_MODE:
-        account = MOCK_ACCOUNTS.get(account_id)
-        
-        if not account:
-            response = {"success": False, "error": f"Account {account_id} not found"}
-        elif account["balance"] < amount:
-            response = {"success": False, "error": "Insufficient funds"}
+        try:
+            posting = await LEDGER.debit(account_id, amount, description=merchant)
+        except LedgerError as e:
+            response = {"success": False, "error": str(e)}
         else:
-            import random
-            transaction_id = f"TXN-{random.randint(100000, 999999)}"
-            new_balance = account["balance"] - amount
-            
-            # Update mock balance (in real implementation, this would be in database)
-            MOCK_ACCOUNTS[account_id]["balance"] = new_balance
-            
             response = {
                 "success": True,
-                "transaction_id": transaction_id,
+                "transaction_id": posting.transaction_id,
                 "status": "completed",
                 "amount": amount,
                 "merchant": merchant,
-                "new_balance": new_balance,
-                "timestamp": "2025-12-07T17:10:00Z",
+                "new_balance": posting.new_balance,
+                "timestamp": posting.timestamp,
                 "mode": "mock"
             }
     else:
         response = {"success": False, "error": "Real Banking API not yet implemented", "mode": "real"}
     
-    return [TextContent(type="text", text=json.dumps(response, indent=2))]
-
-
-async def get_transaction_history(account_id: str, limit: int = 10) -> list[TextContent]:
-    """Get transaction history"""
+    return response
+
+
+@structured_tool
+async def get_transaction_history(
+    account_id: str,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> Dict[str, Any]:
+    """Get one page of transaction history, newest first"""
+    limit = max(1, min(limit, MAX_HISTORY_LIMIT))
     
     if settings.BANK_MOCK_MODE:
-        account = MOCK_ACCOUNTS.get(account_id)
-        
-        if not account:
+        if account_id not in LEDGER:
             response = {"success": False, "error": f"Account {account_id} not found"}
         else:
-            # Mock transaction history
-            transactions = [
-                {"id": "TXN-001", "date": "2025-12-06", "description": "Grocery Store", "amount": -85.50, "balance": 5085.50},
-                {"id": "TXN-002", "date": "2025-12-05", "description": "Salary Deposit", "amount": 3000.00, "balance": 5171.00},
-                {"id": "TXN-003", "date": "2025-12-04", "description": "Electric Bill", "amount": -120.00, "balance": 2171.00},
-                {"id": "TXN-004", "date": "2025-12-03", "description": "Restaurant", "amount": -45.00, "balance": 2291.00},
-            ]
-            
-            response = {
-                "success": True,
-                "account_id": account_id,
-                "transactions": transactions[:limit],
-                "count": len(transactions[:limit]),
-                "mode": "mock"
-            }
+            try:
+                transactions, next_cursor = await TRANSACTION_LOG.history(
+                    account_id, limit=limit, cursor=cursor, start_date=start_date, end_date=end_date
+                )
+            except ValueError as e:
+                response = {"success": False, "error": str(e)}
+            else:
+                response = {
+                    "success": True,
+                    "account_id": account_id,
+                    "transactions": transactions,
+                    "count": len(transactions),
+                    "next_cursor": next_cursor,
+                    "mode": "mock"
+                }
     else:
         response = {"success": False, "error": "Real Banking API not yet implemented", "mode": "real"}
     
-    return [TextContent(type="text", text=json.dumps(response, indent=2))]
+    return response
 
 
 async def main():
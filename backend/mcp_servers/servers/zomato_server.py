@@ -4,8 +4,8 @@ Official Model Context Protocol implementation for Zomato food ordering service
 """
 
 import asyncio
-import json
-from typing import Any
+from functools import lru_cache
+from typing import Any, Dict
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
@@ -15,17 +15,37 @@ import sys
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from backend.mcp_servers.core.config import settings
+from backend.mcp_servers.core.tool_result import structured_tool
+from backend.mcp_servers.core.catalog import catalog_path, open_catalog
+from backend.mcp_servers.core.fuzzy_index import FuzzyIndex
+from backend.mcp_servers.core.text_index import TextIndex
 
 # Create MCP server instance
 server = Server("zomato-server")
 
-# Mock data for testing
-MOCK_FOOD_ITEMS = [
-    {"id": "1", "name": "Cheese Pizza", "restaurant": "Pizza Hut", "price": 15.0, "rating": 4.5},
-    {"id": "2", "name": "Chicken Biryani", "restaurant": "Paradise", "price": 12.0, "rating": 4.7},
-    {"id": "3", "name": "Veg Burger", "restaurant": "McDonald's", "price": 8.0, "rating": 4.2},
-    {"id": "4", "name": "Pasta Alfredo", "restaurant": "Olive Garden", "price": 14.0, "rating": 4.6},
-]
+# Mock data for testing, memory-mapped from the food catalog file
+MOCK_FOOD_ITEMS = open_catalog(catalog_path(settings.ZOMATO_CATALOG_PATH, "food_catalog.mcat"))
+MAX_SEARCH_LIMIT = 50
+
+
+@lru_cache(maxsize=None)
+def food_search_index() -> TextIndex:
+    """Ranked search over item name, cuisine and restaurant, boosted by rating (built on first search)"""
+    return TextIndex(
+        MOCK_FOOD_ITEMS.iter_rows(("name", "cuisine", "restaurant", "rating")),
+        fields={"name": 3.0, "cuisine": 2.0, "restaurant": 1.5},
+        rank_field="rating"
+    )
+
+
+@lru_cache(maxsize=None)
+def food_name_index() -> FuzzyIndex:
+    """Typo-tolerant lookup over item and restaurant names ("biriyani" -> Chicken Biryani)"""
+    items = list(MOCK_FOOD_ITEMS.iter_rows(("name", "restaurant")))
+    return FuzzyIndex(
+        [(item["name"], i) for i, item in enumerate(items)] +
+        [(item["restaurant"], i) for i, item in enumerate(items)]
+    )
 
 
 @server.list_tools()
@@ -41,6 +61,19 @@ async def list_tools() -> list[Tool]:
                     "query": {
                         "type": "string",
                         "description": "Food item or cuisine to search for (e.g., 'pizza', 'biryani', 'burger')"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of results",
+                        "minimum": 1,
+                        "maximum": MAX_SEARCH_LIMIT,
+                        "default": 10
+                    },
+                    "offset": {
+                        "type": "integer",
+                        "description": "Number of ranked results to skip (pagination)",
+                        "minimum": 0,
+                        "default": 0
                     }
                 },
                 "required": ["query"]
@@ -88,7 +121,11 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """Handle tool calls from MCP client"""
     
     if name == "search_food":
-        return await search_food(arguments.get("query", ""))
+        return await search_food(
+            arguments.get("query", ""),
+            arguments.get("limit", 10),
+            arguments.get("offset", 0)
+        )
     
     elif name == "place_order":
         return await place_order(
@@ -106,24 +143,30 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         )]
 
 
-async def search_food(query: str) -> list[TextContent]:
-    """Search for food items"""
-    query_lower = query.lower()
+@structured_tool
+async def search_food(query: str, limit: int = 10, offset: int = 0) -> Dict[str, Any]:
+    """Search for food items, best matches first"""
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+    offset = max(0, offset)
     
     if settings.ZOMATO_MOCK_MODE:
-        # Mock mode - filter from mock data
-        results = [
-            item for item in MOCK_FOOD_ITEMS
-            if query_lower in item["name"].lower() or query_lower in item["restaurant"].lower()
-        ]
+        # Mock mode - ranked lookup in the inverted index
+        row_ids, total = food_search_index().search(query, limit=limit, offset=offset)
         
-        if not results:
-            results = MOCK_FOOD_ITEMS  # Return all if no match
+        if not total:
+            # Misspelt queries - closest names first
+            matches = food_name_index().search(query, limit=offset + limit)
+            fuzzy_ids = list(dict.fromkeys(i for _, _, i in matches))
+            row_ids, total = fuzzy_ids[offset:offset + limit], len(fuzzy_ids)
         
+        results = [MOCK_FOOD_ITEMS[i] for i in row_ids]
         response = {
             "success": True,
             "results": results,
             "count": len(results),
+            "total": total,
+            "offset": offset,
+            "limit": limit,
             "mode": "mock"
         }
     else:
@@ -135,18 +178,16 @@ async def search_food(query: str) -> list[TextContent]:
             "mode": "real"
         }
     
-    return [TextContent(
-        type="text",
-        text=json.dumps(response, indent=2)
-    )]
+    return response
 
 
-async def place_order(item_id: str, quantity: int) -> list[TextContent]:
+@structured_tool
+async def place_order(item_id: str, quantity: int = 1) -> Dict[str, Any]:
     """Place a food order"""
     
     if settings.ZOMATO_MOCK_MODE:
         # Mock mode - simulate order placement
-        item = next((item for item in MOCK_FOOD_ITEMS if item["id"] == item_id), None)
+        item = MOCK_FOOD_ITEMS.find(item_id)
         
         if not item:
             response = {
@@ -177,13 +218,11 @@ async def place_order(item_id: str, quantity: int) -> list[TextContent]:
             "mode": "real"
         }
     
-    return [TextContent(
-        type="text",
-        text=json.dumps(response, indent=2)
-    )]
+    return response
 
 
-async def get_restaurant_info(restaurant_name: str) -> list[TextContent]:
+@structured_tool
+async def get_restaurant_info(restaurant_name: str) -> Dict[str, Any]:
     """Get restaurant information"""
     
     if settings.ZOMATO_MOCK_MODE:
@@ -232,10 +271,7 @@ async def get_restaurant_info(restaurant_name: str) -> list[TextContent]:
             "mode": "real"
         }
     
-    return [TextContent(
-        type="text",
-        text=json.dumps(response, indent=2)
-    )]
+    return response
 
 
 async def main():
@@ -12,6 +12,7 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/yourusername/ai-personal-assistant",
     packages=find_packages(),
+    package_data={"backend.mcp_servers": ["data/*.json", "data/*.mcat"]},
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",
@@ -29,7 +30,8 @@ setup(
         "pydantic>=2.0.0",
         "pydantic-settings>=2.0.0",
         "httpx>=0.25.0",
-        "mcp>=1.0.0",
+        "mcp>=1.8.0",
+        "numpy>=1.24.0",
     ],
     extras_require={
         "dev": [
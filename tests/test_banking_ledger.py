@@ -0,0 +1,173 @@
+"""
+Banking Ledger Tests
+Concurrent payments must neither double-spend nor serialise across accounts
+"""
+
+import asyncio
+import random
+import time
+
+import pytest
+
+from backend.mcp_servers.core.ledger import InsufficientFunds, Ledger, LedgerError, Posting
+from backend.mcp_servers.servers import banking_server
+
+
+async def yield_to_loop(posting: Posting) -> None:
+    """Post hook standing in for I/O between the balance check and the write"""
+    await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_debits_never_overdraw():
+    ledger = Ledger({"A": {"balance": 100.00}}, on_post=yield_to_loop)
+
+    results = await asyncio.gather(
+        *(ledger.debit("A", 0.07) for _ in range(5000)),
+        return_exceptions=True
+    )
+
+    succeeded = [r.new_balance for r in results if not isinstance(r, Exception)]
+    rejected = [r for r in results if isinstance(r, Exception)]
+    assert all(isinstance(r, InsufficientFunds) for r in rejected)
+    assert len(succeeded) == 10000 // 7
+    assert ledger.balance("A") == pytest.approx(100.00 - 0.07 * len(succeeded))
+    assert ledger.balance("A") >= 0
+    # Serialised: each successful debit saw the balance left by the previous one
+    assert sorted(succeeded, reverse=True) == [
+        pytest.approx(100.00 - 0.07 * (i + 1)) for i in range(len(succeeded))
+    ]
+
+
+@pytest.mark.asyncio
+async def test_mixed_postings_balance_exactly():
+    accounts = {f"ACC{i}": {"balance": 500.00} for i in range(20)}
+    ledger = Ledger(accounts, on_post=yield_to_loop)
+    rng = random.Random(7)
+    postings = [
+        (f"ACC{rng.randrange(20)}", rng.choice((-1, 1)), rng.randint(1, 5000) / 100)
+        for _ in range(5000)
+    ]
+
+    async def post(account_id: str, sign: int, amount: float) -> int:
+        try:
+            if sign > 0:
+                await ledger.credit(account_id, amount)
+            else:
+                await ledger.debit(account_id, amount)
+        except InsufficientFunds:
+            return 0
+        return sign * round(amount * 100)
+
+    applied = await asyncio.gather(*(post(*posting) for posting in postings))
+
+    for account_id in accounts:
+        expected = 50000 + sum(
+            cents for (posted_to, _, _), cents in zip(postings, applied) if posted_to == account_id
+        )
+        assert round(ledger.balance(account_id) * 100) == expected
+        assert expected >= 0
+
+
+@pytest.mark.asyncio
+async def test_different_accounts_run_in_parallel():
+    in_flight = 0
+    peak = 0
+
+    async def slow_io(posting: Posting) -> None:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+
+    ledger = Ledger({f"ACC{i}": {"balance": 10.00} for i in range(100)}, on_post=slow_io)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(ledger.debit(f"ACC{i}", 1.00) for i in range(100)))
+    elapsed = time.perf_counter() - started
+
+    assert peak == 100
+    assert elapsed < 1.0  # 100 serialised payments would take 5s
+
+
+@pytest.mark.asyncio
+async def test_same_account_is_serialised():
+    in_flight = 0
+    peak = 0
+
+    async def slow_io(posting: Posting) -> None:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+
+    ledger = Ledger({"A": {"balance": 1000.00}}, on_post=slow_io)
+    await asyncio.gather(*(ledger.debit("A", 1.00) for _ in range(200)))
+
+    assert peak == 1
+    assert ledger.balance("A") == 800.00
+
+
+@pytest.mark.asyncio
+async def test_rejected_postings_leave_balance_untouched():
+    ledger = Ledger({"A": {"balance": 5.00}})
+
+    with pytest.raises(LedgerError):
+        await ledger.debit("A", 0)
+    with pytest.raises(LedgerError):
+        await ledger.debit("A", -3.00)
+    with pytest.raises(LedgerError):
+        await ledger.debit("missing", 1.00)
+    with pytest.raises(InsufficientFunds):
+        await ledger.debit("A", 5.01)
+
+    assert ledger.balance("A") == 5.00
+
+
+@pytest.mark.asyncio
+async def test_process_payment_under_concurrency(monkeypatch):
+    monkeypatch.setattr(banking_server.settings, "BANK_MOCK_MODE", True)
+    monkeypatch.setattr(
+        banking_server, "LEDGER", Ledger(banking_server.MOCK_ACCOUNTS, on_post=yield_to_loop)
+    )
+
+    responses = await asyncio.gather(*(
+        banking_server.process_payment.structured("123456", 2.50, "Coffee Shop")
+        for _ in range(3000)
+    ))
+
+    paid = [r for r in responses if r["success"]]
+    assert len(paid) == 2000  # 5000.00 / 2.50
+    assert all(r["error"] == "Insufficient funds" for r in responses if not r["success"])
+    balance = await banking_server.get_balance.structured("123456")
+    assert balance["account"]["balance"] == 0.0
+    assert min(r["new_balance"] for r in paid) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_debit_still_applies_a_recorded_posting():
+    recorded = []
+
+    def slow_write(posting: Posting) -> None:
+        time.sleep(0.05)
+        recorded.append(posting)
+
+    async def write_in_thread(posting: Posting) -> None:
+        # Once submitted, the write completes whatever happens to the caller
+        await asyncio.get_running_loop().run_in_executor(None, slow_write, posting)
+
+    ledger = Ledger({"A": {"balance": 10.00}}, on_post=write_in_thread)
+
+    payment = asyncio.ensure_future(ledger.debit("A", 4.00))
+    await asyncio.sleep(0.01)
+    payment.cancel()
+    # Queued behind the cancelled payment; must see its balance
+    follow_up = await ledger.debit("A", 1.00)
+    with pytest.raises(asyncio.CancelledError):
+        await payment
+
+    assert [posting.balance for posting in recorded] == [600, 500]
+    assert follow_up.new_balance == 5.00
+    assert ledger.balance("A") == 5.00
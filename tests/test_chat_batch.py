@@ -0,0 +1,75 @@
+"""
+Chat Batch Tests
+Input order, the concurrency cap and request limits of /batch
+"""
+
+import asyncio
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.ai_engine.app.core.config import settings
+from backend.ai_engine.app.services.pipeline import TurnResult, chat_pipeline
+from backend.ai_engine.main import app
+
+
+class FakeRun:
+    """A chat turn that takes a random time, tracking how many run at once"""
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+
+    async def __call__(self, message):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(random.uniform(0.001, 0.01))
+        finally:
+            self.running -= 1
+        return TurnResult(intent="echo", response=message)
+
+
+@pytest.fixture
+def fake_run(monkeypatch):
+    run = FakeRun()
+    monkeypatch.setattr(chat_pipeline, "run", run)
+    return run
+
+
+@pytest.mark.asyncio
+async def test_run_batch_keeps_input_order_and_caps_concurrency(fake_run):
+    messages = [f"message {i}" for i in range(40)]
+
+    turns = await chat_pipeline.run_batch(messages, concurrency=4)
+
+    assert [turn.response for turn in turns] == messages
+    assert fake_run.peak == 4
+
+
+@pytest.mark.parametrize("requested, peak", [(3, 3), (50, 5), (None, 5)])
+def test_batch_concurrency_is_capped_by_settings(fake_run, monkeypatch, requested, peak):
+    monkeypatch.setattr(settings, "BATCH_CONCURRENCY", 5)
+    messages = [f"message {i}" for i in range(20)]
+
+    response = TestClient(app).post("/api/v1/chat/batch", json={"messages": messages, "concurrency": requested})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "results": [{"intent": "echo", "response": message} for message in messages],
+        "count": len(messages),
+    }
+    assert fake_run.peak == peak
+
+
+@pytest.mark.parametrize("body", [
+    {"messages": ["hi"] * (settings.BATCH_MAX_MESSAGES + 1)},
+    {"messages": ["hi"], "concurrency": 0},
+    {"messages": ["hi"], "concurrency": -1},
+])
+def test_batch_limits_are_enforced(fake_run, body):
+    response = TestClient(app).post("/api/v1/chat/batch", json=body)
+
+    assert response.status_code == 422
+    assert fake_run.peak == 0
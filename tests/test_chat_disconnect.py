@@ -0,0 +1,94 @@
+"""
+Chat Disconnect Tests
+Cancelling a turn when its client goes away, and writes that outlive their caller
+"""
+
+import asyncio
+
+import pytest
+
+from backend.ai_engine.app.core.config import settings
+from backend.ai_engine.app.routers import chat
+from backend.ai_engine.app.services.mcp_client import MCPClientService
+from backend.ai_engine.app.services.pipeline import NLUResult, TurnResult, chat_pipeline
+from backend.ai_engine.app.services.tool_cache import ToolResultCache
+
+
+class FakeRequest:
+    """Reports a disconnect from the given poll on"""
+
+    def __init__(self, disconnect_after: int):
+        self.polls = 0
+        self.disconnect_after = disconnect_after
+
+    async def is_disconnected(self) -> bool:
+        self.polls += 1
+        return self.polls >= self.disconnect_after
+
+
+@pytest.fixture
+def fast_polls(monkeypatch):
+    monkeypatch.setattr(settings, "STREAM_DISCONNECT_POLL_MS", 1)
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_the_turn(fast_polls, monkeypatch):
+    cancelled = asyncio.Event()
+
+    async def complete(nlus):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    monkeypatch.setattr(chat_pipeline, "complete", complete)
+    request = FakeRequest(disconnect_after=2)
+
+    assert await chat._complete_unless_disconnected(request, [NLUResult("check_balance", {})]) is None
+    await asyncio.wait_for(cancelled.wait(), 1.0)
+    assert request.polls == 2
+
+
+@pytest.mark.asyncio
+async def test_connected_client_gets_the_turn(fast_polls, monkeypatch):
+    async def complete(nlus):
+        await asyncio.sleep(0.01)
+        return TurnResult(intent="check_balance", response="done")
+
+    monkeypatch.setattr(chat_pipeline, "complete", complete)
+
+    turn = await chat._complete_unless_disconnected(FakeRequest(disconnect_after=1000), [])
+    assert turn.response == "done"
+
+
+@pytest.mark.asyncio
+async def test_shielded_write_completes_and_invalidates_reads():
+    client = MCPClientService()
+    client.transport = None
+    client.cache = ToolResultCache(ttls={"zomato.search_food": 60.0})
+    release = asyncio.Event()
+    calls = []
+
+    async def dispatch(server_name, tool_name, arguments):
+        calls.append(tool_name)
+        if tool_name == "place_order":
+            await release.wait()
+        return {"success": True, "call": len(calls)}
+
+    client._dispatch = dispatch
+    await client.call_tool("zomato", "search_food", {"query": "pizza"})
+
+    # The caller goes away while the order is in flight
+    caller = asyncio.create_task(client.call_tool("zomato", "place_order", {"item_id": "1"}))
+    await asyncio.sleep(0.01)
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    assert client.cache.get("zomato", "search_food", {"query": "pizza"}) is not None
+
+    release.set()
+    await client.wait_for_pending_writes()
+
+    assert calls == ["search_food", "place_order"]
+    assert client.cache.get("zomato", "search_food", {"query": "pizza"}) is None
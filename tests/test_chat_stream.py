@@ -0,0 +1,104 @@
+"""
+Chat Stream Tests
+SSE framing of the /stream endpoint in each stream mode
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from backend.ai_engine.app.core.config import Settings, settings
+from backend.ai_engine.app.services.pipeline import TurnResult, chat_pipeline, combined_intent
+from backend.ai_engine.app.services.sse import DONE_FRAME, build_frames, split_text
+from backend.ai_engine.main import app
+
+RESPONSE = "Your Checking account balance is $5000.00 USD, as of this morning."
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def complete(nlus):
+        return TurnResult(intent=combined_intent(nlus), response=RESPONSE)
+
+    monkeypatch.setattr(chat_pipeline, "complete", complete)
+    monkeypatch.setattr(settings, "STREAM_PACE_MS", 1)
+    monkeypatch.setattr(settings, "STREAM_CHUNK_SIZE", 16)
+    return TestClient(app)
+
+
+def stream(client, **body):
+    response = client.post("/api/v1/chat/stream", json={"message": "check my balance", **body})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    return response.content
+
+
+def parse_frames(body: bytes):
+    """The comment frame and the decoded data frames of an SSE body"""
+    assert body.endswith(b"\n\n")
+    frames = body[:-2].split(b"\n\n")
+    assert frames[0] == b": intent check_balance"
+    events = []
+    for frame in frames[1:]:
+        assert frame.startswith(b"data: ")
+        events.append(json.loads(frame[len(b"data: "):]))
+    return events
+
+
+def test_char_mode_sends_one_frame_per_character(client):
+    events = parse_frames(stream(client, stream_mode="char"))
+
+    tokens = events[:-1]
+    assert events[-1] == {"type": "done"}
+    assert [event["content"] for event in tokens] == list(RESPONSE)
+    # The server paces char frames itself
+    assert all("pace_ms" not in event for event in tokens)
+
+
+def test_word_mode_sends_words_with_a_pace_hint(client):
+    events = parse_frames(stream(client, stream_mode="word"))
+
+    assert events[-1] == {"type": "done"}
+    assert [event["content"] for event in events[:-1]] == split_text(RESPONSE, "word")
+    assert all(event["pace_ms"] == 1 for event in events[:-1])
+    assert "".join(event["content"] for event in events[:-1]) == RESPONSE
+
+
+def test_chunk_mode_packs_words_into_chunks(client):
+    events = parse_frames(stream(client, stream_mode="chunk"))
+
+    chunks = [event["content"] for event in events[:-1]]
+    assert events[-1] == {"type": "done"}
+    assert "".join(chunks) == RESPONSE
+    assert len(chunks) < len(split_text(RESPONSE, "word"))
+    assert all(len(chunk) <= 16 or " " not in chunk.strip() for chunk in chunks)
+
+
+def test_word_mode_body_is_the_prebuilt_frames(client):
+    body = stream(client, stream_mode="word")
+
+    assert body == b": intent check_balance\n\n" + b"".join(build_frames(RESPONSE, "word", pace_ms=1))
+    assert body.endswith(DONE_FRAME)
+
+
+def test_default_mode_follows_settings(client, monkeypatch):
+    assert stream(client) == stream(client, stream_mode="char")
+
+    monkeypatch.setattr(settings, "STREAM_MODE", "chunk")
+    assert stream(client) == stream(client, stream_mode="chunk")
+
+
+def test_unknown_mode_is_rejected(client):
+    response = client.post("/api/v1/chat/stream", json={"message": "check my balance", "stream_mode": "fast"})
+
+    assert response.status_code == 422
+
+
+def test_unknown_mode_in_settings_is_rejected():
+    assert Settings().STREAM_MODE in ("char", "word", "chunk")
+    with pytest.raises(ValidationError):
+        Settings(STREAM_MODE="fast")
+    with pytest.raises(ValueError, match="Unknown stream mode"):
+        split_text(RESPONSE, "fast")
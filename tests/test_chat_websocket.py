@@ -0,0 +1,119 @@
+"""
+Chat WebSocket Tests
+Concurrent turns over one connection, invalid frames and failed turns
+"""
+
+import asyncio
+import json
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.ai_engine.app.core.config import settings
+from backend.ai_engine.app.services.pipeline import TurnResult, chat_pipeline, combined_intent
+from backend.ai_engine.main import app
+
+# Seconds each fake turn takes, by intent
+DELAYS = {"order_food": 0.3, "check_balance": 0.0}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def complete(nlus):
+        intent = combined_intent(nlus)
+        if intent == "process_payment":
+            raise RuntimeError("payment service exploded")
+        await asyncio.sleep(DELAYS.get(intent, 0.0))
+        return TurnResult(intent=intent, response=f"Handled {intent} for you.")
+
+    monkeypatch.setattr(chat_pipeline, "complete", complete)
+    return TestClient(app)
+
+
+def receive_until_done(ws, turns: int):
+    """Events until `turns` turns have finished with done or error"""
+    events = []
+    finished = 0
+    while finished < turns:
+        event = ws.receive_json()
+        events.append(event)
+        finished += event["type"] in ("done", "error")
+    return events
+
+
+def test_turns_run_concurrently_and_carry_their_turn_id(client):
+    with client.websocket_connect("/api/v1/chat/ws") as ws:
+        assert ws.receive_json()["type"] == "session"
+        ws.send_text(json.dumps({"message": "order a pizza", "turn_id": "slow"}))
+        ws.send_text(json.dumps({"message": "check my balance", "turn_id": "fast", "stream_mode": "chunk"}))
+
+        events = receive_until_done(ws, 2)
+
+    done = [event["turn_id"] for event in events if event["type"] == "done"]
+    assert done == ["fast", "slow"]
+    for turn_id, intent in [("slow", "order_food"), ("fast", "check_balance")]:
+        turn = [event for event in events if event["turn_id"] == turn_id]
+        assert turn[0] == {"type": "intent", "intent": intent, "turn_id": turn_id}
+        assert "".join(event["content"] for event in turn if event["type"] == "token") == f"Handled {intent} for you."
+
+
+def test_turn_ids_default_to_the_turn_number(client):
+    with client.websocket_connect("/api/v1/chat/ws") as ws:
+        ws.receive_json()
+        for _ in range(2):
+            ws.send_text(json.dumps({"message": "check my balance"}))
+            events = receive_until_done(ws, 1)
+        assert {event["turn_id"] for event in events} == {2}
+
+
+@pytest.mark.parametrize("send", [
+    lambda ws: ws.send_bytes(b'{"message": "check my balance"}'),
+    lambda ws: ws.send_text("not json"),
+    lambda ws: ws.send_text(json.dumps({"text": "missing message"})),
+    lambda ws: ws.send_text(json.dumps({"message": "hi", "stream_mode": "fast"})),
+])
+def test_invalid_frames_get_an_error_and_keep_the_connection(client, send):
+    with client.websocket_connect("/api/v1/chat/ws") as ws:
+        ws.receive_json()
+        send(ws)
+        error = ws.receive_json()
+        assert error["type"] == "error"
+        assert error["error"].startswith("Invalid message")
+
+        ws.send_text(json.dumps({"message": "check my balance", "turn_id": "after"}))
+        assert receive_until_done(ws, 1)[-1] == {"type": "done", "turn_id": "after"}
+
+
+def test_failed_turn_is_reported_and_logged(client, caplog):
+    with caplog.at_level(logging.ERROR, logger="backend.ai_engine.app.routers.chat"):
+        with client.websocket_connect("/api/v1/chat/ws") as ws:
+            ws.receive_json()
+            ws.send_text(json.dumps({"message": "pay 20 dollars", "turn_id": "broken"}))
+            events = receive_until_done(ws, 1)
+
+            ws.send_text(json.dumps({"message": "check my balance", "turn_id": "next"}))
+            assert receive_until_done(ws, 1)[-1] == {"type": "done", "turn_id": "next"}
+
+    assert events[-1]["type"] == "error"
+    assert events[-1]["turn_id"] == "broken"
+    assert "payment service exploded" not in events[-1]["error"]
+    assert any("payment service exploded" in str(record.exc_info[1]) for record in caplog.records if record.exc_info)
+
+
+def test_turns_beyond_the_cap_are_refused(client, monkeypatch):
+    monkeypatch.setattr(settings, "WS_MAX_ACTIVE_TURNS", 2)
+    with client.websocket_connect("/api/v1/chat/ws") as ws:
+        ws.receive_json()
+        for turn_id in ("one", "two", "three"):
+            ws.send_text(json.dumps({"message": "order a pizza", "turn_id": turn_id}))
+        events = receive_until_done(ws, 3)
+
+        # Once the running turns finish, new ones are accepted again
+        ws.send_text(json.dumps({"message": "check my balance", "turn_id": "four"}))
+        assert receive_until_done(ws, 1)[-1] == {"type": "done", "turn_id": "four"}
+
+    assert [event for event in events if event["type"] == "error"] == [
+        {"type": "error", "error": "Too many turns in progress, try again shortly", "turn_id": "three"}
+    ]
+    assert [event["turn_id"] for event in events if event["type"] == "done"] == ["one", "two"]
@@ -0,0 +1,93 @@
+"""
+Fuzzy Index Tests
+Typo recovery, Dice scores and result limits of the trigram index
+"""
+
+import random
+
+import pytest
+
+from backend.mcp_servers.core.fuzzy_index import FuzzyIndex, build_vocabulary_index, trigrams
+
+NAMES = ["Cheese Pizza", "Chicken Biryani", "Veg Burger", "Pasta Alfredo", "Kindle Paperwhite", "Echo Dot"]
+
+
+def dice(a: str, b: str) -> float:
+    grams_a, grams_b = set(trigrams(a)), set(trigrams(b))
+    return 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+
+@pytest.fixture
+def index():
+    return FuzzyIndex((name, i) for i, name in enumerate(NAMES))
+
+
+def test_trigrams_pad_word_edges():
+    assert trigrams("Pizza") == ["  p", " pi", "piz", "izz", "zza", "za "]
+
+
+@pytest.mark.parametrize("query, name", [
+    ("kindel", "Kindle Paperwhite"),
+    ("biriyani", "Chicken Biryani"),
+    ("chiken biryani", "Chicken Biryani"),
+    ("piza", "Cheese Pizza"),
+    ("echo dott", "Echo Dot"),
+])
+def test_typo_recovery(index, query, name):
+    assert index.search(query, limit=1)[0][1] == name
+
+
+def test_scores_are_dice_coefficients(index):
+    results = index.search("chiken biryani", limit=len(NAMES), min_score=0.0)
+
+    assert results
+    for score, text, _ in results:
+        assert score == pytest.approx(dice("chiken biryani", text))
+    assert [score for score, _, _ in results] == sorted((score for score, _, _ in results), reverse=True)
+
+
+def test_exact_match_scores_one(index):
+    score, text, payload = index.search("Veg Burger", limit=1)[0]
+
+    assert (score, text, payload) == (pytest.approx(1.0), "Veg Burger", 2)
+
+
+def test_limit_and_min_score(index):
+    assert len(index.search("a", limit=2, min_score=0.0)) <= 2
+    assert index.search("zzzz qqqq") == []
+    assert all(score >= 0.5 for score, _, _ in index.search("chicken", limit=10, min_score=0.5))
+
+
+def test_search_matches_brute_force_dice():
+    rng = random.Random(3)
+    words = ["chicken", "paneer", "masala", "garlic", "cheese", "spicy", "house", "grill"]
+    syllables = ["ka", "ri", "to", "mo", "sa", "ne", "lu", "pa"]
+    names = [
+        f"{rng.choice(words)} {rng.choice(words)} {''.join(rng.choice(syllables) for _ in range(3))}"
+        for _ in range(2000)
+    ]
+    index = FuzzyIndex((name, i) for i, name in enumerate(names))
+    query = names[7][:-1]
+
+    results = index.search(query, limit=5)
+
+    # Trigrams shared by most of the catalog count as much as rare ones
+    expected = sorted((dice(query, name) for name in names), reverse=True)[:5]
+    assert [score for score, _, _ in results] == pytest.approx(expected)
+    assert results[0][1] == names[7]
+    for score, text, _ in results:
+        assert score == pytest.approx(dice(query, text))
+
+
+def test_a_rare_unrelated_trigram_does_not_hide_matches():
+    index = FuzzyIndex([("Veg Burger", 0), ("Fire TV Stick", 1), ("Fire TV Stick 4K", 2)])
+
+    assert index.search("buy fire stick", limit=1)[0][1] == "Fire TV Stick"
+
+
+def test_best_and_vocabulary_index():
+    vocabulary = build_vocabulary_index(["kindle", "pizza", "biryani", "pizza"])
+
+    assert len(vocabulary) == 3
+    assert vocabulary.best("kindel") == "kindle"
+    assert vocabulary.best("xyzzy") is None
@@ -0,0 +1,137 @@
+"""
+Gazetteer Tests
+Multi-word catalog names, leftmost-longest matching and misspelt names
+"""
+
+import pytest
+
+from backend.ai_engine.app.core.config import settings
+from backend.ai_engine.app.services import mcp_client as mcp_client_module
+from backend.ai_engine.app.services.gazetteer import EntityMatch, build_gazetteer, tokenize
+from backend.ai_engine.app.services.nlu_service import FUZZY_ENTITY_CONFIDENCE, NLUService
+from backend.ai_engine.app.services.pipeline import INTENT_HANDLERS, NLUResult
+
+FOODS = [
+    {"id": "1", "name": "Cheese Pizza"},
+    {"id": "2", "name": "Chicken Biryani"},
+    {"id": "3", "name": "Chicken"},
+    {"id": "4", "name": "Veg Burger"},
+]
+PRODUCTS = [
+    {"id": "B001", "name": "Kindle Paperwhite"},
+    {"id": "B003", "name": "Fire TV Stick"},
+    {"id": "B004", "name": "Fire TV Stick 4K"},
+]
+
+
+@pytest.fixture
+def gazetteer():
+    return build_gazetteer([("food", FOODS), ("product", PRODUCTS)])
+
+
+def test_tokenize_folds_case_and_plurals():
+    assert tokenize("Two Cheese Pizzas, please!") == ["two", "cheese", "pizza", "please"]
+    assert tokenize("glass bus") == ["glass", "bus"]
+
+
+def test_multi_token_names(gazetteer):
+    assert gazetteer.find_all("order a cheese pizza now") == [EntityMatch("food", "1", "Cheese Pizza", 2, 4)]
+    assert gazetteer.find_all("order two Cheese Pizzas") == [EntityMatch("food", "1", "Cheese Pizza", 2, 4)]
+    # Every token of a name has to be present
+    assert gazetteer.find_all("order a pizza") == []
+
+
+def test_longest_match_wins(gazetteer):
+    assert gazetteer.find_all("chicken biryani please") == [EntityMatch("food", "2", "Chicken Biryani", 0, 2)]
+    assert gazetteer.find_all("grilled chicken please") == [EntityMatch("food", "3", "Chicken", 1, 2)]
+    assert gazetteer.find_all("buy a fire tv stick 4k") == [EntityMatch("product", "B004", "Fire TV Stick 4K", 2, 6)]
+    # A partial longer name falls back to the longest complete one
+    assert gazetteer.find_all("fire tv stick 4") == [EntityMatch("product", "B003", "Fire TV Stick", 0, 3)]
+
+
+def test_matches_do_not_overlap_and_keep_text_order(gazetteer):
+    matches = gazetteer.find_all("chicken biryani and a kindle paperwhite and chicken")
+
+    assert [(m.entity_id, m.start, m.end) for m in matches] == [("2", 0, 2), ("B001", 4, 6), ("3", 7, 8)]
+    assert {kind: m.entity_id for kind, m in gazetteer.best_by_kind("chicken and chicken biryani").items()} == {
+        "food": "2"
+    }
+
+
+@pytest.mark.parametrize("text, kind, entity_id", [
+    ("biriyani", "food", "2"),
+    ("chiken biryani", "food", "2"),
+    ("cheese piza", "food", "1"),
+    ("kindel paperwhite", "product", "B001"),
+    ("fire stik", "product", "B003"),
+])
+def test_fuzzy_match_resolves_typos(gazetteer, text, kind, entity_id):
+    assert gazetteer.fuzzy_match(text, kind).entity_id == entity_id
+
+
+def test_fuzzy_match_respects_kind_and_score(gazetteer):
+    assert gazetteer.fuzzy_match("kindel paperwhite", "food") is None
+    assert gazetteer.fuzzy_match("weather today", "food") is None
+
+
+def test_fuzzy_match_ranks_within_the_kind():
+    # Closer product names must not crowd out the only food name
+    products = [{"id": f"K{i}", "name": f"Kindle {i}"} for i in range(6)]
+    gazetteer = build_gazetteer([("product", products), ("food", [{"id": "9", "name": "Kindle Cup"}])])
+
+    assert gazetteer.fuzzy_match("kindel", "food").entity_id == "9"
+    assert gazetteer.fuzzy_match("kindel", "product").entity_id == "K0"
+
+
+def test_version_changes_with_contents(gazetteer):
+    version = gazetteer.version
+    gazetteer.add("food", "Paneer Tikka", "5")
+
+    assert gazetteer.version == version + 1
+    assert gazetteer.fuzzy_match("paner tika", "food").entity_id == "5"
+
+
+@pytest.fixture
+def nlu(gazetteer):
+    return NLUService(gazetteer=gazetteer, spelling_min_score=0.5)
+
+
+def test_nlu_returns_item_id_for_exact_catalog_names(nlu):
+    result = nlu.process_text("order chicken biryani")
+
+    assert (result["item"], result["item_id"], result["confidence"]) == ("chicken biryani", "2", 0.9)
+
+
+@pytest.mark.parametrize("text, item", [
+    # Corrected onto the "biryani" keyword, but still resolved to the catalog name
+    ("order biriyani", "chicken biryani"),
+    ("buy kindel", "kindle paperwhite"),
+    ("buy fire stik", "fire tv stick"),
+])
+def test_nlu_only_names_the_item_for_misspelt_names(nlu, text, item):
+    result = nlu.process_text(text)
+
+    assert result["item"] == item
+    assert "item_id" not in result
+    assert result["confidence"] <= FUZZY_ENTITY_CONFIDENCE < settings.PREFETCH_MIN_CONFIDENCE
+
+
+@pytest.mark.asyncio
+async def test_misspelt_name_is_searched_before_ordering(nlu, monkeypatch):
+    calls = []
+
+    async def call_tool(server_name, tool_name, arguments):
+        calls.append((server_name, tool_name))
+        return {"success": True, "results": [{"id": "B001"}]}
+
+    monkeypatch.setattr(mcp_client_module.mcp_client, "call_tool", call_tool)
+    nlu_result = NLUResult("order_product", nlu.process_text("buy kindel"))
+    await INTENT_HANDLERS["order_product"].execute(nlu_result)
+
+    assert calls == [("amazon", "search_product"), ("amazon", "place_order")]
+
+
+def test_nlu_keeps_typed_keywords_generic(nlu):
+    # A dish keyword as typed is a search, even when another word was corrected
+    assert "item_id" not in nlu.process_text("order pizza")
+    assert "item_id" not in nlu.process_text("order pizza and check balanse")
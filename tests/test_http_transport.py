@@ -0,0 +1,40 @@
+"""
+HTTP Transport Tests
+Tool calls round-tripped through the streamable HTTP server app
+"""
+
+import httpx
+import pytest
+
+from backend.ai_engine.app.services.http_transport import HttpTransport, _parse_sse_message
+from backend.ai_engine.app.services.mcp_client import MCPClientService
+from backend.mcp_servers import http_app
+from backend.mcp_servers.core.config import settings as server_settings
+
+
+def test_parse_sse_message():
+    body = 'event: message\ndata: {"jsonrpc": "2.0",\ndata: "id": 1, "result": {}}\n\n'
+
+    assert _parse_sse_message(body) == {"jsonrpc": "2.0", "id": 1, "result": {}}
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_round_trip_over_http():
+    # The session managers can only be run once per process, so every check shares this app
+    transport = HttpTransport(
+        f"http://mcp.test{server_settings.API_V1_STR}", transport=httpx.ASGITransport(app=http_app.app)
+    )
+    client = MCPClientService()
+    client.transport = transport
+
+    async with http_app.lifespan(http_app.app):
+        try:
+            result = await transport.call_tool("banking", "get_balance", {"account_id": "123456"}, timeout=5.0)
+            assert not result.isError
+
+            assert (await client._dispatch("zomato", "search_food", {"query": "pizza", "limit": 1}))["count"] == 1
+            product = await client._dispatch("amazon", "get_product_details", {"product_id": "B001"})
+            assert product["product"]["name"] == "Kindle Paperwhite"
+            assert await client._dispatch("zomato", "nope", {}) == {"success": False, "error": "Unknown tool: nope"}
+        finally:
+            await transport.close()
@@ -0,0 +1,97 @@
+"""
+Intent Classifier Tests
+Hashed TF-IDF features, sparse batch scoring and the NLU fallback
+"""
+
+import numpy as np
+import pytest
+
+from backend.ai_engine.app.services.gazetteer import Gazetteer
+from backend.ai_engine.app.services.intent_classifier import INTENT_EXAMPLES, IntentClassifier, extract_features
+from backend.ai_engine.app.services.nlu_service import NLUService
+
+TEXTS = [
+    "i am hungry, deliver something to eat",
+    "send 20 dollars to my brother",
+    "how much cash is in my savings",
+    "i need new headphones from amazon",
+    "",
+    "the weather is nice",
+    "order a pizza",
+]
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return IntentClassifier()
+
+
+def dense_scores(classifier: IntentClassifier, texts) -> np.ndarray:
+    """Reference scores from dense TF-IDF vectors"""
+    vectors = classifier._vectorize_counts(classifier._term_counts(texts))
+    similarities = vectors @ classifier.example_matrix.T
+    return np.maximum.reduceat(similarities, classifier._starts, axis=1)
+
+
+def test_extract_features():
+    assert extract_features("Order Pizza") == [
+        "w:order", "w:pizza", "b:order_pizza",
+        "c:<or", "c:ord", "c:rde", "c:der", "c:er>",
+        "c:<pi", "c:piz", "c:izz", "c:zza", "c:za>",
+    ]
+    assert extract_features("!!") == []
+
+
+def test_sparse_scores_match_dense_reference(classifier):
+    assert classifier.score_batch(TEXTS) == pytest.approx(dense_scores(classifier, TEXTS), abs=1e-5)
+
+
+def test_chunking_does_not_change_scores(classifier):
+    chunked = IntentClassifier(chunk_size=2)
+
+    assert chunked.score_batch(TEXTS) == pytest.approx(classifier.score_batch(TEXTS), abs=1e-6)
+
+
+def test_examples_score_one_for_their_own_intent(classifier):
+    for intent, examples in INTENT_EXAMPLES.items():
+        column = classifier.intents.index(intent)
+        assert classifier.score_batch(examples)[:, column] == pytest.approx(1.0, abs=1e-5)
+
+
+@pytest.mark.parametrize("text, intent", [
+    ("i am hungry, deliver something to eat", "order_food"),
+    ("send 20 dollars to my brother", "process_payment"),
+    ("how much cash is in my savings", "check_balance"),
+    ("i need new headphones from amazon", "order_product"),
+])
+def test_classify(classifier, text, intent):
+    assert classifier.classify(text)[0] == intent
+
+
+def test_low_scores_are_unknown(classifier):
+    assert classifier.classify("") == ("unknown", 0.0)
+    intent, score = classifier.classify("the weather is nice")
+    assert intent == "unknown"
+    assert score < classifier.min_score
+
+
+def test_batch_matches_single_texts(classifier):
+    assert classifier.classify_batch(TEXTS) == [classifier.classify(text) for text in TEXTS]
+    assert classifier.classify_batch([]) == []
+
+
+def test_nlu_falls_back_to_classifier(classifier):
+    nlu = NLUService(gazetteer=Gazetteer(), classifier=classifier)
+
+    result = nlu.process_text("i am hungry, deliver something to eat")
+    assert result["intent"] == "order_food"
+    # Confidence is capped by the similarity and by the missing dish
+    assert result["confidence"] <= 0.6
+    assert result["item"] == "pizza"
+
+    # Rule matches win and the batch path agrees with process_text
+    assert nlu.process_batch(["check my balance", "i am hungry, deliver something to eat", "hello"]) == [
+        nlu.process_text("check my balance"),
+        result,
+        {"intent": "unknown", "confidence": 0.0},
+    ]
@@ -0,0 +1,145 @@
+"""
+Keyword Matcher Tests
+The compiled matcher must read utterances the way the original substring checks did
+"""
+
+import re
+
+import pytest
+
+from backend.ai_engine.app.services.gazetteer import Gazetteer
+from backend.ai_engine.app.services.keyword_matcher import KeywordGroup, KeywordMatcher
+from backend.ai_engine.app.services.nlu_service import NLUService
+
+
+def baseline_process_text(text):
+    """The original if/elif NLU, kept verbatim as the reference"""
+    text_lower = text.lower()
+
+    def extract_quantity(text):
+        numbers = re.findall(r'\d+', text)
+        if numbers:
+            return int(numbers[0])
+        word_to_num = {
+            "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+            "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10
+        }
+        for word, num in word_to_num.items():
+            if word in text:
+                return num
+        return 1
+
+    def extract_amount(text):
+        amounts = re.findall(r'\$?(\d+\.?\d*)', text)
+        if amounts:
+            return float(amounts[0])
+        return 0.0
+
+    if "order" in text_lower and any(food in text_lower for food in ["pizza", "biryani", "burger", "pasta", "food"]):
+        food_items = ["pizza", "biryani", "burger", "pasta", "chicken", "veg"]
+        item = next((food for food in food_items if food in text_lower), "pizza")
+        return {"intent": "order_food", "item": item, "quantity": extract_quantity(text_lower)}
+    elif any(keyword in text_lower for keyword in ["buy", "purchase", "get me"]) or \
+            any(product in text_lower for product in ["kindle", "echo", "fire tv", "usb"]):
+        products = ["kindle", "echo", "fire tv", "usb"]
+        item = next((prod for prod in products if prod in text_lower), "kindle")
+        return {"intent": "order_product", "item": item, "quantity": extract_quantity(text_lower)}
+    elif any(keyword in text_lower for keyword in ["balance", "account", "money"]):
+        return {"intent": "check_balance", "account_id": "123456"}
+    elif "pay" in text_lower or "payment" in text_lower or "transfer" in text_lower:
+        return {"intent": "process_payment", "account_id": "123456",
+                "amount": extract_amount(text_lower), "merchant": "Unknown"}
+    return {"intent": "unknown"}
+
+
+CORPUS = [
+    "Order me a pizza",
+    "order 2 pizzas",
+    "I want to order three burgers",
+    "please order some food",
+    "ordering chicken biryani x4",
+    "reorder my pizza",
+    "Re-order the veg burger",
+    "can you order pasta for 2",
+    "order a cheeseburger",
+    "preorder biryani",
+    "order something",
+    "pizza please",
+    "Buy a Kindle",
+    "buy 3 kindles",
+    "purchase an echo dot",
+    "get me a fire tv stick",
+    "I need a USB cable",
+    "rebuy the kindle",
+    "purchased echo",
+    "check my balance",
+    "what's my account balance?",
+    "how much money do I have",
+    "show my accounts",
+    "accountant",
+    "pay $45.50 to the electrician",
+    "repay my loan",
+    "prepay 20 dollars",
+    "make a payment of 100",
+    "transfer $250",
+    "payments of $12.75 and $3",
+    "Payday",
+    "hello there",
+    "what is the weather",
+    "",
+    "order pizza and pay 30",
+    "buy pizza",
+    "order a kindle",
+    "order 10 pizzas for $45",
+    "ORDER   PIZZA",
+]
+
+
+@pytest.fixture(scope="module")
+def nlu():
+    # Keyword rules only: no catalog, classifier or spelling correction
+    return NLUService(gazetteer=Gazetteer())
+
+
+@pytest.mark.parametrize("text", CORPUS)
+def test_matches_baseline(nlu, text):
+    result = nlu.process_text(text)
+    result.pop("confidence")
+
+    assert result == baseline_process_text(text)
+
+
+@pytest.mark.parametrize("text, quantity", [
+    ("order one pizza", 1),
+    ("order two pizzas", 2),
+    ("order ten burgers", 10),
+])
+def test_number_words(nlu, text, quantity):
+    assert nlu.process_text(text)["quantity"] == quantity
+
+
+def test_number_words_need_whole_words(nlu):
+    # Deliberate difference from the baseline, which read "often" as ten
+    assert nlu.process_text("I often order pizza")["quantity"] == 1
+    assert baseline_process_text("I often order pizza")["quantity"] == 10
+
+
+def test_overlapping_keywords_are_all_found():
+    matcher = KeywordMatcher([
+        KeywordGroup("a", ["pay", "payment"]),
+        KeywordGroup("b", ["men"]),
+        KeywordGroup("c", ["ten"], whole_word=True),
+    ])
+
+    scan = matcher.scan("payment often ten")
+
+    assert scan.top("a") == "pay"
+    assert scan.has("b")
+    assert scan.top("c") == "ten"
+    assert not matcher.scan("often").has("c")
+
+
+def test_numbers_do_not_overlap():
+    matcher = KeywordMatcher([KeywordGroup("a", ["x"])])
+
+    assert matcher.scan("2 for $45.50 and 7").numbers == ["2", "$45.50", "7"]
@@ -0,0 +1,122 @@
+"""
+Mapped Catalog Tests
+Round trips through the .mcat format and the bundled catalog files
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from backend.mcp_servers.core.catalog import DATA_DIR, load_catalog, open_catalog
+from backend.mcp_servers.core.mapped_catalog import (
+    MappedCatalog,
+    encode_catalog,
+    main,
+    open_mapped_catalog,
+    write_catalog,
+)
+
+ROWS = [
+    {"id": "B2", "name": "Écho Dot", "price": 49.99, "stock": 3, "in_stock": True, "category": "Smart Home"},
+    {"id": "A1", "name": "Kindle", "price": 129.0, "stock": 0, "in_stock": False, "category": "Smart Home"},
+    {"id": "C3", "name": "Cable", "stock": 12, "in_stock": True, "tags": "usb"},
+]
+
+
+@pytest.mark.parametrize("name", ["food_catalog", "product_catalog"])
+def test_bundled_catalog_matches_its_json_source(name):
+    rows = load_catalog(DATA_DIR / f"{name}.json")
+    catalog = open_catalog(DATA_DIR / f"{name}.mcat")
+
+    assert list(catalog) == rows
+    # Rebuilt from the JSON source, the file is byte-for-byte the same
+    assert (DATA_DIR / f"{name}.mcat").read_bytes() == encode_catalog(rows)
+
+
+def test_round_trip_keeps_values_and_drops_missing_fields():
+    catalog = MappedCatalog(encode_catalog(ROWS))
+
+    assert len(catalog) == 3
+    assert catalog.fields == ["id", "name", "price", "stock", "in_stock", "category", "tags"]
+    assert list(catalog) == ROWS
+    assert catalog[-1] == ROWS[2]
+    assert list(catalog.iter_rows(("id", "price"))) == [
+        {"id": "B2", "price": 49.99}, {"id": "A1", "price": 129.0}, {"id": "C3"},
+    ]
+    with pytest.raises(IndexError):
+        catalog.row(3)
+
+
+def test_columns_are_typed_views():
+    catalog = MappedCatalog(encode_catalog(ROWS))
+
+    assert catalog.column("stock").dtype == np.dtype("<i8")
+    assert catalog.column("in_stock").tolist() == [True, False, True]
+    assert np.isnan(catalog.column("price")[2])
+    # Repeated strings share one entry of the string table
+    category = catalog.column("category")
+    assert category[0] == category[1]
+    assert catalog.string(int(category[0])) == "Smart Home"
+
+
+def test_find_by_key():
+    catalog = MappedCatalog(encode_catalog(ROWS))
+
+    assert catalog.find_row("A1") == 1
+    assert catalog.find("C3") == ROWS[2]
+    assert catalog.find("Z9") is None
+    assert catalog.find("") is None
+
+    numbered = MappedCatalog(encode_catalog([{"id": 10}, {"id": 9}, {"id": 100}]))
+    assert numbered.find("9") == {"id": 9}
+    assert numbered.find("100") == {"id": 100}
+
+
+def test_empty_catalog():
+    catalog = MappedCatalog(encode_catalog([]))
+
+    assert len(catalog) == 0
+    assert list(catalog) == []
+    assert catalog.find("A1") is None
+
+
+def test_encoding_errors():
+    with pytest.raises(ValueError, match="mixes value types"):
+        encode_catalog([{"id": "1", "price": 1.0}, {"id": "2", "price": "free"}])
+    with pytest.raises(ValueError, match="no 'id' field"):
+        encode_catalog([{"name": "Kindle"}])
+    with pytest.raises(ValueError, match="not a catalog file"):
+        MappedCatalog(b"{}")
+    with pytest.raises(ValueError, match="not a catalog file"):
+        MappedCatalog(b"NOTMCAT!" + bytes(8))
+
+
+def test_open_catalog_reads_json_and_mapped_files(tmp_path):
+    json_path = tmp_path / "catalog.json"
+    json_path.write_text(json.dumps({"items": ROWS}), encoding="utf-8")
+    mcat_path = tmp_path / "catalog.mcat"
+    write_catalog(ROWS, mcat_path)
+
+    assert list(open_catalog(json_path)) == ROWS
+    mapped = open_catalog(mcat_path)
+    assert list(mapped) == ROWS
+    assert mapped.source == str(mcat_path)
+    assert list(open_mapped_catalog(mcat_path)) == ROWS
+
+
+def test_command_line_builds_a_catalog(tmp_path, capsys):
+    source = tmp_path / "catalog.json"
+    source.write_text(json.dumps(ROWS), encoding="utf-8")
+    target = tmp_path / "catalog.mcat"
+
+    assert main([str(source), str(target)]) == 0
+    assert "Wrote 3 rows" in capsys.readouterr().out
+    assert target.read_bytes() == encode_catalog(ROWS)
+    assert main([str(source)]) == 2
+
+
+def test_find_returns_the_first_row_of_a_repeated_key():
+    catalog = MappedCatalog(encode_catalog([{"id": "A", "n": 1}, {"id": "B", "n": 2}, {"id": "A", "n": 3}]))
+
+    assert catalog.find("A") == {"id": "A", "n": 1}
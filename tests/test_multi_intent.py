@@ -0,0 +1,85 @@
+"""
+Multi-Intent Tests
+Clause splitting, the intent cap, and concurrent completion of the intents
+"""
+
+import asyncio
+
+import pytest
+
+from backend.ai_engine.app.services.gazetteer import build_gazetteer
+from backend.ai_engine.app.services.nlu_service import MAX_INTENTS, NLUService
+from backend.ai_engine.app.services.pipeline import (
+    INTENT_HANDLERS,
+    IntentHandler,
+    NLUResult,
+    ToolResult,
+    chat_pipeline,
+)
+
+
+@pytest.fixture
+def nlu():
+    return NLUService(gazetteer=build_gazetteer([]))
+
+
+def intents(results):
+    return [(result["intent"], result.get("item")) for result in results]
+
+
+@pytest.mark.parametrize("text", [
+    "order a pizza and check my balance",
+    "order a pizza, check my balance",
+    "order a pizza then check my balance",
+    "order a pizza and also check my balance",
+])
+def test_clauses_become_separate_intents(nlu, text):
+    assert intents(nlu.process_multi(text)) == [("order_food", "pizza"), ("check_balance", None)]
+
+
+def test_fewer_than_two_intents_use_the_whole_text(nlu):
+    # The second clause alone means nothing, but it carries the quantity
+    assert nlu.process_multi("order pizza and make it two") == [nlu.process_text("order pizza and make it two")]
+    assert intents(nlu.process_multi("order a pizza and order a pizza")) == [("order_food", "pizza")]
+    assert nlu.process_multi("hello and goodbye") == [{"intent": "unknown", "confidence": 0.0}]
+
+
+def test_single_clause_is_processed_once(nlu, monkeypatch):
+    texts = []
+    process_text = nlu.process_text
+    monkeypatch.setattr(nlu, "process_text", lambda text: texts.append(text) or process_text(text))
+
+    assert intents(nlu.process_multi("order a pizza")) == [("order_food", "pizza")]
+    assert texts == ["order a pizza"]
+
+
+def test_intents_are_capped(nlu):
+    text = "order pizza, order a burger and order biryani then buy a kindle and also check my balance"
+
+    assert len(nlu.process_multi(text)) == MAX_INTENTS
+    assert intents(nlu.process_multi(text)) == [
+        ("order_food", "pizza"), ("order_food", "burger"), ("order_food", "biryani"), ("order_product", "kindle"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_intents_complete_concurrently_and_merge_in_order(monkeypatch):
+    started = {"first": asyncio.Event(), "second": asyncio.Event()}
+
+    def handler(intent, other):
+        async def execute(nlu):
+            started[intent].set()
+            # Deadlocks unless the other intent runs at the same time
+            await asyncio.wait_for(started[other].wait(), timeout=1.0)
+            return [ToolResult("test", intent, {"success": True})]
+
+        return IntentHandler(intent, execute, lambda nlu, results: f"Did {intent}.")
+
+    monkeypatch.setitem(INTENT_HANDLERS, "first", handler("first", "second"))
+    monkeypatch.setitem(INTENT_HANDLERS, "second", handler("second", "first"))
+
+    result = await chat_pipeline.complete([NLUResult("first", {}), NLUResult("second", {})])
+
+    assert result.intent == "first+second"
+    assert result.response == "Did first. Did second."
+    assert [tool_result.tool for tool_result in result.tool_results] == ["first", "second"]
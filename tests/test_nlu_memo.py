@@ -0,0 +1,77 @@
+"""
+NLU Memo Tests
+Normalised utterance keys, LRU bound, copies and invalidation
+"""
+
+import pytest
+
+from backend.ai_engine.app.services.gazetteer import build_gazetteer
+from backend.ai_engine.app.services.keyword_matcher import KeywordGroup
+from backend.ai_engine.app.services.nlu_service import KEYWORD_GROUPS, NLUService, normalize_utterance
+
+
+@pytest.fixture
+def nlu():
+    gazetteer = build_gazetteer([("food", [{"id": "1", "name": "Cheese Pizza"}])])
+    return NLUService(gazetteer=gazetteer, memo_max_entries=2)
+
+
+def test_normalize_utterance():
+    assert normalize_utterance("  Order a Pizza!! ") == "order a pizza"
+    assert normalize_utterance("Pay $45.50, then check my balance?") == "pay $45.50 , then check my balance"
+
+
+def test_equivalent_utterances_share_an_entry(nlu):
+    first = nlu.understand("Order a Pizza!")
+    second = nlu.understand("order   a pizza")
+
+    assert first == second == nlu.process_multi("order a pizza")
+    assert nlu.memo_stats() == {"size": 1, "max_entries": 2, "hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+def test_callers_get_their_own_copies(nlu):
+    nlu.understand("order a pizza")[0]["quantity"] = 99
+
+    assert nlu.understand("order a pizza")[0]["quantity"] == 1
+
+
+def test_least_recently_used_entry_is_evicted(nlu):
+    nlu.understand("order a pizza")
+    nlu.understand("check my balance")
+    nlu.understand("order a pizza")
+    nlu.understand("pay 20")
+
+    assert list(nlu._memo) == ["order a pizza", "pay 20"]
+    assert nlu.memo_stats()["size"] == 2
+
+
+def test_memo_disabled_by_default():
+    nlu = NLUService()
+    nlu.understand("order a pizza")
+
+    assert nlu.memo_stats()["size"] == 0
+    assert nlu.memo_hits == nlu.memo_misses == 0
+
+
+def test_gazetteer_change_invalidates(nlu):
+    assert "item_id" not in nlu.understand("order a veg pizza")[0]
+
+    nlu.gazetteer.add("food", "Veg Pizza", "2")
+    result = nlu.understand("order a veg pizza")[0]
+
+    assert result["item_id"] == "2"
+    assert nlu.memo_hits == 0
+
+
+def test_reload_invalidates(nlu):
+    assert nlu.understand("order some tacos")[0]["intent"] == "unknown"
+
+    groups = [
+        KeywordGroup(group.name, list(group.keywords) + ["taco"]) if group.name in ("food_trigger", "food") else group
+        for group in KEYWORD_GROUPS
+    ]
+    nlu.reload(groups=groups)
+
+    assert nlu.memo_stats()["size"] == 0
+    assert nlu.understand("order some tacos")[0]["item"] == "taco"
+    assert nlu.memo_hits == 0
@@ -0,0 +1,79 @@
+"""
+Chat Pipeline Tests
+Dispatch through the intent handler registry and the unknown-intent fallback
+"""
+
+import pytest
+
+from backend.ai_engine.app.services import mcp_client as mcp_client_module
+from backend.ai_engine.app.services.pipeline import (
+    FALLBACK_RESPONSE,
+    INTENT_HANDLERS,
+    IntentHandler,
+    NLUResult,
+    ToolResult,
+    chat_pipeline,
+    combined_intent,
+    register_intent,
+)
+
+BALANCE = {
+    "success": True,
+    "account": {"account_type": "Checking", "balance": 5000.0, "currency": "USD"},
+}
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Tool calls made by the handlers, answered with a canned balance"""
+    calls = []
+
+    async def call_tool(server_name, tool_name, arguments):
+        calls.append((server_name, tool_name, arguments))
+        return BALANCE
+
+    monkeypatch.setattr(mcp_client_module.mcp_client, "call_tool", call_tool)
+    return calls
+
+
+def test_built_in_intents_are_registered():
+    assert {"order_food", "order_product", "check_balance"} <= set(INTENT_HANDLERS)
+
+
+@pytest.mark.asyncio
+async def test_turn_is_dispatched_to_the_intent_handler(calls):
+    turn = await chat_pipeline.run("check my balance")
+
+    assert turn.intent == "check_balance"
+    assert turn.response == "Your Checking account balance is $5000.00 USD."
+    assert calls == [("banking", "get_balance", {"account_id": "123456"})]
+    assert [(result.server, result.tool) for result in turn.tool_results] == [("banking", "get_balance")]
+
+
+@pytest.mark.asyncio
+async def test_registered_handler_replaces_the_dispatch(monkeypatch, calls):
+    monkeypatch.setitem(INTENT_HANDLERS, "check_balance", INTENT_HANDLERS["check_balance"])
+
+    async def execute(nlu):
+        return [ToolResult("banking", "get_balance", {"success": True})]
+
+    handler = register_intent(IntentHandler("check_balance", execute, lambda nlu, results: "Custom balance."))
+
+    assert INTENT_HANDLERS["check_balance"] is handler
+    assert (await chat_pipeline.run("check my balance")).response == "Custom balance."
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_unknown_intent_gets_the_fallback(calls):
+    turn = await chat_pipeline.run("what's the weather like")
+
+    assert turn.intent == "unknown"
+    assert turn.response == FALLBACK_RESPONSE
+    assert turn.tool_results == []
+    assert calls == []
+
+
+def test_combined_intent():
+    assert combined_intent([NLUResult("check_balance", {})]) == "check_balance"
+    assert combined_intent([NLUResult("order_food", {}), NLUResult("check_balance", {})]) == "order_food+check_balance"
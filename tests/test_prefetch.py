@@ -0,0 +1,96 @@
+"""
+Prefetch Tests
+Speculative reads from partial transcripts and their short-lived cache
+"""
+
+import pytest
+
+from backend.ai_engine.app.services import mcp_client as mcp_client_module
+from backend.ai_engine.app.services.mcp_client import MCPClientService
+from backend.ai_engine.app.services.pipeline import chat_pipeline
+from backend.ai_engine.app.services.tool_cache import ToolResultCache
+
+PREFETCH_TTLS = {"zomato.search_food": 15.0, "amazon.search_product": 15.0, "banking.get_balance": 15.0}
+
+
+def fake_client(success: bool = True) -> MCPClientService:
+    """A client whose tool calls are recorded instead of dispatched; the result cache is off"""
+    client = MCPClientService()
+    client.transport = None
+    client.cache = ToolResultCache(ttls={})
+    client.prefetched = ToolResultCache(ttls=PREFETCH_TTLS)
+    client.calls = []
+
+    async def dispatch(server_name, tool_name, arguments):
+        client.calls.append((server_name, tool_name, arguments))
+        return {"success": success, "call": len(client.calls)}
+
+    client._dispatch = dispatch
+    return client
+
+
+@pytest.mark.asyncio
+async def test_prefetched_result_serves_the_next_call():
+    client = fake_client()
+
+    assert await client.prefetch("zomato", "search_food", {"query": "pizza"})
+    assert await client.prefetch("zomato", "search_food", {"query": "pizza"})
+    result = await client.call_tool("zomato", "search_food", {"query": "pizza"})
+
+    assert result == {"success": True, "call": 1}
+    assert len(client.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_only_prefetch_tools_run_speculatively():
+    client = fake_client()
+
+    assert not await client.prefetch("zomato", "place_order", {"item_id": "1"})
+    assert not await client.prefetch("banking", "get_transaction_history", {"account_id": "1"})
+    assert client.calls == []
+
+
+@pytest.mark.asyncio
+async def test_failed_prefetch_is_not_kept():
+    client = fake_client(success=False)
+
+    assert not await client.prefetch("amazon", "search_product", {"query": "kindle"})
+    assert len(client.prefetched) == 0
+
+
+@pytest.mark.asyncio
+async def test_write_drops_prefetched_results_of_its_server():
+    client = fake_client()
+    await client.prefetch("banking", "get_balance", {"account_id": "123456"})
+    await client.prefetch("zomato", "search_food", {"query": "pizza"})
+
+    await client.call_tool("banking", "process_payment", {"account_id": "123456", "amount": 5.0})
+
+    assert client.prefetched.get("banking", "get_balance", {"account_id": "123456"}) is None
+    assert client.prefetched.get("zomato", "search_food", {"query": "pizza"}) is not None
+
+
+@pytest.fixture
+def pipeline_client(monkeypatch):
+    client = fake_client()
+    monkeypatch.setattr(mcp_client_module, "mcp_client", client)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_pipeline_prefetches_confident_intents(pipeline_client):
+    nlus, prefetched = await chat_pipeline.prefetch("order a pizza and check my balance", 0.8)
+
+    assert [nlu.intent for nlu in nlus] == ["order_food", "check_balance"]
+    assert prefetched
+    assert sorted(call[:2] for call in pipeline_client.calls) == [
+        ("banking", "get_balance"), ("zomato", "search_food"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_skips_unsure_and_unknown_intents(pipeline_client):
+    # "order food" names no dish, so its confidence stays below the threshold
+    assert (await chat_pipeline.prefetch("order food", 0.8))[1] is False
+    assert (await chat_pipeline.prefetch("hello there", 0.8))[1] is False
+    assert pipeline_client.calls == []
@@ -0,0 +1,91 @@
+"""
+Product Store Tests
+Vectorised filters, sort orders and paging over a mapped product catalog
+"""
+
+import numpy as np
+import pytest
+
+from backend.mcp_servers.core.mapped_catalog import MappedCatalog, encode_catalog
+from backend.mcp_servers.core.product_store import ProductStore
+from backend.mcp_servers.core.text_index import rank_page
+
+PRODUCTS = [
+    {"id": "P0", "name": "Kindle", "category": "Electronics", "price": 129.99, "rating": 4.6, "in_stock": True},
+    {"id": "P1", "name": "Echo Dot", "category": "Smart Home", "price": 49.99, "rating": 4.7, "in_stock": True},
+    {"id": "P2", "name": "Fire TV Stick", "category": "Electronics", "price": 39.99, "rating": 4.5, "in_stock": False},
+    {"id": "P3", "name": "USB Cable", "category": "Accessories", "price": 7.99, "rating": 4.4, "in_stock": True},
+]
+
+
+@pytest.fixture
+def store():
+    return ProductStore(MappedCatalog(encode_catalog(PRODUCTS)))
+
+
+def every_row(store):
+    return np.arange(len(store), dtype=np.int32), np.ones(len(store), dtype=np.float32)
+
+
+def test_filters(store):
+    ids, relevance = every_row(store)
+
+    assert store.query(ids, relevance, max_price=40)[0] == [2, 3]
+    assert store.query(ids, relevance, min_price=40, max_price=130)[0] == [0, 1]
+    assert store.query(ids, relevance, min_rating=4.6)[0] == [0, 1]
+    assert store.query(ids, relevance, category="electronics")[0] == [0, 2]
+    assert store.query(ids, relevance, category="Garden") == ([], 0)
+    assert store.query(ids, relevance, in_stock_only=True)[0] == [0, 1, 3]
+    assert store.query(ids, relevance, category="Electronics", in_stock_only=True) == ([0], 1)
+
+
+def test_permuted_ids_filter_the_right_rows(store):
+    # Fuzzy matches arrive in score order, not row order
+    ids = np.array([3, 2, 1, 0], dtype=np.int32)
+
+    assert store.filter_mask(ids, max_price=40).tolist() == [True, True, False, False]
+    assert store.filter_mask(ids, category="electronics").tolist() == [False, True, False, True]
+
+    relevance = np.array([0.9, 0.8, 0.7, 0.6], dtype=np.float32)
+    assert store.query(ids, relevance, max_price=40) == ([3, 2], 2)
+
+
+def test_whole_catalog_fast_path_matches_gather(store):
+    ids, _ = every_row(store)
+    for filters in ({"max_price": 40}, {"min_rating": 4.6}, {"category": "Electronics", "in_stock_only": True}):
+        assert store.filter_mask(ids, whole=True, **filters).tolist() == store.filter_mask(ids, **filters).tolist()
+
+
+def test_sort_orders(store):
+    ids, _ = every_row(store)
+    relevance = np.array([0.1, 0.4, 0.3, 0.2], dtype=np.float32)
+
+    assert store.query(ids, relevance)[0] == [1, 2, 3, 0]
+    assert store.query(ids, relevance, sort="price_asc")[0] == [3, 2, 1, 0]
+    assert store.query(ids, relevance, sort="price_desc")[0] == [0, 1, 2, 3]
+    assert store.query(ids, relevance, sort="rating")[0] == [1, 0, 2, 3]
+
+
+def test_offset_and_limit(store):
+    ids, relevance = every_row(store)
+
+    assert store.query(ids, relevance, sort="price_asc", limit=2) == ([3, 2], 4)
+    assert store.query(ids, relevance, sort="price_asc", limit=2, offset=2) == ([1, 0], 4)
+    assert store.query(ids, relevance, sort="price_asc", limit=2, offset=3) == ([0], 4)
+    assert store.query(ids, relevance, sort="price_asc", limit=2, offset=10) == ([], 4)
+
+
+def test_get(store):
+    assert store.get("P2")["name"] == "Fire TV Stick"
+    assert store.get("P9") is None
+
+
+def test_rank_page_matches_a_full_sort():
+    rng = np.random.default_rng(7)
+    ids = rng.permutation(500).astype(np.int32)
+    # Coarse scores so ties straddle the page ends and fall back to the id
+    scores = rng.integers(0, 20, size=500).astype(np.float32)
+    expected = [int(i) for _, i in sorted(zip(-scores, ids))]
+
+    for offset, limit in [(0, 10), (0, 500), (37, 25), (490, 20), (500, 5)]:
+        assert rank_page(ids, scores, limit, offset) == expected[offset:offset + limit]
@@ -0,0 +1,233 @@
+"""
+Resilience Tests
+Circuit breaker state machine, deadlines and hedged calls
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from backend.ai_engine.app.core.config import settings
+from backend.ai_engine.app.services.mcp_client import MCPClientService
+from backend.ai_engine.app.services.resilience import (
+    CircuitBreaker,
+    DeadlineExceeded,
+    LatencyTracker,
+    hedged,
+    with_deadline,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def open_breaker(clock: FakeClock) -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10.0, clock=clock)
+    for _ in range(3):
+        assert breaker.allow() == (True, False)
+        breaker.record_failure()
+    return breaker
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10.0, clock=clock)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow() == (False, False)
+    assert breaker.rejected == 1
+    assert breaker.opened == 1
+
+
+def test_half_open_admits_exactly_one_probe(clock):
+    breaker = open_breaker(clock)
+    clock.now = 9.9
+    assert breaker.allow() == (False, False)
+
+    clock.now = 10.0
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow() == (True, True)
+    assert breaker.allow() == (False, False)
+    assert breaker.allow() == (False, False)
+
+
+def test_only_the_probe_releases_the_probe_slot(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10.0, clock=clock)
+    # A slow call admitted while the circuit was closed...
+    _, slow_call_probe = breaker.allow()
+    breaker.record_failure()
+    clock.now = 10.0
+    _, probe = breaker.allow()
+    assert probe
+
+    # ...finishing while the probe is out must not free the slot
+    breaker.release(slow_call_probe)
+    assert breaker.allow() == (False, False)
+
+    # A probe that ends without an outcome frees it for the next caller
+    breaker.release(probe)
+    assert breaker.allow() == (True, True)
+
+
+def test_probe_outcome_closes_or_reopens(clock):
+    breaker = open_breaker(clock)
+    clock.now = 10.0
+    assert breaker.allow() == (True, True)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.opened == 2
+
+    clock.now = 20.0
+    assert breaker.allow() == (True, True)
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow() == (True, False)
+
+
+def test_latency_quantile():
+    tracker = LatencyTracker(window=100, min_samples=10)
+    for i in range(9):
+        tracker.observe("tool", i / 100)
+    assert tracker.quantile("tool", 0.95) is None
+
+    for i in range(9, 100):
+        tracker.observe("tool", i / 100)
+    assert tracker.quantile("tool", 0.95) == 0.95
+    assert tracker.quantile("tool", 0.5) == 0.50
+    assert tracker.quantile("other", 0.5) is None
+
+
+@pytest.mark.asyncio
+async def test_deadline_returns_result_in_time():
+    async def quick():
+        await asyncio.sleep(0.001)
+        return "done"
+
+    assert await with_deadline(quick(), 1.0) == "done"
+
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_the_call():
+    cancelled = asyncio.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    started = time.perf_counter()
+    with pytest.raises(DeadlineExceeded):
+        await with_deadline(slow(), 0.05)
+
+    assert time.perf_counter() - started < 1.0
+    await asyncio.wait_for(cancelled.wait(), 1.0)
+
+
+@pytest.mark.asyncio
+async def test_deadline_propagates_call_errors():
+    async def broken():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await with_deadline(broken(), 1.0)
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_delay_or_when_primary_is_fast():
+    calls = 0
+
+    async def attempt():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await hedged(attempt, None) == (1, None)
+    assert await hedged(attempt, 0.5) == (2, None)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_hedge_fires_after_delay_and_loser_is_cancelled():
+    tracker = LatencyTracker(window=20, min_samples=20)
+    for _ in range(20):
+        tracker.observe("tool", 0.05)
+    delay = tracker.quantile("tool", 0.95)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    attempts = []
+    primary_cancelled = asyncio.Event()
+
+    async def attempt():
+        attempts.append(loop.time() - started)
+        if len(attempts) == 1:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                primary_cancelled.set()
+                raise
+        return "hedge result"
+
+    result, winner = await hedged(attempt, delay)
+
+    assert (result, winner) == ("hedge result", "hedge")
+    assert len(attempts) == 2
+    assert attempts[1] >= delay
+    await asyncio.wait_for(primary_cancelled.wait(), 1.0)
+
+
+@pytest.mark.asyncio
+async def test_failed_attempt_loses_to_a_success():
+    calls = 0
+
+    async def attempt():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(0.05)
+            raise ConnectionError("primary failed")
+        await asyncio.sleep(0.1)
+        return "ok"
+
+    assert await hedged(attempt, 0.01) == ("ok", "hedge")
+
+
+@pytest.mark.asyncio
+async def test_both_attempts_failing_raises():
+    async def attempt():
+        await asyncio.sleep(0.02)
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        await hedged(attempt, 0.01)
+
+
+def test_call_deadline_is_never_shorter_than_the_tool_timeout(monkeypatch):
+    monkeypatch.setattr(settings, "MCP_DEADLINE", 8.0)
+    monkeypatch.setattr(settings, "MCP_SERVER_DEADLINES", {"banking": 2.0})
+    monkeypatch.setattr(settings, "MCP_TOOL_TIMEOUT", 5.0)
+    monkeypatch.setattr(settings, "MCP_TOOL_TIMEOUTS", {"banking.process_payment": 30.0})
+    client = MCPClientService()
+
+    assert client.deadline_for("zomato", "search_food") == 8.0
+    assert client.deadline_for("banking", "get_balance") == 5.0
+    assert client.deadline_for("banking", "process_payment") == 30.0
@@ -0,0 +1,132 @@
+"""
+Single-Flight Tests
+Coalescing of identical in-flight calls and cancellation of their callers
+"""
+
+import asyncio
+
+import pytest
+
+from backend.ai_engine.app.services.mcp_client import MCPClientService
+from backend.ai_engine.app.services.single_flight import SingleFlight
+from backend.ai_engine.app.services.tool_cache import ToolResultCache
+
+
+class SlowCall:
+    """A call that runs until released, counting starts and cancellations"""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.started = 0
+        self.cancelled = 0
+
+    async def __call__(self):
+        self.started += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return {"success": True, "call": self.started}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_call():
+    flight, call = SingleFlight(), SlowCall()
+
+    waiters = [asyncio.create_task(flight.do("key", call)) for _ in range(5)]
+    await asyncio.sleep(0)
+    call.release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert call.started == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {"in_flight": 0, "calls": 1, "shared": 4, "abandoned": 0}
+
+
+@pytest.mark.asyncio
+async def test_different_keys_and_later_calls_run_separately():
+    flight = SingleFlight()
+    started = []
+
+    async def call(name):
+        started.append(name)
+        return name
+
+    assert await asyncio.gather(flight.do("a", lambda: call("a")), flight.do("b", lambda: call("b"))) == ["a", "b"]
+    assert await flight.do("a", lambda: call("a")) == "a"
+    assert started == ["a", "b", "a"]
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_waiter():
+    flight = SingleFlight()
+    gate = asyncio.Event()
+
+    async def broken():
+        await gate.wait()
+        raise ConnectionError("down")
+
+    waiters = [asyncio.create_task(flight.do("key", broken)) for _ in range(3)]
+    await asyncio.sleep(0)
+    gate.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert flight.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_the_shared_call():
+    flight, call = SingleFlight(), SlowCall()
+    first = asyncio.create_task(flight.do("key", call))
+    second = asyncio.create_task(flight.do("key", call))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    call.release.set()
+
+    assert (await second)["call"] == 1
+    assert call.cancelled == 0
+    assert flight.abandoned == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_last_waiter_abandons_the_call():
+    flight, call = SingleFlight(), SlowCall()
+    waiters = [asyncio.create_task(flight.do("key", call)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    for waiter in waiters:
+        waiter.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert call.cancelled == 1
+    assert flight.stats() == {"in_flight": 0, "calls": 1, "shared": 1, "abandoned": 1}
+
+    # A new caller starts afresh rather than joining the cancelled call
+    call.release.set()
+    assert (await flight.do("key", call))["call"] == 2
+
+
+@pytest.mark.asyncio
+async def test_client_coalesces_identical_reads_but_not_writes():
+    client, call = MCPClientService(), SlowCall()
+    client.transport = None
+    client.cache = ToolResultCache(ttls={})
+
+    async def dispatch(server_name, tool_name, arguments):
+        return await call()
+
+    client._dispatch = dispatch
+    reads = [asyncio.create_task(client.call_tool("zomato", "search_food", {"query": "pizza"})) for _ in range(3)]
+    writes = [asyncio.create_task(client.call_tool("zomato", "place_order", {"item_id": "1"})) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    call.release.set()
+    await asyncio.gather(*reads, *writes)
+
+    assert call.started == 3
+    assert client.single_flight.shared == 2
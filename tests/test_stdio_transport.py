@@ -0,0 +1,81 @@
+"""
+Stdio Transport Tests
+Tool calls over persistent server subprocesses and restarts after a crash
+"""
+
+import asyncio
+import os
+import signal
+from pathlib import Path
+
+import pytest
+
+from backend.ai_engine.app.services.stdio_transport import StdioTransport
+from backend.ai_engine.app.services.tool_registry import MCP_SERVER_MODULES
+
+pytestmark = pytest.mark.skipif(not Path("/proc/self").exists(), reason="finds the server process through /proc")
+
+
+def server_pids(module_path: str):
+    """Child processes of this process running the given server module"""
+    pids = []
+    for proc in Path("/proc").iterdir():
+        try:
+            parent = int((proc / "stat").read_text().rsplit(")", 1)[1].split()[1])
+            command = (proc / "cmdline").read_bytes().split(b"\0")
+        except (OSError, ValueError, IndexError):
+            continue
+        if parent == os.getpid() and module_path.encode() in command:
+            pids.append(int(proc.name))
+    return pids
+
+
+@pytest.mark.asyncio
+async def test_server_is_restarted_after_a_crash():
+    # Frequent pings notice the crash without waiting for a failed call
+    transport = StdioTransport(
+        modules={"banking": MCP_SERVER_MODULES["banking"]}, ping_interval=0.1, restart_backoff=0.05
+    )
+    try:
+        await transport.start()
+        result = await transport.call_tool("banking", "get_balance", {"account_id": "123456"}, timeout=10.0)
+        assert not result.isError and '"success": true' in result.content[0].text
+
+        pids = server_pids(MCP_SERVER_MODULES["banking"])
+        assert len(pids) == 1
+        os.kill(pids[0], signal.SIGKILL)
+
+        session = transport.sessions["banking"]
+        for _ in range(100):
+            if session.restarts and session.connected:
+                break
+            await asyncio.sleep(0.1)
+        result = await transport.call_tool("banking", "get_balance", {"account_id": "123456"}, timeout=10.0)
+
+        assert session.restarts == 1
+        assert not result.isError and '"success": true' in result.content[0].text
+        assert server_pids(MCP_SERVER_MODULES["banking"]) not in ([], pids)
+    finally:
+        await transport.close()
+
+    assert server_pids(MCP_SERVER_MODULES["banking"]) == []
+
+
+@pytest.mark.asyncio
+async def test_call_on_a_dead_server_fails_and_restarts_it():
+    transport = StdioTransport(
+        modules={"banking": MCP_SERVER_MODULES["banking"]}, ping_interval=60.0, restart_backoff=0.05
+    )
+    try:
+        await transport.start()
+        os.kill(server_pids(MCP_SERVER_MODULES["banking"])[0], signal.SIGKILL)
+        await asyncio.sleep(0.1)
+
+        with pytest.raises(ConnectionError):
+            await transport.call_tool("banking", "get_balance", {"account_id": "123456"}, timeout=10.0)
+        result = await transport.call_tool("banking", "get_balance", {"account_id": "123456"}, timeout=10.0)
+
+        assert not result.isError
+        assert transport.sessions["banking"].restarts == 1
+    finally:
+        await transport.close()
@@ -0,0 +1,93 @@
+"""
+Text Index Tests
+Field-weighted BM25 scores, the rank boost and paging of ranked matches
+"""
+
+import math
+
+import pytest
+
+from backend.mcp_servers.core.text_index import TextIndex, tokenize
+
+ROWS = [
+    {"name": "Kindle Paperwhite", "category": "E-Readers", "rating": 4.6},
+    {"name": "Kindle Paperwhite Kids Edition With Cover", "category": "E-Readers", "rating": 4.8},
+    {"name": "Echo Dot", "category": "Smart Speakers", "rating": 4.7},
+    {"name": "Smart Plug", "category": "Smart Home", "rating": 4.0},
+    {"name": "Reading Light", "category": "Kindle Accessories", "rating": 4.2},
+]
+FIELDS = {"name": 2.0, "category": 1.0}
+
+
+def bm25(rows, fields, query, k1=1.2, b=0.75):
+    """Reference field-weighted BM25 per row, summed over the query terms"""
+    docs = [{field: tokenize(str(row.get(field) or "")) for field in fields} for row in rows]
+    lengths = [sum(len(tokens) for tokens in doc.values()) for doc in docs]
+    average = sum(lengths) / len(lengths)
+    scores = [0.0] * len(rows)
+    for term in set(tokenize(query)):
+        df = sum(any(term in tokens for tokens in doc.values()) for doc in docs)
+        idf = math.log(1 + (len(rows) - df + 0.5) / (df + 0.5))
+        for i, doc in enumerate(docs):
+            tf = sum(boost * doc[field].count(term) for field, boost in fields.items())
+            if tf:
+                scores[i] += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths[i] / average))
+    return scores
+
+
+@pytest.fixture
+def index():
+    return TextIndex(ROWS, FIELDS, rank_field="rating", rank_weight=0.25)
+
+
+@pytest.mark.parametrize("query", ["kindle", "smart", "kindle cover", "smart echo dot"])
+def test_scores_are_bm25_plus_rank_boost(query):
+    index = TextIndex(ROWS, FIELDS, rank_field="rating", rank_weight=0.25)
+    reference = bm25(ROWS, FIELDS, query)
+    best = max(reference)
+    top_rating = max(row["rating"] for row in ROWS)
+
+    ids, scores = index.match(query)
+
+    assert ids.tolist() == [i for i, score in enumerate(reference) if score > 0]
+    expected = [reference[i] / best + 0.25 * ROWS[i]["rating"] / top_rating for i in ids]
+    assert scores.tolist() == pytest.approx(expected, rel=1e-5)
+
+
+def test_bm25_order_without_rank_boost():
+    index = TextIndex(ROWS, FIELDS)
+
+    # A name hit beats a category hit, and a short name beats a long one
+    assert index.search("kindle")[0] == [0, 1, 4]
+    # Both terms outrank either one
+    assert index.search("smart echo")[0][0] == 2
+
+
+def test_rating_boost_reorders_close_matches():
+    rows = [
+        {"name": "Echo Dot Speaker", "rating": 2.0},
+        {"name": "Echo Dot Speaker Plus", "rating": 5.0},
+    ]
+
+    assert TextIndex(rows, {"name": 1.0}).search("echo")[0] == [0, 1]
+    assert TextIndex(rows, {"name": 1.0}, rank_field="rating", rank_weight=0.25).search("echo")[0] == [1, 0]
+
+
+def test_prefix_and_plural_matching(index):
+    assert index.search("kind")[0] == index.search("kindle")[0]
+    assert index.search("smart plugs")[0][0] == 3
+    assert index.search("zebra") == ([], 0)
+
+
+def test_empty_query_ranks_by_rating(index):
+    assert index.search("", limit=3) == ([1, 2, 0], 5)
+
+
+def test_search_pages(index):
+    everything, total = index.search("kindle smart", limit=10)
+
+    assert total == len(everything) == 5
+    assert index.search("kindle smart", limit=2, offset=1) == (everything[1:3], 5)
+    assert index.search("kindle smart", limit=2, offset=4) == (everything[4:], 5)
+    assert index.search("kindle smart", limit=2, offset=5) == ([], 5)
+
@@ -0,0 +1,147 @@
+"""
+Tool Result Cache Tests
+Per-tool TTLs, LRU eviction and invalidation of cached reads by writes
+"""
+
+import asyncio
+
+import pytest
+
+from backend.ai_engine.app.services import tool_cache
+from backend.ai_engine.app.services.mcp_client import MCPClientService
+from backend.ai_engine.app.services.tool_cache import ToolResultCache, tool_key
+
+TTLS = {"amazon.search_product": 60.0, "zomato.search_food": 30.0, "amazon.place_order": 60.0}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(tool_cache, "time", clock)
+    return clock
+
+
+def test_tool_key_ignores_argument_order():
+    assert tool_key("amazon", "search_product", {"query": "kindle", "limit": 5}) == \
+        tool_key("amazon", "search_product", {"limit": 5, "query": "kindle"})
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = ToolResultCache(ttls=TTLS)
+    cache.set("amazon", "search_product", {"query": "kindle"}, {"success": True})
+    cache.set("zomato", "search_food", {"query": "pizza"}, {"success": True})
+
+    clock.now += 30.0
+    assert cache.get("amazon", "search_product", {"query": "kindle"}) == {"success": True}
+    assert cache.get("zomato", "search_food", {"query": "pizza"}) is None
+
+    clock.now += 30.0
+    assert cache.get("amazon", "search_product", {"query": "kindle"}) is None
+    assert len(cache) == 0
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_only_tools_with_a_ttl_are_cached(clock):
+    cache = ToolResultCache(ttls=TTLS)
+
+    # Writes are never cached, whatever the configuration says
+    cache.set("amazon", "place_order", {"item_id": "B001"}, {"success": True})
+    cache.set("banking", "get_balance", {"account_id": "1"}, {"success": True})
+
+    assert len(cache) == 0
+    assert not cache.is_cacheable("amazon", "place_order")
+    assert not ToolResultCache(ttls={"amazon.search_product": 0}).is_cacheable("amazon", "search_product")
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = ToolResultCache(max_entries=2, ttls=TTLS)
+    cache.set("amazon", "search_product", {"query": "a"}, "a")
+    cache.set("amazon", "search_product", {"query": "b"}, "b")
+    assert cache.get("amazon", "search_product", {"query": "a"}) == "a"
+
+    cache.set("amazon", "search_product", {"query": "c"}, "c")
+
+    assert cache.get("amazon", "search_product", {"query": "b"}) is None
+    assert cache.get("amazon", "search_product", {"query": "a"}) == "a"
+    assert cache.get("amazon", "search_product", {"query": "c"}) == "c"
+    assert cache.evictions == 1
+
+
+def test_invalidate(clock):
+    cache = ToolResultCache(ttls=TTLS)
+    cache.set("amazon", "search_product", {"query": "a"}, "a")
+    cache.set("zomato", "search_food", {"query": "a"}, "a")
+
+    assert cache.invalidate("amazon") == 1
+    assert cache.get("zomato", "search_food", {"query": "a"}) == "a"
+    assert cache.invalidate(tool_name="search_food") == 1
+    cache.set("zomato", "search_food", {"query": "a"}, "a")
+    assert cache.invalidate() == 1
+    assert len(cache) == 0
+
+
+@pytest.fixture
+def client():
+    client = MCPClientService()
+    client.transport = None
+    client.cache = ToolResultCache(ttls=TTLS)
+    client.calls = []
+    client.gates = {}
+
+    async def dispatch(server_name, tool_name, arguments):
+        client.calls.append((server_name, tool_name))
+        gate = client.gates.get(tool_name)
+        if gate is not None:
+            await gate.wait()
+        return {"success": True, "call": len(client.calls)}
+
+    client._dispatch = dispatch
+    return client
+
+
+@pytest.mark.asyncio
+async def test_cached_reads_skip_the_server(client):
+    first = await client.call_tool("amazon", "search_product", {"query": "kindle"})
+    second = await client.call_tool("amazon", "search_product", {"query": "kindle"})
+
+    assert first == second
+    assert client.calls == [("amazon", "search_product")]
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_cached_reads_of_their_server(client):
+    await client.call_tool("amazon", "search_product", {"query": "kindle"})
+    await client.call_tool("zomato", "search_food", {"query": "pizza"})
+
+    await client.call_tool("amazon", "place_order", {"item_id": "B001"})
+
+    await client.call_tool("amazon", "search_product", {"query": "kindle"})
+    await client.call_tool("zomato", "search_food", {"query": "pizza"})
+    assert client.calls == [
+        ("amazon", "search_product"),
+        ("zomato", "search_food"),
+        ("amazon", "place_order"),
+        ("amazon", "search_product"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_read_in_flight_during_a_write_is_not_cached(client):
+    client.gates["search_product"] = asyncio.Event()
+    read = asyncio.create_task(client.call_tool("amazon", "search_product", {"query": "kindle"}))
+    await asyncio.sleep(0)
+
+    await client.call_tool("amazon", "place_order", {"item_id": "B001"})
+    client.gates["search_product"].set()
+    assert (await read)["success"]
+
+    assert client.cache.get("amazon", "search_product", {"query": "kindle"}) is None
@@ -0,0 +1,155 @@
+"""
+Tool Registry Tests
+Binding server tools, in-process dispatch and transport selection
+"""
+
+import importlib
+import json
+
+import pytest
+from mcp.types import CallToolResult, TextContent, Tool
+
+from backend.ai_engine.app.services.http_transport import HttpTransport
+from backend.ai_engine.app.services.mcp_client import MCPClientService, create_transport
+from backend.ai_engine.app.services.stdio_transport import StdioTransport
+from backend.ai_engine.app.services.tool_registry import MCP_SERVER_MODULES, ToolRegistry, bind_tool
+from backend.mcp_servers.core import tool_result
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "query": {"type": "string"},
+        "limit": {"type": "integer", "default": 10},
+        "quantity": {"type": "integer"},
+        "exact": {"type": "boolean"},
+    },
+}
+
+
+async def lookup(query, limit=5, quantity=1, exact=None, offset=3):
+    return [TextContent(type="text", text=json.dumps({"success": True}))]
+
+
+def test_bind_tool_defaults():
+    binding = bind_tool("shop", Tool(name="lookup", inputSchema=SCHEMA), lookup)
+
+    assert binding.parameters == ("query", "limit", "quantity", "exact", "offset")
+    # Schema default, then the handler's default, then an empty value for the type
+    assert binding.defaults == {"query": "", "limit": 10, "quantity": 1, "exact": None, "offset": 3}
+    assert not binding.structured
+
+
+def test_bind_arguments_fills_missing_and_drops_unknown():
+    binding = bind_tool("shop", Tool(name="lookup", inputSchema=SCHEMA), lookup)
+
+    assert binding.bind_arguments({"query": "kindle", "limit": 2, "bogus": True}) == {
+        "query": "kindle", "limit": 2, "quantity": 1, "exact": None, "offset": 3,
+    }
+
+
+@pytest.mark.asyncio
+async def test_registry_binds_every_advertised_tool():
+    registry = ToolRegistry()
+    await registry.ensure_loaded()
+
+    names = {(binding.server, binding.name) for binding in registry.tools()}
+    assert {("zomato", "search_food"), ("zomato", "place_order"), ("zomato", "get_restaurant_info"),
+            ("amazon", "search_product"), ("amazon", "get_product_details"),
+            ("banking", "get_balance"), ("banking", "process_payment"),
+            ("banking", "get_transaction_history")} <= names
+    assert len(registry) == len(names)
+    assert {binding.server for binding in registry.tools("banking")} == {"banking"}
+    assert registry.get("zomato", "search_food").structured
+    assert registry.get("zomato", "nope") is None
+    assert registry.has_server("amazon") and not registry.has_server("nope")
+
+
+@pytest.mark.asyncio
+async def test_in_process_dispatch():
+    client = MCPClientService()
+    client.transport = None
+
+    result = await client._dispatch("zomato", "search_food", {"query": "pizza", "limit": 1})
+    assert result["success"] and result["count"] == 1
+    # A missing argument takes the tool's default
+    assert (await client._dispatch("zomato", "place_order", {"item_id": "1"}))["quantity"] == 1
+    assert await client._dispatch("nope", "search_food", {}) == {"success": False, "error": "Unknown server"}
+    assert await client._dispatch("zomato", "nope", {}) == {"success": False, "error": "Unknown tool: nope"}
+
+
+def test_create_transport():
+    assert create_transport("inprocess") is None
+    assert isinstance(create_transport("stdio"), StdioTransport)
+    http = create_transport("http")
+    assert isinstance(http, HttpTransport)
+    assert all(http.has_server(name) for name in MCP_SERVER_MODULES)
+    with pytest.raises(ValueError, match="Unknown MCP_TRANSPORT"):
+        create_transport("carrier-pigeon")
+
+
+class FakeTransport:
+    def __init__(self, result: CallToolResult):
+        self.result = result
+        self.calls = []
+
+    def has_server(self, server_name: str) -> bool:
+        return server_name == "zomato"
+
+    async def call_tool(self, server_name, tool_name, arguments, timeout):
+        self.calls.append((server_name, tool_name, arguments, timeout))
+        return self.result
+
+
+def text_result(text: str, is_error: bool = False) -> CallToolResult:
+    return CallToolResult(content=[TextContent(type="text", text=text)], isError=is_error)
+
+
+@pytest.mark.asyncio
+async def test_remote_dispatch_goes_through_the_transport():
+    client = MCPClientService()
+    client.transport = FakeTransport(text_result('{"success": true, "results": []}'))
+
+    assert await client._dispatch("zomato", "search_food", {"query": "pizza"}) == {"success": True, "results": []}
+    assert client.transport.calls == [
+        ("zomato", "search_food", {"query": "pizza"}, client.timeout_for("zomato", "search_food"))
+    ]
+    assert await client._dispatch("amazon", "search_product", {}) == {"success": False, "error": "Unknown server"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("result, error", [
+    (text_result("server exploded", is_error=True), "server exploded"),
+    (CallToolResult(content=[], isError=False), "Empty response from zomato.search_food"),
+    (text_result("Unknown tool: search_food"), "Unknown tool: search_food"),
+])
+async def test_remote_errors_become_error_results(result, error):
+    client = MCPClientService()
+    client.transport = FakeTransport(result)
+
+    assert await client._dispatch("zomato", "search_food", {}) == {"success": False, "error": error}
+
+
+READ_CALLS = [
+    ("zomato", "search_food", {"query": "pizza", "limit": 3}),
+    ("zomato", "get_restaurant_info", {"restaurant_name": "Pizza Hut"}),
+    ("amazon", "search_product", {"query": "kindle"}),
+    ("amazon", "get_product_details", {"product_id": "B001"}),
+    ("banking", "get_balance", {"account_id": "123456"}),
+    ("banking", "get_transaction_history", {"account_id": "123456"}),
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("server_name, tool_name, arguments", READ_CALLS)
+async def test_structured_dispatch_matches_the_text_path(monkeypatch, server_name, tool_name, arguments):
+    module = importlib.import_module(MCP_SERVER_MODULES[server_name])
+    text = (await module.call_tool(tool_name, arguments))[0].text
+
+    def no_encoding(response):
+        raise AssertionError("structured results must not be encoded")
+
+    monkeypatch.setattr(tool_result, "text_content", no_encoding)
+    client = MCPClientService()
+    client.transport = None
+
+    assert await client._dispatch(server_name, tool_name, arguments) == json.loads(text)
@@ -0,0 +1,160 @@
+"""
+Transaction Log Tests
+History order, keyset paging, date bounds and balance restore
+"""
+
+import asyncio
+
+import pytest
+
+from backend.mcp_servers.core.ledger import Ledger, Posting
+from backend.mcp_servers.core.transaction_log import TransactionLog, parse_time_bound
+
+TIMESTAMPS = [
+    "2025-12-01T09:00:00.000000Z",
+    "2025-12-01T23:59:59.999999Z",
+    "2025-12-02T00:00:00.000000Z",
+    "2025-12-02T12:00:00.000000Z",
+    "2025-12-03T08:30:00.000000Z",
+]
+
+
+@pytest.fixture
+def log():
+    log = TransactionLog()
+    yield log
+    log.close()
+
+
+async def fill(log: TransactionLog) -> None:
+    balance = 10000
+    for i, timestamp in enumerate(TIMESTAMPS):
+        balance -= 100
+        await log.append(Posting("A", -100, balance, f"Shop {i}", transaction_id=f"T{i}", timestamp=timestamp))
+        await log.append(Posting("B", -1, 0, "Other", transaction_id=f"B{i}", timestamp=timestamp))
+
+
+async def ids(log: TransactionLog, account_id: str = "A", **kwargs) -> list:
+    transactions, _ = await log.history(account_id, limit=50, **kwargs)
+    return [transaction["id"] for transaction in transactions]
+
+
+@pytest.mark.asyncio
+async def test_history_is_newest_first_per_account(log):
+    await fill(log)
+
+    transactions, next_cursor = await log.history("A", limit=50)
+
+    assert [t["id"] for t in transactions] == ["T4", "T3", "T2", "T1", "T0"]
+    assert transactions[0] == {
+        "id": "T4",
+        "timestamp": TIMESTAMPS[4],
+        "description": "Shop 4",
+        "amount": -1.00,
+        "balance": 95.00,
+    }
+    assert next_cursor is None
+    assert await ids(log, "missing") == []
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_cover_history_once(log):
+    await fill(log)
+    # Same-timestamp rows are ordered by append order
+    await log.append(Posting("A", -100, 9400, "Tie", transaction_id="T5", timestamp=TIMESTAMPS[4]))
+
+    pages, cursor = [], None
+    while True:
+        transactions, cursor = await log.history("A", limit=2, cursor=cursor)
+        pages.append([t["id"] for t in transactions])
+        if cursor is None:
+            break
+
+    assert pages == [["T5", "T4"], ["T3", "T2"], ["T1", "T0"]]
+
+
+@pytest.mark.asyncio
+async def test_date_bounds(log):
+    await fill(log)
+
+    assert await ids(log, start_date="2025-12-02") == ["T4", "T3", "T2"]
+    # An end date includes its whole day
+    assert await ids(log, end_date="2025-12-01") == ["T1", "T0"]
+    assert await ids(log, start_date="2025-12-02", end_date="2025-12-02") == ["T3", "T2"]
+    # An end time includes that instant only
+    assert await ids(log, end_date="2025-12-02T12:00:00Z") == ["T3", "T2", "T1", "T0"]
+    assert await ids(log, end_date="2025-12-02T11:59:59") == ["T2", "T1", "T0"]
+    assert await ids(log, start_date="2025-12-02T01:00:00+01:00") == ["T4", "T3", "T2"]
+    assert await ids(log, start_date="2026-01-01") == []
+
+
+@pytest.mark.asyncio
+async def test_date_bounds_combine_with_cursor(log):
+    await fill(log)
+
+    first, cursor = await log.history("A", limit=1, start_date="2025-12-01", end_date="2025-12-02")
+    second, _ = await log.history("A", limit=5, cursor=cursor, start_date="2025-12-01", end_date="2025-12-02")
+
+    assert [t["id"] for t in first] == ["T3"]
+    assert [t["id"] for t in second] == ["T2", "T1", "T0"]
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_and_dates(log):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        await log.history("A", cursor="not-a-cursor")
+    with pytest.raises(ValueError, match="Invalid date"):
+        await log.history("A", start_date="yesterday")
+    with pytest.raises(ValueError, match="Invalid date"):
+        await log.history("A", end_date="2025-13-01")
+
+
+def test_parse_time_bound():
+    assert parse_time_bound("2025-12-01") == "2025-12-01T00:00:00.000000Z"
+    assert parse_time_bound("2025-12-01", end=True) == "2025-12-02T00:00:00.000000Z"
+    assert parse_time_bound("2025-12-01T10:00:00Z", end=True) == "2025-12-01T10:00:00.000001Z"
+
+
+@pytest.mark.asyncio
+async def test_timestamps_never_go_backwards(log):
+    await log.append(Posting("A", -1, 1, transaction_id="late", timestamp="2025-12-02T00:00:00.000000Z"))
+    early = Posting("A", -1, 0, transaction_id="early", timestamp="2025-12-01T00:00:00.000000Z")
+    await log.append(early)
+
+    assert early.timestamp == "2025-12-02T00:00:00.000000Z"
+    assert await ids(log) == ["early", "late"]
+
+
+@pytest.mark.asyncio
+async def test_log_is_append_only(log):
+    await log.append(Posting("A", -1, 0, transaction_id="T0"))
+
+    def tamper() -> None:
+        log._connection().execute("UPDATE transactions SET balance_cents = 100")
+
+    with pytest.raises(Exception, match="append-only"):
+        await asyncio.get_running_loop().run_in_executor(log._executor, tamper)
+
+
+@pytest.mark.asyncio
+async def test_restore_balances_from_persisted_file(tmp_path):
+    path = str(tmp_path / "transactions.db")
+    accounts = {"A": {"account_id": "A", "balance": 50.00}, "B": {"account_id": "B", "balance": 7.00}}
+
+    log = TransactionLog(path)
+    ledger = Ledger(log.restore_balances(accounts), on_post=log.append)
+    await ledger.debit("A", 10.00, "Shop")
+    await ledger.credit("A", 2.50, "Refund")
+    log.close()
+
+    reopened = TransactionLog(path)
+    restored = reopened.restore_balances(accounts)
+    history, _ = await reopened.history("A")
+    reopened.close()
+
+    assert restored == {"A": {"account_id": "A", "balance": 42.50}, "B": {"account_id": "B", "balance": 7.00}}
+    assert [(t["description"], t["amount"], t["balance"]) for t in history] == [
+        ("Refund", 2.50, 42.50),
+        ("Shop", -10.00, 40.00),
+    ]
+    assert accounts["A"]["balance"] == 50.00